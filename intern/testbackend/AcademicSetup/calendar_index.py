@@ -0,0 +1,241 @@
+"""
+Cached per-calendar date index.
+
+For each AcademicCalendar the index keeps sorted datetime64 arrays of the
+open days of the term (first INSTRUCTION start .. first EXAM end, minus
+HOLIDAY / EXAM / OTHER events), split by weekday, plus the holiday and
+exam days. Questions are answered with np.searchsorted:
+
+    index = get_calendar_index(calendar_id)
+    index.is_teachable(day, weekdays={"MONDAY", "THURSDAY"})
+    index.count_between(start, end, weekdays)
+    index.nth_teaching_day(10, weekdays)
+    index.teaching_dates(weekdays)
+
+`weekdays` are Timetable.day_of_week names; None means every day of the week.
+
+Indexes live in Django's cache. CalendarEvent / AcademicCalendar saves and
+deletes drop the entry (receivers in AcademicSetup/models.py); bulk writes
+must call invalidate_calendar_index() themselves.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import AcademicCalendar, CalendarEvent
+
+CACHE_KEY = "academic:calendar-index:{}"
+
+WEEKDAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
+BLOCKING_EVENT_TYPES = ("HOLIDAY", "EXAM", "OTHER")
+
+_EMPTY = np.array([], dtype="datetime64[D]")
+
+
+def _ttl():
+    return getattr(settings, "CALENDAR_INDEX_CACHE_TTL", 3600)
+
+
+def _day(value):
+    return np.datetime64(value, "D")
+
+
+def _expand(events):
+    """Sorted unique days covered by the given events."""
+    if not events:
+        return _EMPTY
+    return np.unique(np.concatenate([
+        np.arange(_day(e["start_date"]), _day(e["end_date"]) + 1, dtype="datetime64[D]")
+        for e in events
+    ]))
+
+
+class CalendarIndex:
+    def __init__(self, calendar_id, events):
+        self.calendar_id = calendar_id
+        self.error = None
+        self.term_start = self.term_end = None
+
+        instruction = sorted((e for e in events if e["type"] == "INSTRUCTION"), key=lambda e: e["start_date"])
+        exams = sorted((e for e in events if e["type"] == "EXAM"), key=lambda e: e["start_date"])
+
+        self.holidays = _expand([e for e in events if e["type"] in ("HOLIDAY", "OTHER")])
+        self.exam_days = _expand(exams)
+
+        if not instruction:
+            self.error = "INSTRUCTION event not found in calendar"
+        elif not exams:
+            self.error = "EXAM event not found in calendar"
+        else:
+            self.term_start = instruction[0]["start_date"]
+            self.term_end = exams[0]["end_date"]
+
+        self.open_days = self._open_days(events)
+
+        # 1970-01-01 was a Thursday, so Monday == 0 after shifting by 3.
+        weekday = (self.open_days.astype("int64") + 3) % 7
+        self.by_weekday = [self.open_days[weekday == i] for i in range(7)]
+
+        self._merged = {}
+
+    def _open_days(self, events):
+        if self.term_start is None:
+            return _EMPTY
+
+        start, end = _day(self.term_start), _day(self.term_end)
+        if end < start:
+            return _EMPTY
+
+        dates = np.arange(start, end + 1, dtype="datetime64[D]")
+
+        blocked = [e for e in events if e["type"] in BLOCKING_EVENT_TYPES]
+        if blocked:
+            # Difference array: +1 on the first blocked day, -1 after the last.
+            first = np.clip(
+                (np.array([_day(e["start_date"]) for e in blocked]) - start).astype("int64"), 0, len(dates)
+            )
+            last = np.clip(
+                (np.array([_day(e["end_date"]) for e in blocked]) + 1 - start).astype("int64"), 0, len(dates)
+            )
+            delta = np.zeros(len(dates) + 1, dtype=np.int32)
+            np.add.at(delta, first, 1)
+            np.add.at(delta, last, -1)
+            dates = dates[np.cumsum(delta[:-1]) <= 0]
+
+        return dates
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_merged"] = {}
+        return state
+
+    # -------------------------------------------------
+    # LOOKUPS
+    # -------------------------------------------------
+    def _weekday_arrays(self, weekdays):
+        if weekdays is None:
+            return [self.open_days]
+        return [self.by_weekday[i] for i, name in enumerate(WEEKDAYS) if name in weekdays]
+
+    def days(self, weekdays=None):
+        """Sorted datetime64 array of teaching days (merged once per weekday set)."""
+        if weekdays is None:
+            return self.open_days
+
+        key = frozenset(weekdays)
+        if key not in self._merged:
+            arrays = self._weekday_arrays(key)
+            self._merged[key] = np.sort(np.concatenate(arrays)) if arrays else _EMPTY
+        return self._merged[key]
+
+    def is_teachable(self, day, weekdays=None):
+        day = _day(day)
+        weekday = WEEKDAYS[(int(day.astype("int64")) + 3) % 7]
+        if weekdays is not None and weekday not in weekdays:
+            return False
+
+        array = self.by_weekday[WEEKDAYS.index(weekday)]
+        pos = np.searchsorted(array, day)
+        return bool(pos < len(array) and array[pos] == day)
+
+    def is_holiday(self, day):
+        pos = np.searchsorted(self.holidays, _day(day))
+        return bool(pos < len(self.holidays) and self.holidays[pos] == _day(day))
+
+    def is_exam_day(self, day):
+        pos = np.searchsorted(self.exam_days, _day(day))
+        return bool(pos < len(self.exam_days) and self.exam_days[pos] == _day(day))
+
+    def count_between(self, start, end, weekdays=None):
+        """Teaching days in [start, end], inclusive."""
+        start, end = _day(start), _day(end)
+        return int(sum(
+            np.searchsorted(array, end, side="right") - np.searchsorted(array, start, side="left")
+            for array in self._weekday_arrays(weekdays)
+        ))
+
+    def nth_teaching_day(self, n, weekdays=None, after=None):
+        """
+        The n-th (1-based) teaching day, counting from the term start or from
+        `after` (inclusive). None if the term has fewer teaching days.
+        """
+        days = self.days(weekdays)
+        offset = np.searchsorted(days, _day(after), side="left") if after is not None else 0
+        pos = offset + n - 1
+        if n < 1 or pos >= len(days):
+            return None
+        return days[pos].astype(object)
+
+    def teaching_dates(self, weekdays=None):
+        return self.days(weekdays).astype(object).tolist()
+
+
+# =====================================================
+# CACHE
+# =====================================================
+
+def cache_key(calendar_id):
+    return CACHE_KEY.format(calendar_id)
+
+
+def invalidate_calendar_index(calendar_id):
+    cache.delete(cache_key(calendar_id))
+
+
+def get_calendar_indexes(calendar_ids):
+    """{calendar_id: CalendarIndex}; misses are built with one events query."""
+    calendar_ids = set(calendar_ids)
+    if not calendar_ids:
+        return {}
+
+    keys = {cache_key(calendar_id): calendar_id for calendar_id in calendar_ids}
+    indexes = {keys[key]: index for key, index in cache.get_many(keys).items()}
+
+    missing = calendar_ids - set(indexes)
+    if missing:
+        events = defaultdict(list)
+        for event in CalendarEvent.objects.filter(calendar_id__in=missing).values(
+            "calendar_id", "type", "start_date", "end_date"
+        ):
+            events[event["calendar_id"]].append(event)
+
+        built = {calendar_id: CalendarIndex(calendar_id, events[calendar_id]) for calendar_id in missing}
+        cache.set_many({cache_key(calendar_id): index for calendar_id, index in built.items()}, _ttl())
+        indexes.update(built)
+
+    return indexes
+
+
+def get_calendar_index(calendar_id):
+    return get_calendar_indexes([calendar_id])[calendar_id]
+
+
+def resolve_calendar_ids(allocations):
+    """
+    {allocation_id: calendar_id} for each allocation's active calendar.
+    When several regulations/batches share a semester, the allocation's
+    class (or virtual section) decides; allocations should be loaded with
+    select_related("academic_class", "virtual_section") in that case.
+    """
+    calendars = defaultdict(list)
+    for calendar in AcademicCalendar.objects.filter(
+        semester_id__in={a.semester_id for a in allocations}, is_active=True
+    ).values("calendar_id", "semester_id", "regulation_id", "batch"):
+        calendars[calendar["semester_id"]].append(calendar)
+
+    resolved = {}
+    for allocation in allocations:
+        candidates = calendars.get(allocation.semester_id, [])
+        if len(candidates) > 1:
+            group = allocation.academic_class or allocation.virtual_section
+            candidates = [
+                c for c in candidates
+                if group and c["regulation_id"] == group.regulation_id and c["batch"] == group.batch
+            ]
+        if len(candidates) == 1:
+            resolved[allocation.allocation_id] = candidates[0]["calendar_id"]
+
+    return resolved
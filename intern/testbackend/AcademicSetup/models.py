@@ -128,3 +128,24 @@ class Section(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.department.dept_code} - {self.batch})"
+
+
+# ------------------------------------------
+# CALENDAR INDEX INVALIDATION
+# ------------------------------------------
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=AcademicCalendar)
+@receiver(post_delete, sender=AcademicCalendar)
+@receiver(post_save, sender=CalendarEvent)
+@receiver(post_delete, sender=CalendarEvent)
+def invalidate_calendar_index_cache(sender, instance, **kwargs):
+    from .calendar_index import invalidate_calendar_index
+
+    calendar_id = instance.calendar_id
+    invalidate_calendar_index(calendar_id)
+    transaction.on_commit(lambda: invalidate_calendar_index(calendar_id))
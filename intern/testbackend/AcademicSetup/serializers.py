@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from .models import AcademicCalendar, CalendarEvent
-import openpyxl
-from datetime import datetime, date
+from Creation.excel import ExcelSheet
+from .calendar_index import invalidate_calendar_index
 
 class CalendarEventSerializer(serializers.ModelSerializer):
     class Meta:
@@ -55,8 +55,18 @@ class AcademicCalendarSerializer(serializers.ModelSerializer):
 
     def parse_excel(self, calendar, file):
         try:
-            wb = openpyxl.load_workbook(file)
-            sheet = wb.active
+            sheet = ExcelSheet(
+                file,
+                ["type", "name", "start_date", "end_date"],
+                optional_columns=["description"],
+                by_header=False,
+                date_columns=["start_date", "end_date"],
+            )
+
+            # Check for minimum number of columns
+            if sheet.missing_columns:
+                sheet.close()
+                raise serializers.ValidationError("Missing required columns. Expected: Type, Name, Start Date, End Date.")
             
             events = []
             # Type labels to match choices
@@ -68,15 +78,9 @@ class AcademicCalendarSerializer(serializers.ModelSerializer):
                 'examination': 'EXAM',
             }
 
-            for row_idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-                if not any(row): continue
-                
-                # Check for minimum number of columns
-                if len(row) < 4:
-                    raise serializers.ValidationError(f"Row {row_idx}: Missing required columns. Expected: Type, Name, Start Date, End Date.")
-
-                e_type_raw, e_name, e_start, e_end = row[0:4]
-                e_desc = row[4] if len(row) > 4 else ""
+            for row_idx, row in sheet.rows():
+                e_type_raw, e_name, e_start, e_end = row["type"], row["name"], row["start_date"], row["end_date"]
+                e_desc = row.get("description") or ""
 
                 if not all([e_type_raw, e_name, e_start, e_end]):
                     raise serializers.ValidationError(f"Row {row_idx}: All fields (Type, Name, Start Date, End Date) are mandatory.")
@@ -84,21 +88,13 @@ class AcademicCalendarSerializer(serializers.ModelSerializer):
                 # Normalize type
                 final_type = type_map.get(str(e_type_raw).lower(), 'OTHER')
                 
-                # Date parsing/validation
-                def ensure_date(val, name):
-                    if isinstance(val, date):
-                        return val
-                    if isinstance(val, str):
-                        try:
-                            return datetime.strptime(val, '%Y-%m-%d').date()
-                        except ValueError:
-                            raise serializers.ValidationError(f"Row {row_idx}: {name} must be in YYYY-MM-DD format.")
-                    if isinstance(val, datetime):
-                        return val.date()
-                    raise serializers.ValidationError(f"Row {row_idx}: {name} has invalid date format.")
-
-                start_date = ensure_date(e_start, "Start Date")
-                end_date = ensure_date(e_end, "End Date")
+                # Date parsing/validation (shared Excel date normalisation)
+                for column, label in (("start_date", "Start Date"), ("end_date", "End Date")):
+                    if column in row.errors:
+                        raise serializers.ValidationError(f"Row {row_idx}: {label} must be in YYYY-MM-DD format.")
+
+                start_date = e_start
+                end_date = e_end
 
                 if start_date > end_date:
                     raise serializers.ValidationError(f"Row {row_idx}: Start date ({start_date}) cannot be after end date ({end_date}).")
@@ -118,6 +114,8 @@ class AcademicCalendarSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("The Excel file contains no valid events.")
 
             CalendarEvent.objects.bulk_create(events)
+            # bulk_create skips the post_save receivers.
+            invalidate_calendar_index(calendar.calendar_id)
             
         except serializers.ValidationError:
             calendar.delete()
@@ -1,3 +1,81 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from Creation.models import School, Degree, Department, Regulation, Semester
+from .models import AcademicCalendar, CalendarEvent
+from .calendar_index import get_calendar_index
+
+
+class CalendarIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH",
+            degree_duration=4, number_of_semesters=8, school=school
+        )
+        dept = Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=degree)
+        regulation = Regulation.objects.create(degree=degree, regulation_code="R25", batch="2025-2029")
+        semester = Semester.objects.create(degree=degree, department=dept, sem_number=1, sem_name="Sem 1", year=1)
+
+        self.calendar = AcademicCalendar.objects.create(
+            name="Odd Sem", school=school, degree=degree, department=dept,
+            regulation=regulation, batch="2025-2029", semester=semester
+        )
+        for kind, start, end in [
+            ("INSTRUCTION", date(2025, 7, 1), date(2025, 10, 31)),
+            ("HOLIDAY", date(2025, 8, 15), date(2025, 8, 15)),
+            ("OTHER", date(2025, 9, 1), date(2025, 9, 10)),
+            ("EXAM", date(2025, 11, 3), date(2025, 11, 14)),
+        ]:
+            CalendarEvent.objects.create(calendar=self.calendar, type=kind, name=kind, start_date=start, end_date=end)
+
+    def _walk(self, weekdays):
+        events = list(self.calendar.events.values("type", "start_date", "end_date"))
+        days = []
+        day = date(2025, 7, 1)
+        while day <= date(2025, 11, 14):
+            blocked = any(
+                e["type"] != "INSTRUCTION" and e["start_date"] <= day <= e["end_date"] for e in events
+            )
+            if day.strftime("%A").upper() in weekdays and not blocked:
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def test_matches_day_by_day_walk(self):
+        weekdays = {"MONDAY", "WEDNESDAY", "SATURDAY"}
+        expected = self._walk(weekdays)
+        index = get_calendar_index(self.calendar.calendar_id)
+
+        self.assertEqual(index.teaching_dates(weekdays), expected)
+        self.assertEqual(index.nth_teaching_day(1, weekdays), expected[0])
+        self.assertEqual(index.nth_teaching_day(5, weekdays, after=date(2025, 8, 14)), expected[
+            next(i for i, d in enumerate(expected) if d >= date(2025, 8, 14)) + 4
+        ])
+        self.assertIsNone(index.nth_teaching_day(len(expected) + 1, weekdays))
+        self.assertEqual(
+            index.count_between(date(2025, 8, 1), date(2025, 9, 30), weekdays),
+            len([d for d in expected if date(2025, 8, 1) <= d <= date(2025, 9, 30)])
+        )
+
+        self.assertTrue(index.is_teachable(date(2025, 8, 18), weekdays))
+        self.assertFalse(index.is_teachable(date(2025, 8, 19), weekdays))
+        self.assertFalse(index.is_teachable(date(2025, 8, 15)))
+        self.assertFalse(index.is_teachable(date(2025, 11, 5)))
+        self.assertTrue(index.is_holiday(date(2025, 9, 5)))
+        self.assertTrue(index.is_exam_day(date(2025, 11, 5)))
+
+    def test_cached_until_events_change(self):
+        self.assertTrue(get_calendar_index(self.calendar.calendar_id).is_teachable(date(2025, 10, 2)))
+
+        with self.assertNumQueries(0):
+            get_calendar_index(self.calendar.calendar_id)
+
+        CalendarEvent.objects.create(
+            calendar=self.calendar, type="HOLIDAY", name="Gandhi Jayanti",
+            start_date=date(2025, 10, 2), end_date=date(2025, 10, 2)
+        )
+        self.assertFalse(get_calendar_index(self.calendar.calendar_id).is_teachable(date(2025, 10, 2)))
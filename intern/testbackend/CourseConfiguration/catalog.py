@@ -0,0 +1,109 @@
+"""
+Pre-rendered registration catalog.
+
+When a registration window opens every student of the cohort asks for the
+same catalog (window details plus major / elective subject lists). The
+catalog is rendered once per window to JSON bytes and kept in Django's
+cache; student requests splice their own `already_registered` / `selection`
+fields onto those bytes instead of serializing the courses again.
+
+The active windows of each (department, batch) are cached as well, with
+their semester and open/close times, so finding a student's window is a
+cache hit followed by a filter in Python.
+
+Invalidation is versioned like Creation/hierarchy.py: RegistrationWindow
+saves/deletes, subject list changes and Course saves/deletes bump one
+version number (receivers in CourseConfiguration/models.py), which every
+catalog and cohort key includes. REGISTRATION_CATALOG_CACHE_TTL bounds
+anything that bypasses signals.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from Creation.cache_versions import bump_version, current_version
+from .models import RegistrationWindow
+from .serializers import CourseSerializer, RegistrationWindowSerializer
+
+VERSION_KEY = "registration:catalog:version"
+CATALOG_KEY = "registration:catalog:{}:{}"
+COHORT_KEY = "registration:cohort:{}:{}:{}"
+
+
+def _ttl():
+    return getattr(settings, "REGISTRATION_CATALOG_CACHE_TTL", 300)
+
+
+def invalidate_catalogs(*args, **kwargs):
+    """Signal-compatible: bump the version so every catalog and cohort key misses."""
+    bump_version(VERSION_KEY)
+
+
+def active_windows(department_id, batch):
+    """Active windows of a cohort, newest start first (RegistrationWindow ordering)."""
+    key = COHORT_KEY.format(current_version(VERSION_KEY), department_id, batch)
+    windows = cache.get(key)
+    if windows is None:
+        windows = list(
+            RegistrationWindow.objects.filter(
+                department_id=department_id, batch=batch, is_active=True, status='ACTIVE'
+            ).values("window_id", "semester_id", "start_datetime", "end_datetime")
+        )
+        cache.set(key, windows, _ttl())
+    return windows
+
+
+def window_for_semester(student):
+    """The student's active window for their semester, open or not (None if absent)."""
+    for window in active_windows(student.department_id, student.batch):
+        if window["semester_id"] == student.semester_id:
+            return window["window_id"]
+    return None
+
+
+def open_window(student):
+    """The student's active window that is open right now, any semester."""
+    now = timezone.now()
+    for window in active_windows(student.department_id, student.batch):
+        if window["start_datetime"] <= now <= window["end_datetime"]:
+            return window["window_id"]
+    return None
+
+
+def render_catalog(window_id):
+    window = (
+        RegistrationWindow.objects
+        .select_related("school", "department", "semester", "regulation")
+        .prefetch_related("major_subjects", "elective_subjects")
+        .get(window_id=window_id)
+    )
+    return JSONRenderer().render({
+        "window": RegistrationWindowSerializer(window).data,
+        "major_subjects": CourseSerializer(window.major_subjects.all(), many=True).data,
+        "elective_subjects": CourseSerializer(window.elective_subjects.all(), many=True).data,
+    })
+
+
+def get_catalog(window_id):
+    """Catalog JSON bytes for a window, rendered once per version."""
+    key = CATALOG_KEY.format(current_version(VERSION_KEY), window_id)
+    payload = cache.get(key)
+    if payload is None:
+        payload = render_catalog(window_id)
+        cache.set(key, payload, _ttl())
+    return payload
+
+
+def catalog_response(window_id, **extra):
+    """
+    HttpResponse with the cached catalog plus `extra` top-level fields.
+    Only `extra` is serialized per request.
+    """
+    payload = get_catalog(window_id)
+    if extra:
+        tail = JSONRenderer().render(extra)
+        payload = payload[:-1] + b"," + tail[1:]
+    return HttpResponse(payload, content_type="application/json")
@@ -0,0 +1,116 @@
+import time
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from custom_auth.models import User
+from Creation.bench import build_bench_hierarchy, rolled_back
+from CourseConfiguration.models import Course, RegistrationWindow, StudentSelection
+from CourseConfiguration.serializers import CourseSerializer, RegistrationWindowSerializer, StudentSelectionSerializer
+from CourseConfiguration.views import StudentCourseRegistrationAPIView
+from UserDataManagement.models import Student
+
+
+class _UncachedCatalogView(APIView):
+    """StudentCourseRegistrationAPIView.get as it was before the catalog cache."""
+
+    def get(self, request):
+        student = Student.objects.get(user=request.user)
+        window = RegistrationWindow.objects.filter(
+            department=student.department, batch=student.batch,
+            semester=student.semester, is_active=True, status='ACTIVE'
+        ).first()
+        existing = StudentSelection.objects.filter(student=student, window=window).first()
+        return Response({
+            "window": RegistrationWindowSerializer(window).data,
+            "major_subjects": CourseSerializer(window.major_subjects.all(), many=True).data,
+            "elective_subjects": CourseSerializer(window.elective_subjects.all(), many=True).data,
+            "already_registered": existing is not None,
+            "selection": StudentSelectionSerializer(existing).data if existing else None
+        })
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the student registration catalog GET with the pre-rendered '
+        'cache against the previous per-request serialization. All writes are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='GETs per variant')
+        parser.add_argument('--students', type=int, default=200, help='Distinct students issuing them')
+        parser.add_argument('--majors', type=int, default=6)
+        parser.add_argument('--electives', type=int, default=12)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            users = self._build(options['students'], options['majors'], options['electives'])
+            cache.clear()
+
+            factory = APIRequestFactory()
+            variants = [
+                ('uncached', _UncachedCatalogView.as_view()),
+                ('pre-rendered', StudentCourseRegistrationAPIView.as_view()),
+            ]
+            rates = {}
+            for name, view in variants:
+                started = time.perf_counter()
+                for i in range(options['requests']):
+                    request = factory.get('/course-config/student/registration/')
+                    force_authenticate(request, user=users[i % len(users)])
+                    response = view(request)
+                    if hasattr(response, 'render'):
+                        response.render()
+                    assert response.status_code == 200, response.content
+                elapsed = time.perf_counter() - started
+                rates[name] = options['requests'] / elapsed
+                self.stdout.write(f"{name:>13}: {rates[name]:8.0f} req/s  ({elapsed / options['requests'] * 1000:.2f} ms/req)")
+
+            self.stdout.write(f"      speedup: {rates['pre-rendered'] / rates['uncached']:.1f}x")
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def _build(self, students, majors, electives):
+        hierarchy = build_bench_hierarchy(sem_number=3)
+        school, degree, department, regulation, semester = (
+            hierarchy[key] for key in ('school', 'degree', 'department', 'regulation', 'semester')
+        )
+
+        courses = Course.objects.bulk_create([
+            Course(
+                course_name=f'Bench Course {i}', course_code=f'BENCH{i:03d}',
+                course_type='CORE' if i < majors else 'ELECTIVE',
+                school=school, degree=degree, department=department, regulation=regulation,
+                credit_value=3, course_category='THEORY'
+            )
+            for i in range(majors + electives)
+        ])
+        window = RegistrationWindow.objects.create(
+            school=school, department=department, batch=regulation.batch,
+            semester=semester, regulation=regulation,
+            start_datetime=timezone.now() - timedelta(hours=1),
+            end_datetime=timezone.now() + timedelta(days=1)
+        )
+        window.major_subjects.set(courses[:majors])
+        window.elective_subjects.set(courses[majors:])
+
+        users = User.objects.bulk_create([
+            User(username=f'bench_student_{i}', email=f'bench_student_{i}@example.com', role='STUDENT')
+            for i in range(students)
+        ])
+        users = list(User.objects.filter(username__startswith='bench_student_').order_by('id'))
+        Student.objects.bulk_create([
+            Student(
+                user=user, roll_no=f'BENCH{i:05d}', student_name=f'Student {i}', student_email=user.email,
+                student_gender='MALE', student_date_of_birth=date(2005, 1, 1), student_phone_number='9876543210',
+                parent_name='Parent', parent_phone_number='9876543210', batch=regulation.batch,
+                degree=degree, department=department, regulation=regulation, semester=semester
+            )
+            for i, user in enumerate(users)
+        ])
+        return users
@@ -0,0 +1,201 @@
+import json
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib import error, request
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from custom_auth.models import User
+from Creation.models import School, Degree, Department, Regulation, Semester
+from CourseConfiguration.models import Course, CourseSeat, RegistrationWindow, StudentSelection
+from CourseConfiguration.seats import set_seat_capacities
+from UserDataManagement.models import Student
+
+
+class Command(BaseCommand):
+    help = (
+        'Fire concurrent student registrations at a running server '
+        '(POST /course-config/student/registration/) and check the seat '
+        'counter invariants afterwards. Creates its own window, courses and '
+        'students in the configured database and deletes them at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to load')
+        parser.add_argument('--students', type=int, default=2000, help='Registrations to fire')
+        parser.add_argument('--concurrency', type=int, default=64, help='Requests in flight')
+        parser.add_argument('--electives', type=int, default=3, help='Elective courses in the window')
+        parser.add_argument('--capacity', type=int, default=None,
+                            help='Seats per elective (default: 80%% of the fair share, so electives fill up)')
+        parser.add_argument('--seed', type=int, default=7)
+        parser.add_argument('--keep', action='store_true', help='Keep the generated data')
+
+    def handle(self, *args, **options):
+        size = options['students']
+        capacity = options['capacity']
+        if capacity is None:
+            capacity = int(size / options['electives'] * 0.8)
+
+        self.stdout.write(f"Preparing {size} students, {options['electives']} electives x {capacity} seats ...")
+        fixture = self._setup(size, options['electives'], capacity)
+
+        try:
+            results = self._fire(fixture, options['base_url'], options['concurrency'], options['seed'])
+            self._report(results)
+            failures = self._check(fixture, results)
+        finally:
+            if not options['keep']:
+                self._cleanup(fixture)
+
+        if failures:
+            raise CommandError("Invariant violations:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS('All seat invariants hold.'))
+
+    # -------------------------------------------------
+    # FIXTURE
+    # -------------------------------------------------
+    def _setup(self, size, electives, capacity):
+        tag = uuid.uuid4().hex[:6].upper()
+
+        school = School.objects.create(school_name=f'Load School {tag}', school_code=f'LD{tag}')
+        degree = Degree.objects.create(
+            degree_name='Load Degree', degree_code=f'LDG{tag}',
+            degree_duration=4, number_of_semesters=8, school=school
+        )
+        department = Department.objects.create(degree=degree, dept_code=f'LDD{tag}', dept_name='Load Dept')
+        regulation = Regulation.objects.create(degree=degree, regulation_code=f'LDR{tag}', batch='2025-2029')
+        semester = Semester.objects.create(degree=degree, sem_number=3, sem_name='Semester 3', year=2)
+
+        def course(code, kind):
+            return Course.objects.create(
+                course_name=f'Load {code}', course_code=f'{code}-{tag}', course_type=kind,
+                school=school, degree=degree, department=department, regulation=regulation,
+                credit_value=3, course_category='THEORY'
+            )
+
+        core = course('CORE', 'CORE')
+        elective_courses = [course(f'EL{i}', 'ELECTIVE') for i in range(electives)]
+
+        window = RegistrationWindow.objects.create(
+            school=school, department=department, batch=regulation.batch,
+            semester=semester, regulation=regulation,
+            start_datetime=timezone.now() - timedelta(hours=1),
+            end_datetime=timezone.now() + timedelta(days=1)
+        )
+        window.major_subjects.set([core])
+        window.elective_subjects.set(elective_courses)
+        set_seat_capacities(window, {c.course_id: capacity for c in elective_courses})
+
+        users = User.objects.bulk_create([
+            User(username=f'load_{tag}_{i}', email=f'load_{tag}_{i}@example.com', role='STUDENT')
+            for i in range(size)
+        ], batch_size=500)
+        users = list(User.objects.filter(username__startswith=f'load_{tag}_').order_by('id'))
+        Student.objects.bulk_create([
+            Student(
+                user=user, roll_no=f'LD{tag}{i:05d}', student_name=f'Load Student {i}',
+                student_email=user.email, student_gender='MALE', student_date_of_birth=date(2005, 1, 1),
+                student_phone_number='9876543210', parent_name='Parent', parent_phone_number='9876543210',
+                batch=regulation.batch, degree=degree, department=department,
+                regulation=regulation, semester=semester
+            )
+            for i, user in enumerate(users)
+        ], batch_size=500)
+
+        return {
+            'tag': tag, 'school': school, 'window': window, 'core': core,
+            'electives': elective_courses, 'capacity': capacity,
+            'tokens': [str(AccessToken.for_user(user)) for user in users],
+        }
+
+    def _cleanup(self, fixture):
+        User.objects.filter(username__startswith=f"load_{fixture['tag']}_").delete()
+        fixture['school'].delete()
+
+    # -------------------------------------------------
+    # LOAD
+    # -------------------------------------------------
+    def _fire(self, fixture, base_url, concurrency, seed):
+        rng = random.Random(seed)
+        url = base_url.rstrip('/') + '/course-config/student/registration/'
+        window_id = str(fixture['window'].window_id)
+        core_id = str(fixture['core'].course_id)
+        electives = [str(c.course_id) for c in fixture['electives']]
+
+        jobs = [(token, [core_id, rng.choice(electives)]) for token in fixture['tokens']]
+
+        def post(job):
+            token, course_ids = job
+            body = json.dumps({'window_id': window_id, 'course_ids': course_ids}).encode()
+            req = request.Request(url, data=body, method='POST', headers={
+                'Content-Type': 'application/json', 'Authorization': f'Bearer {token}',
+            })
+            started = time.perf_counter()
+            try:
+                with request.urlopen(req, timeout=60) as response:
+                    code = response.status
+            except error.HTTPError as e:
+                code = e.code
+            except (error.URLError, OSError):
+                code = 'conn-error'
+            return code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(post, jobs))
+        elapsed = time.perf_counter() - started
+
+        return {'outcomes': outcomes, 'elapsed': elapsed}
+
+    def _report(self, results):
+        outcomes = results['outcomes']
+        latencies = sorted(latency for _, latency in outcomes)
+        codes = Counter(code for code, _ in outcomes)
+
+        self.stdout.write(f"Requests: {len(outcomes)} in {results['elapsed']:.1f}s "
+                          f"({len(outcomes) / results['elapsed']:.0f} req/s)")
+        self.stdout.write("Status codes: " + ", ".join(f"{code}={n}" for code, n in sorted(codes.items(), key=str)))
+        self.stdout.write(
+            f"Latency p50={statistics.median(latencies) * 1000:.0f}ms "
+            f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f}ms "
+            f"max={latencies[-1] * 1000:.0f}ms"
+        )
+
+    # -------------------------------------------------
+    # INVARIANTS
+    # -------------------------------------------------
+    def _check(self, fixture, results):
+        window = fixture['window']
+        failures = []
+
+        selected = dict(
+            StudentSelection.courses.through.objects.filter(studentselection__window=window)
+            .values('course_id').annotate(n=Count('id')).order_by().values_list('course_id', 'n')
+        )
+
+        for seat in CourseSeat.objects.filter(window=window).select_related('course'):
+            actual = selected.get(seat.course_id, 0)
+            if seat.capacity is not None and seat.taken > seat.capacity:
+                failures.append(f"{seat.course.course_code}: taken {seat.taken} > capacity {seat.capacity}")
+            if seat.taken != actual:
+                failures.append(f"{seat.course.course_code}: counter {seat.taken} != {actual} selections")
+
+        selections = StudentSelection.objects.filter(window=window)
+        accepted = sum(1 for code, _ in results['outcomes'] if code == 201)
+        if selections.count() != accepted:
+            failures.append(f"{selections.count()} selections stored but {accepted} requests returned 201")
+        if selections.filter(is_locked=False).exists():
+            failures.append("unlocked selections left behind")
+        partial = selections.annotate(n=Count('courses')).exclude(n=2).count()
+        if partial:
+            failures.append(f"{partial} selections without exactly 2 courses")
+
+        return failures
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from CourseConfiguration.seats import rebuild_seat_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute registration seat counters (CourseSeat.taken) from StudentSelection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', action='append', dest='windows',
+                            help='Only rebuild this RegistrationWindow id (repeatable)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        written = rebuild_seat_counters(window_ids=options['windows'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} seat counters in {elapsed:.2f}s."
+        ))
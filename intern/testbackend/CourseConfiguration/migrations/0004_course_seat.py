@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-16 23:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CourseConfiguration', '0003_studentselection_is_locked'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('capacity', models.PositiveIntegerField(blank=True, null=True)),
+                ('taken', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seats', to='CourseConfiguration.course')),
+                ('window', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seats', to='CourseConfiguration.registrationwindow')),
+            ],
+            options={
+                'unique_together': {('window', 'course')},
+            },
+        ),
+    ]
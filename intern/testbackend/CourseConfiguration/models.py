@@ -114,3 +114,77 @@ class StudentSelection(models.Model):
 
     def __str__(self):
         return f"Selection: {self.student.roll_no} for {self.window}"
+
+
+class CourseSeat(models.Model):
+    """
+    Live seat counter for one course in one registration window.
+    `taken` is maintained by CourseConfiguration/seats.py with conditional
+    UPDATEs, so it never exceeds `capacity` (None = unlimited).
+    """
+    window = models.ForeignKey(RegistrationWindow, on_delete=models.CASCADE, related_name='seats')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='seats')
+    capacity = models.PositiveIntegerField(null=True, blank=True)
+    taken = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('window', 'course')
+
+    @property
+    def available(self):
+        return None if self.capacity is None else max(self.capacity - self.taken, 0)
+
+    def __str__(self):
+        return f"{self.course.course_code}: {self.taken}/{self.capacity or '-'}"
+
+
+# ============================================================
+# REGISTRATION CACHE INVALIDATION
+# ============================================================
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+
+def _invalidate_window(window_id):
+    from .catalog import invalidate_catalogs
+    from .monitoring import invalidate_window_summary
+
+    def invalidate():
+        invalidate_window_summary(window_id)
+        invalidate_catalogs()
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=RegistrationWindow)
+@receiver(post_delete, sender=RegistrationWindow)
+def invalidate_registration_window_cache(sender, instance, **kwargs):
+    _invalidate_window(instance.window_id)
+
+
+@receiver(m2m_changed, sender=RegistrationWindow.major_subjects.through)
+@receiver(m2m_changed, sender=RegistrationWindow.elective_subjects.through)
+def invalidate_registration_window_subjects(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        _invalidate_window(instance.pk)
+    else:
+        # course.major_in_windows.add(...): pk_set holds the windows
+        # (None on clear; the TTL covers that case).
+        for window_id in pk_set or []:
+            _invalidate_window(window_id)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_catalogs_on_course_change(sender, instance, **kwargs):
+    from .catalog import invalidate_catalogs
+
+    invalidate_catalogs()
+    transaction.on_commit(invalidate_catalogs)
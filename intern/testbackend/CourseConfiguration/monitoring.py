@@ -0,0 +1,112 @@
+"""
+Registration window monitoring (RegistrationMonitoringAPIView).
+
+Statistics are computed with a fixed number of queries however many
+students and subjects a window has: one aggregate for the total /
+registered / pending counts, one GROUP BY over the selection-courses
+through table for subject-wise counts, and one query per subject list.
+They are cached per window, with the serialized window details, for
+REGISTRATION_MONITOR_CACHE_TTL seconds, since admins poll the page
+throughout registration week.
+
+Student lists are not cached; each page is a single LIMIT/OFFSET query
+ordered by roll number.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+
+from UserDataManagement.models import Student
+from .models import StudentSelection
+from .serializers import RegistrationWindowSerializer
+
+CACHE_KEY = "registration:monitor:{}"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def _ttl():
+    return getattr(settings, "REGISTRATION_MONITOR_CACHE_TTL", 15)
+
+
+def monitor_cache_key(window_id):
+    return CACHE_KEY.format(window_id)
+
+
+def invalidate_window_summary(window_id):
+    cache.delete(monitor_cache_key(window_id))
+
+
+def _registered(window):
+    return Exists(StudentSelection.objects.filter(window=window, student_id=OuterRef("pk")))
+
+
+def window_students(window):
+    """Active students of the window's Dept + Batch + Sem + Regulation."""
+    return Student.objects.filter(
+        department_id=window.department_id,
+        batch=window.batch,
+        regulation_id=window.regulation_id,
+        semester_id=window.semester_id,
+        is_active=True
+    )
+
+
+def build_window_statistics(window):
+    counts = window_students(window).aggregate(
+        total_students=Count("pk"),
+        registered_count=Count("pk", filter=Q(_registered(window))),
+    )
+
+    selected = dict(
+        StudentSelection.courses.through.objects
+        .filter(studentselection__window=window)
+        .values("course_id")
+        .annotate(count=Count("id"))
+        .order_by()
+        .values_list("course_id", "count")
+    )
+
+    subjects = list(window.major_subjects.values("course_id", "course_name", "course_code"))
+    subjects += list(window.elective_subjects.values("course_id", "course_name", "course_code"))
+
+    return {
+        "total_students": counts["total_students"],
+        "registered_count": counts["registered_count"],
+        "pending_count": counts["total_students"] - counts["registered_count"],
+        "subject_wise_counts": [
+            {
+                "course_name": subject["course_name"],
+                "course_code": subject["course_code"],
+                "count": selected.get(subject["course_id"], 0)
+            }
+            for subject in subjects
+        ],
+    }
+
+
+def get_window_summary(window):
+    """{"window_details", "statistics"}, cached per window."""
+    key = monitor_cache_key(window.window_id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = {
+            "window_details": RegistrationWindowSerializer(window).data,
+            "statistics": build_window_statistics(window),
+        }
+        cache.set(key, summary, _ttl())
+    return summary
+
+
+def student_page(window, registered, page, page_size):
+    """One page of registered (or pending) students, ordered by roll_no."""
+    students = window_students(window)
+    students = students.filter(_registered(window)) if registered else students.exclude(_registered(window))
+
+    offset = (page - 1) * page_size
+    return [
+        {"id": s["student_id"], "name": s["student_name"], "roll_no": s["roll_no"]}
+        for s in students.order_by("roll_no").values("student_id", "student_name", "roll_no")[offset:offset + page_size]
+    ]
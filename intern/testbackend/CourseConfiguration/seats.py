@@ -0,0 +1,159 @@
+"""
+Seat counters for course registration.
+
+Every (window, course) pair a student can select has a CourseSeat row whose
+`taken` count is changed only through conditional UPDATEs:
+
+    UPDATE ... SET taken = taken + 1
+     WHERE window_id = ? AND course_id = ? AND (capacity IS NULL OR taken < capacity)
+
+The database applies each UPDATE atomically, so concurrent registrations
+can never push `taken` past `capacity`; a zero row count means the course
+is full. set_selection_courses() reserves seats for added courses and
+releases seats for removed ones inside the caller's transaction, so a
+failed registration leaves every counter as it was. Counters are created on
+first use and start from the selections already stored for the window.
+
+`manage.py rebuild_seat_counters` recomputes `taken` from StudentSelection.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import Course, CourseSeat, StudentSelection
+
+
+class SeatUnavailable(Exception):
+    def __init__(self, course_ids):
+        self.course_ids = list(course_ids)
+        super().__init__("No seats left for the selected course(s).")
+
+
+class InvalidCourseSelection(Exception):
+    pass
+
+
+def window_course_ids(window):
+    return set(window.major_subjects.values_list("course_id", flat=True)) | set(
+        window.elective_subjects.values_list("course_id", flat=True)
+    )
+
+
+def selected_counts(window_ids=None, course_ids=None):
+    """{(window_id, course_id): selections} from the StudentSelection courses table."""
+    selected = StudentSelection.courses.through.objects.all()
+    if window_ids is not None:
+        selected = selected.filter(studentselection__window_id__in=window_ids)
+    if course_ids is not None:
+        selected = selected.filter(course_id__in=course_ids)
+
+    return {
+        (row["studentselection__window_id"], row["course_id"]): row["taken"]
+        for row in selected.values("studentselection__window_id", "course_id")
+        .annotate(taken=Count("id")).order_by()
+    }
+
+
+def ensure_seats(window, course_ids):
+    """
+    Create missing counters (unlimited capacity) for the given courses.
+    New counters start from the selections the window already has, e.g.
+    registrations made before the course had a counter.
+    """
+    course_ids = set(course_ids) - set(
+        CourseSeat.objects.filter(window=window, course_id__in=list(course_ids)).values_list("course_id", flat=True)
+    )
+    if not course_ids:
+        return
+
+    counts = selected_counts([window.pk], list(course_ids))
+    CourseSeat.objects.bulk_create(
+        [
+            CourseSeat(window=window, course_id=course_id, taken=counts.get((window.pk, course_id), 0))
+            for course_id in course_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def set_seat_capacities(window, capacities):
+    """capacities: {course_id: capacity or None}. Returns the updated seats."""
+    ensure_seats(window, capacities)
+    seats = list(CourseSeat.objects.filter(window=window, course_id__in=list(capacities)))
+    for seat in seats:
+        seat.capacity = capacities[seat.course_id]
+    CourseSeat.objects.bulk_update(seats, ["capacity"])
+    return seats
+
+
+def _reserve(window, course_ids):
+    full = []
+    # Fixed order so concurrent registrations lock counters consistently.
+    for course_id in sorted(course_ids, key=str):
+        updated = CourseSeat.objects.filter(
+            Q(capacity__isnull=True) | Q(taken__lt=F("capacity")),
+            window=window,
+            course_id=course_id,
+        ).update(taken=F("taken") + 1)
+        if not updated:
+            full.append(course_id)
+    return full
+
+
+def _release(window, course_ids):
+    if course_ids:
+        CourseSeat.objects.filter(
+            window=window, course_id__in=list(course_ids), taken__gt=0
+        ).update(taken=F("taken") - 1)
+
+
+def set_selection_courses(selection, course_ids):
+    """
+    Replace selection.courses with `course_ids`, reserving and releasing
+    seats for the difference. Raises InvalidCourseSelection for courses
+    outside the window and SeatUnavailable (after rolling back) when any
+    added course is full.
+    """
+    window = selection.window
+    course_ids = set(Course.objects.filter(course_id__in=list(course_ids)).values_list("course_id", flat=True))
+
+    invalid = course_ids - window_course_ids(window)
+    if invalid:
+        raise InvalidCourseSelection("Selected courses are not offered in this registration window.")
+
+    with transaction.atomic():
+        # Concurrent submits for the same selection must not both see the old
+        # courses and reserve the same seats twice.
+        StudentSelection.objects.select_for_update().get(pk=selection.pk)
+        current = set(selection.courses.values_list("course_id", flat=True))
+        added, removed = course_ids - current, current - course_ids
+
+        ensure_seats(window, added)
+        full = _reserve(window, added)
+        if full:
+            raise SeatUnavailable(full)
+        _release(window, removed)
+        selection.courses.set(course_ids)
+
+    return course_ids
+
+
+def rebuild_seat_counters(window_ids=None):
+    """Recompute `taken` from StudentSelection. Returns the number of counters written."""
+    seats = CourseSeat.objects.all()
+    if window_ids is not None:
+        seats = seats.filter(window_id__in=window_ids)
+
+    counts = selected_counts(window_ids)
+
+    with transaction.atomic():
+        CourseSeat.objects.bulk_create(
+            [CourseSeat(window_id=window_id, course_id=course_id) for window_id, course_id in counts],
+            ignore_conflicts=True,
+        )
+        seats = list(seats.select_for_update())
+        for seat in seats:
+            seat.taken = counts.get((seat.window_id, seat.course_id), 0)
+        CourseSeat.objects.bulk_update(seats, ["taken"], batch_size=500)
+
+    return len(seats)
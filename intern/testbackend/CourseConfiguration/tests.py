@@ -1,3 +1,299 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from custom_auth.models import User
+from Creation.models import School, Degree, Department, Regulation, Semester
+from UserDataManagement.models import DepartmentAdminAssignment, Faculty, Student
+from .models import Course, CourseSeat, RegistrationWindow, StudentSelection
+from .seats import rebuild_seat_counters, set_seat_capacities
+
+
+class RegistrationTestData:
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        self.school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        self.degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH",
+            degree_duration=4, number_of_semesters=8, school=self.school
+        )
+        self.dept = Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=self.degree)
+        self.regulation = Regulation.objects.create(degree=self.degree, regulation_code="R25", batch="2025-2029")
+        self.semester = Semester.objects.create(
+            degree=self.degree, department=self.dept, sem_number=3, sem_name="Sem 3", year=2
+        )
+
+        self.core, self.elective_a, self.elective_b = [
+            Course.objects.create(
+                course_name=name, course_code=code, course_type=kind,
+                school=self.school, degree=self.degree, department=self.dept, regulation=self.regulation,
+                credit_value=3, course_category="THEORY"
+            )
+            for name, code, kind in [
+                ("Data Structures", "CS201", "CORE"),
+                ("Machine Learning", "CS301", "ELECTIVE"),
+                ("Cloud Computing", "CS302", "ELECTIVE"),
+            ]
+        ]
+
+        self.window = RegistrationWindow.objects.create(
+            school=self.school, department=self.dept, batch="2025-2029",
+            semester=self.semester, regulation=self.regulation,
+            start_datetime=timezone.now() - timedelta(hours=1),
+            end_datetime=timezone.now() + timedelta(days=3)
+        )
+        self.window.major_subjects.set([self.core])
+        self.window.elective_subjects.set([self.elective_a, self.elective_b])
+
+        self.students = Student.objects.bulk_create([
+            Student(
+                roll_no=f"25CSE{i:03d}", student_name=f"Student {i}", student_email=f"reg{i}@test.com",
+                student_gender="MALE", student_date_of_birth=date(2005, 1, 1), student_phone_number="9876543210",
+                parent_name="Parent", parent_phone_number="9876543210", batch="2025-2029",
+                degree=self.degree, department=self.dept, regulation=self.regulation, semester=self.semester
+            )
+            for i in range(1, 13)
+        ])
+
+    def _register(self, student, courses):
+        selection = StudentSelection.objects.create(student=student, window=self.window, is_locked=True)
+        selection.courses.set(courses)
+        return selection
+
+
+class RegistrationMonitoringTests(RegistrationTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user(
+            username="reg_admin", password="password", role="COLLEGE_ADMIN", email="reg_admin@test.com"
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.url = f"/course-config/windows/{self.window.window_id}/monitor/"
+
+        for i, student in enumerate(self.students[:7]):
+            self._register(student, [self.core, self.elective_a if i % 2 else self.elective_b])
+
+    def test_counts_and_subject_totals(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        statistics = response.data["statistics"]
+        self.assertEqual(statistics["total_students"], 12)
+        self.assertEqual(statistics["registered_count"], 7)
+        self.assertEqual(statistics["pending_count"], 5)
+        self.assertEqual(
+            {s["course_code"]: s["count"] for s in statistics["subject_wise_counts"]},
+            {"CS201": 7, "CS301": 3, "CS302": 4}
+        )
+        self.assertEqual(
+            [s["roll_no"] for s in response.data["pending_students"]],
+            [f"25CSE{i:03d}" for i in range(8, 13)]
+        )
+
+    def test_student_lists_are_paginated(self):
+        response = self.client.get(self.url, {"page": 2, "page_size": 3})
+
+        self.assertEqual(response.data["pagination"]["registered_pages"], 3)
+        self.assertEqual(response.data["pagination"]["pending_pages"], 2)
+        self.assertEqual(
+            [s["roll_no"] for s in response.data["registered_students"]],
+            ["25CSE004", "25CSE005", "25CSE006"]
+        )
+        self.assertEqual([s["roll_no"] for s in response.data["pending_students"]], ["25CSE011", "25CSE012"])
+
+        self.assertEqual(self.client.get(self.url, {"page": 0}).status_code, 400)
+
+    def test_statistics_cached_per_window(self):
+        self.client.get(self.url)
+
+        # Window lookup and the two student pages only.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["statistics"]["registered_count"], 7)
+
+        self.window.elective_subjects.remove(self.elective_b)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data["statistics"]["subject_wise_counts"]), 2)
+
+
+class SeatCounterTests(RegistrationTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = []
+        for student in self.students[:4]:
+            student.user = User.objects.create_user(
+                username=f"seat_{student.roll_no}", password="password", role="STUDENT",
+                email=f"seat_{student.roll_no}@test.com"
+            )
+            student.save(update_fields=["user"])
+            self.users.append(student.user)
+
+        set_seat_capacities(self.window, {self.elective_a.course_id: 2})
+        self.url = "/course-config/student/registration/"
+
+    def _post(self, user, courses):
+        self.client.force_authenticate(user=user)
+        return self.client.post(
+            self.url,
+            {"window_id": str(self.window.window_id), "course_ids": [str(c.course_id) for c in courses]},
+            format="json"
+        )
+
+    def _taken(self, course):
+        return CourseSeat.objects.get(window=self.window, course=course).taken
+
+    def test_elective_never_oversubscribes(self):
+        for user in self.users[:2]:
+            self.assertEqual(self._post(user, [self.core, self.elective_a]).status_code, 201)
+
+        response = self._post(self.users[2], [self.core, self.elective_a])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["full_courses"], [self.elective_a.course_id])
+
+        # The failed attempt rolled back its core seat and selection.
+        self.assertEqual(self._taken(self.elective_a), 2)
+        self.assertEqual(self._taken(self.core), 2)
+        self.assertFalse(StudentSelection.objects.filter(student=self.students[2]).exists())
+
+        self.assertEqual(self._post(self.users[2], [self.core, self.elective_b]).status_code, 201)
+        self.assertEqual(self._taken(self.core), 3)
+
+    def test_course_outside_window_rejected(self):
+        other = Course.objects.create(
+            course_name="Compilers", course_code="CS401", course_type="CORE",
+            school=self.school, degree=self.degree, department=self.dept, regulation=self.regulation,
+            credit_value=3, course_category="THEORY"
+        )
+        self.assertEqual(self._post(self.users[0], [other]).status_code, 400)
+        self.assertFalse(CourseSeat.objects.filter(course=other).exists())
+
+    def test_manual_change_releases_seats_and_rebuild_agrees(self):
+        coordinator = User.objects.create_user(
+            username="seat_ac", password="password", role="ACADEMIC_COORDINATOR", email="seat_ac@test.com"
+        )
+        self.client.force_authenticate(user=coordinator)
+        for course in (self.elective_a, self.elective_b):
+            response = self.client.post("/course-config/windows/manual-register/", {
+                "window_id": str(self.window.window_id),
+                "student_id": str(self.students[0].student_id),
+                "course_ids": [str(self.core.course_id), str(course.course_id)],
+            }, format="json")
+            self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(self._taken(self.elective_a), 0)
+        self.assertEqual(self._taken(self.elective_b), 1)
+
+        CourseSeat.objects.update(taken=0)
+        rebuild_seat_counters([self.window.window_id])
+        self.assertEqual(self._taken(self.core), 1)
+        self.assertEqual(self._taken(self.elective_b), 1)
+
+        seats = {s["course_code"]: s for s in self.client.get(
+            f"/course-config/windows/{self.window.window_id}/seats/"
+        ).data}
+        self.assertEqual(seats["CS301"]["available"], 2)
+        self.assertIsNone(seats["CS201"]["capacity"])
+
+    def test_new_counter_counts_existing_selections(self):
+        # Registered before elective B had a counter.
+        for student in self.students[4:6]:
+            self._register(student, [self.core, self.elective_b])
+
+        set_seat_capacities(self.window, {self.elective_b.course_id: 2})
+        self.assertEqual(self._taken(self.elective_b), 2)
+
+        self.assertEqual(self._post(self.users[0], [self.core, self.elective_b]).status_code, 409)
+        self.assertEqual(self._post(self.users[0], [self.core, self.elective_a]).status_code, 201)
+        self.assertEqual(self._taken(self.core), 3)
+
+    def test_dept_admin_assignment_uses_seat_counters(self):
+        user = User.objects.create_user(
+            username="seat_da", password="password", role="FACULTY", email="seat_da@test.com"
+        )
+        faculty = Faculty.objects.create(
+            user=user, employee_id="SDA01", faculty_name="Seat Admin",
+            faculty_email="seat_da@test.com", faculty_gender="MALE"
+        )
+        DepartmentAdminAssignment.objects.create(
+            faculty=faculty, school=self.school, degree=self.degree, department=self.dept
+        )
+        user.refresh_from_db()
+        for student_user in self.users[:2]:
+            self._post(student_user, [self.core, self.elective_a])
+
+        self.client.force_authenticate(user=user)
+
+        def assign(student, courses):
+            return self.client.post("/course-mgmt/registration/assign/", {
+                "student_id": str(student.student_id),
+                "course_ids": [str(c.course_id) for c in courses],
+            }, format="json")
+
+        response = assign(self.students[5], [self.core, self.elective_a])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self._taken(self.elective_a), 2)
+        self.assertFalse(StudentSelection.objects.filter(student=self.students[5]).exists())
+
+        self.assertEqual(assign(self.students[5], [self.core, self.elective_b]).status_code, 200)
+        self.assertEqual((self._taken(self.core), self._taken(self.elective_b)), (3, 1))
+
+        # Moving a registered student off elective A frees its seat.
+        self.assertEqual(assign(self.students[0], [self.core, self.elective_b]).status_code, 200)
+        self.assertEqual((self._taken(self.elective_a), self._taken(self.elective_b)), (1, 2))
+
+
+class RegistrationCatalogTests(RegistrationTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = self.students[0]
+        self.student.user = User.objects.create_user(
+            username="cat_s1", password="password", role="STUDENT", email="cat_s1@test.com"
+        )
+        self.student.save(update_fields=["user"])
+        self.client.force_authenticate(user=self.student.user)
+        self.url = "/course-config/student/registration/"
+
+    def test_catalog_rendered_once_per_window(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        body = first.json()
+        self.assertEqual(body["window"]["window_id"], str(self.window.window_id))
+        self.assertEqual([c["course_code"] for c in body["major_subjects"]], ["CS201"])
+        self.assertEqual(sorted(c["course_code"] for c in body["elective_subjects"]), ["CS301", "CS302"])
+        self.assertFalse(body["already_registered"])
+        self.assertIsNone(body["selection"])
+
+        # Student profile and own selection only.
+        with self.assertNumQueries(2):
+            second = self.client.get(self.url)
+        self.assertEqual(second.json(), body)
+
+        services = self.client.get("/student-services/registration/available_courses/")
+        self.assertEqual(services.status_code, 200)
+        self.assertEqual(services.json()["major_subjects"], body["major_subjects"])
+
+        self._register(self.student, [self.core, self.elective_a])
+        body = self.client.get(self.url).json()
+        self.assertTrue(body["already_registered"])
+        self.assertEqual(body["selection"]["roll_no"], self.student.roll_no)
+
+    def test_subject_and_course_changes_invalidate(self):
+        self.client.get(self.url)
+
+        self.window.elective_subjects.remove(self.elective_b)
+        body = self.client.get(self.url).json()
+        self.assertEqual([c["course_code"] for c in body["elective_subjects"]], ["CS301"])
+
+        self.elective_a.course_name = "Applied Machine Learning"
+        self.elective_a.save()
+        body = self.client.get(self.url).json()
+        self.assertEqual(body["elective_subjects"][0]["course_name"], "Applied Machine Learning")
 
-# Create your tests here.
+        self.window.is_active = False
+        self.window.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
@@ -7,7 +7,8 @@ from .views import (
     RegistrationMonitoringAPIView,
     StudentCourseRegistrationAPIView,
     ManualRegistrationAPIView,
-    ExtendRegistrationAPIView
+    ExtendRegistrationAPIView,
+    RegistrationSeatAPIView
 )
 from rest_framework.routers import DefaultRouter
 
@@ -19,12 +20,14 @@ urlpatterns = [
     path('courses/<uuid:course_id>/', CourseRetrieveUpdateDestroyAPIView.as_view(), name='course-detail'),
     path('courses/upload/', CourseBulkUploadAPIView.as_view(), name='course-bulk-upload'),
     
+    # Academic Coordinator actions (before the router, whose
+    # windows/<window_id>/ route would otherwise swallow manual-register/)
+    path('windows/manual-register/', ManualRegistrationAPIView.as_view(), name='manual-registration'),
+
     # Registration Windows
     path('', include(router.urls)),
     path('windows/<uuid:window_id>/monitor/', RegistrationMonitoringAPIView.as_view(), name='registration-monitor'),
-    
-    # Academic Coordinator actions
-    path('windows/manual-register/', ManualRegistrationAPIView.as_view(), name='manual-registration'),
+    path('windows/<uuid:window_id>/seats/', RegistrationSeatAPIView.as_view(), name='registration-seats'),
     path('windows/<uuid:window_id>/extend/', ExtendRegistrationAPIView.as_view(), name='registration-extend'),
 
     # Student specific
@@ -1,4 +1,3 @@
-import openpyxl
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
@@ -8,6 +7,10 @@ from .models import Course
 from .serializers import CourseSerializer
 from Creation.models import School, Degree, Department, Regulation
 from Creation.permissions import IsCollegeAdmin
+from Creation.excel import ExcelSheet
+from ImportJobs.models import ImportJob
+from ImportJobs.queue import enqueue_import, wants_async
+from ImportJobs.serializers import ImportJobSerializer
 from rest_framework.permissions import IsAuthenticated
 
 class CourseListCreateAPIView(generics.ListCreateAPIView):
@@ -57,91 +60,123 @@ class CourseBulkUploadAPIView(APIView):
         if not file_obj.name.endswith(('.xlsx', '.xls')):
             return Response({"error": "Invalid file format. Please upload an Excel file."}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            wb = openpyxl.load_workbook(file_obj)
-            sheet = wb.active
-            
-            # Match headers from user image
-            required_headers = [
-                'Course Name', 'Course Short Name', 'Course Code', 'Course Type', 
-                'School Code', 'Degree Code', 'Department Code', 'Regulation Code', 
-                'Credit Value', 'L', 'T', 'P', 'Category'
-            ]
-            
-            courses_to_create = []
-            errors = []
+        if wants_async(request):
+            job = enqueue_import(ImportJob.COURSE_UPLOAD, file_obj, request.user)
+            return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+        data, status_code = import_course_sheet(file_obj)
+        return Response(data, status=status_code)
+
+
+# Match headers from user image
+COURSE_UPLOAD_HEADERS = [
+    'Course Name', 'Course Short Name', 'Course Code', 'Course Type', 
+    'School Code', 'Degree Code', 'Department Code', 'Regulation Code', 
+    'Credit Value', 'L', 'T', 'P', 'Category'
+]
+
+
+def import_course_sheet(file_obj, params=None, progress=None):
+    """
+    Validate every row, then create all courses in one go (nothing is
+    created if any row fails). Returns (payload, status_code) as
+    CourseBulkUploadAPIView responds; also the COURSE_UPLOAD job handler.
+    """
+    try:
+        # Columns are positional (1.Name ... 13.Cat), streamed in read-only mode
+        sheet = ExcelSheet(file_obj, COURSE_UPLOAD_HEADERS, by_header=False)
+        if sheet.missing_columns:
+            sheet.close()
+            return {"error": "Missing required columns", "missing_columns": sheet.missing_columns}, 400
+
+        if progress:
+            progress.start(total=sheet.row_count)
+
+        courses_to_create = []
+        errors = []
+
+        # Rows are only read here; the single write happens below.
+        for done, (row_idx, row) in enumerate(sheet.rows(), start=1):
+            if progress:
+                progress.update(done, errors)
+
+            try:
+                # Unpack according to image attributes:
+                # 1.Name, 2.ShortName, 3.Code, 4.Type, 5.School, 6.Degree, 7.Dept, 8.Reg, 9.Credits, 10.L, 11.T, 12.P, 13.Cat
+                (name, short_name, code, c_type, s_code, d_code, dept_code, r_code, credit, l, t, p, cat) = (row[h] for h in COURSE_UPLOAD_HEADERS)
+
+                # Lookups
+                school = School.objects.get(school_code=s_code)
+                degree = Degree.objects.get(degree_code=d_code, school=school)
+                department = Department.objects.get(dept_code=dept_code, degree=degree)
+
+                # Regulation lookup (since Batch is missing, find active regulation by code)
+                regulations = Regulation.objects.filter(regulation_code=r_code, degree=degree)
+                if regulations.filter(is_active=True).exists():
+                     regulation = regulations.filter(is_active=True).first()
+                else:
+                     regulation = regulations.first()
+
+                if not regulation:
+                     errors.append(f"Row {row_idx}: Regulation {r_code} not found for degree {d_code}")
+                     continue
+
+                course_data = {
+                    'course_name': name,
+                    'course_short_name': short_name,
+                    'course_code': code,
+                    'course_type': c_type.upper() if c_type else 'CORE',
+                    'school': school,
+                    'degree': degree,
+                    'department': department,
+                    'regulation': regulation,
+                    'credit_value': credit,
+                    'lecture_hours': l if l is not None else 0,
+                    'tutorial_hours': t if t is not None else 0,
+                    'practical_hours': p if p is not None else 0,
+                    'course_category': cat.upper() if cat else 'THEORY',
+                    'status': True
+                }
+
+                if Course.objects.filter(course_code=code).exists():
+                    errors.append(f"Row {row_idx}: Duplicate course code {code}")
+                    continue
+
+                courses_to_create.append(Course(**course_data))
+
+            except School.DoesNotExist: errors.append(f"Row {row_idx}: School {s_code} not found")
+            except Degree.DoesNotExist: errors.append(f"Row {row_idx}: Degree {d_code} not found")
+            except Department.DoesNotExist: errors.append(f"Row {row_idx}: Department {dept_code} not found")
+            except Exception as e: errors.append(f"Row {row_idx}: {str(e)}")
+
+        if errors:
+            return {"error": "Bulk upload failed due to validation errors", "details": errors}, 400
 
-            with transaction.atomic():
-                for row_idx, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-                    if not any(row): continue # Skip empty rows
-                    
-                    try:
-                        # Unpack according to image attributes:
-                        # 1.Name, 2.ShortName, 3.Code, 4.Type, 5.School, 6.Degree, 7.Dept, 8.Reg, 9.Credits, 10.L, 11.T, 12.P, 13.Cat
-                        (name, short_name, code, c_type, s_code, d_code, dept_code, r_code, credit, l, t, p, cat) = row
-                        
-                        # Lookups
-                        school = School.objects.get(school_code=s_code)
-                        degree = Degree.objects.get(degree_code=d_code, school=school)
-                        department = Department.objects.get(dept_code=dept_code, degree=degree)
-                        
-                        # Regulation lookup (since Batch is missing, find active regulation by code)
-                        regulations = Regulation.objects.filter(regulation_code=r_code, degree=degree)
-                        if regulations.filter(is_active=True).exists():
-                             regulation = regulations.filter(is_active=True).first()
-                        else:
-                             regulation = regulations.first()
-
-                        if not regulation:
-                             errors.append(f"Row {row_idx}: Regulation {r_code} not found for degree {d_code}")
-                             continue
-
-                        course_data = {
-                            'course_name': name,
-                            'course_short_name': short_name,
-                            'course_code': code,
-                            'course_type': c_type.upper() if c_type else 'CORE',
-                            'school': school,
-                            'degree': degree,
-                            'department': department,
-                            'regulation': regulation,
-                            'credit_value': credit,
-                            'lecture_hours': l if l is not None else 0,
-                            'tutorial_hours': t if t is not None else 0,
-                            'practical_hours': p if p is not None else 0,
-                            'course_category': cat.upper() if cat else 'THEORY',
-                            'status': True
-                        }
-                        
-                        if Course.objects.filter(course_code=code).exists():
-                            errors.append(f"Row {row_idx}: Duplicate course code {code}")
-                            continue
-
-                        courses_to_create.append(Course(**course_data))
-                    
-                    except School.DoesNotExist: errors.append(f"Row {row_idx}: School {s_code} not found")
-                    except Degree.DoesNotExist: errors.append(f"Row {row_idx}: Degree {d_code} not found")
-                    except Department.DoesNotExist: errors.append(f"Row {row_idx}: Department {dept_code} not found")
-                    except Exception as e: errors.append(f"Row {row_idx}: {str(e)}")
-
-                if errors:
-                    transaction.set_rollback(True)
-                    return Response({"error": "Bulk upload failed due to validation errors", "details": errors}, status=status.HTTP_400_BAD_REQUEST)
-                
-                Course.objects.bulk_create(courses_to_create)
-
-            return Response({"message": f"Successfully uploaded {len(courses_to_create)} courses"}, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
-            return Response({"error": f"An error occurred while processing the file: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        with transaction.atomic():
+            Course.objects.bulk_create(courses_to_create)
+
+        return {"message": f"Successfully uploaded {len(courses_to_create)} courses"}, 201
+
+    except Exception as e:
+        return {"error": f"An error occurred while processing the file: {str(e)}"}, 500
 
 from rest_framework import viewsets
-from .models import RegistrationWindow, StudentSelection
+from .models import RegistrationWindow, StudentSelection, CourseSeat
 from .serializers import RegistrationWindowSerializer, StudentSelectionSerializer
+from .catalog import catalog_response, window_for_semester
+from .seats import (
+    InvalidCourseSelection,
+    SeatUnavailable,
+    set_seat_capacities,
+    set_selection_courses,
+    window_course_ids,
+)
 from UserDataManagement.models import Student
 from Creation.models import Semester
 from django.db.models import Count
+from math import ceil
 
+from .monitoring import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, get_window_summary, student_page
 from Creation.permissions import IsCollegeAdmin, IsAcademicCoordinator, IsCampusAdmin
 from rest_framework.permissions import IsAuthenticated
 
@@ -155,51 +190,35 @@ class RegistrationMonitoringAPIView(APIView):
     permission_classes = [IsAuthenticated, IsCampusAdmin]
 
     def get(self, request, window_id):
-        window = generics.get_object_or_404(RegistrationWindow, window_id=window_id)
-        
-        # 1. Total students in that Dept + Batch + Sem + Regulation
-        all_students = Student.objects.filter(
-            department=window.department,
-            batch=window.batch,
-            regulation=window.regulation,
-            semester=window.semester,
-            is_active=True
+        window = generics.get_object_or_404(
+            RegistrationWindow.objects.select_related("school", "department", "semester", "regulation"),
+            window_id=window_id
         )
-        
-        # 2. Registered students
-        registered_selections = StudentSelection.objects.filter(window=window)
-        registered_student_ids = registered_selections.values_list('student_id', flat=True)
-        
-        # 3. Categorization
-        registered_students_list = all_students.filter(student_id__in=registered_student_ids)
-        pending_students_list = all_students.exclude(student_id__in=registered_student_ids)
-        
-        # 4. Subject-wise counts
-        subject_counts = []
-        all_subjects = list(window.major_subjects.all()) + list(window.elective_subjects.all())
-        
-        for subject in all_subjects:
-            count = StudentSelection.objects.filter(window=window, courses=subject).count()
-            subject_counts.append({
-                "course_name": subject.course_name,
-                "course_code": subject.course_code,
-                "count": count
-            })
+
+        try:
+            page = int(request.query_params.get("page", 1))
+            page_size = int(request.query_params.get("page_size", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return Response({"error": "page and page_size must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if page < 1 or page_size < 1:
+            return Response({"error": "page and page_size must be positive"}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = min(page_size, MAX_PAGE_SIZE)
+
+        # Counts and subject-wise totals (cached per window)
+        summary = get_window_summary(window)
+        statistics = summary["statistics"]
 
         return Response({
-            "window_details": RegistrationWindowSerializer(window).data,
-            "statistics": {
-                "total_students": all_students.count(),
-                "registered_count": registered_students_list.count(),
-                "pending_count": pending_students_list.count(),
-                "subject_wise_counts": subject_counts
+            **summary,
+            "pagination": {
+                "page": page,
+                "page_size": page_size,
+                "registered_pages": ceil(statistics["registered_count"] / page_size),
+                "pending_pages": ceil(statistics["pending_count"] / page_size),
             },
-            "registered_students": [
-                {"id": s.student_id, "name": s.student_name, "roll_no": s.roll_no} for s in registered_students_list
-            ],
-            "pending_students": [
-                {"id": s.student_id, "name": s.student_name, "roll_no": s.roll_no} for s in pending_students_list
-            ]
+            "registered_students": student_page(window, True, page, page_size),
+            "pending_students": student_page(window, False, page, page_size),
         })
 
 class ManualRegistrationAPIView(APIView):
@@ -213,13 +232,21 @@ class ManualRegistrationAPIView(APIView):
         window = generics.get_object_or_404(RegistrationWindow, window_id=window_id)
         student = generics.get_object_or_404(Student, student_id=student_id)
 
-        with transaction.atomic():
-            selection, created = StudentSelection.objects.get_or_create(
-                student=student,
-                window=window
+        try:
+            with transaction.atomic():
+                selection, created = StudentSelection.objects.get_or_create(
+                    student=student,
+                    window=window
+                )
+                set_selection_courses(selection, course_ids)
+                selection.save()
+        except InvalidCourseSelection as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except SeatUnavailable as e:
+            return Response(
+                {"error": str(e), "full_courses": e.course_ids},
+                status=status.HTTP_409_CONFLICT
             )
-            selection.courses.set(course_ids)
-            selection.save()
 
         return Response({
             "message": f"Manual registration successful for {student.roll_no}",
@@ -250,28 +277,23 @@ class StudentCourseRegistrationAPIView(APIView):
         # Identify student profile
         student = generics.get_object_or_404(Student, user=request.user)
         
-        # Find active window for this student
-        window = RegistrationWindow.objects.filter(
-            department=student.department,
-            batch=student.batch,
-            semester=student.semester,
-            is_active=True,
-            status='ACTIVE'
-        ).first()
-        
-        if not window:
+        # Find active window for this student (cached per cohort)
+        window_id = window_for_semester(student)
+
+        if not window_id:
             return Response({"error": "No active registration window found for your semester."}, status=status.HTTP_404_NOT_FOUND)
-            
+
         # Check if already registered
-        existing = StudentSelection.objects.filter(student=student, window=window).first()
-        
-        return Response({
-            "window": RegistrationWindowSerializer(window).data,
-            "major_subjects": CourseSerializer(window.major_subjects.all(), many=True).data,
-            "elective_subjects": CourseSerializer(window.elective_subjects.all(), many=True).data,
-            "already_registered": existing is not None,
-            "selection": StudentSelectionSerializer(existing).data if existing else None
-        })
+        existing = StudentSelection.objects.filter(student=student, window_id=window_id).first()
+        if existing:
+            existing.student = student
+
+        # Window and subject lists come pre-rendered; only the selection is serialized here
+        return catalog_response(
+            window_id,
+            already_registered=existing is not None,
+            selection=StudentSelectionSerializer(existing).data if existing else None
+        )
 
     def post(self, request):
         student = generics.get_object_or_404(Student, user=request.user)
@@ -286,23 +308,77 @@ class StudentCourseRegistrationAPIView(APIView):
         if now < window.start_datetime or now > window.end_datetime:
             return Response({"error": "Registration window is closed."}, status=status.HTTP_400_BAD_REQUEST)
         
-        with transaction.atomic():
-            selection, created = StudentSelection.objects.get_or_create(
-                student=student,
-                window=window
-            )
-
-            # 🚨 Prevent re-registration
-            if selection.is_locked:
-                return Response(
-                    {"error": "Registration already submitted."},
-                    status=400
+        try:
+            with transaction.atomic():
+                selection, created = StudentSelection.objects.get_or_create(
+                    student=student,
+                    window=window
                 )
 
-            selection.courses.set(selected_course_ids)
-            selection.is_locked = True  # ✅ Auto lock immediately
-            selection.save()
+                # 🚨 Prevent re-registration
+                if selection.is_locked:
+                    return Response(
+                        {"error": "Registration already submitted."},
+                        status=400
+                    )
+
+                # Seats are reserved atomically; a full course rolls everything back
+                set_selection_courses(selection, selected_course_ids)
+                selection.is_locked = True  # ✅ Auto lock immediately
+                selection.save()
+        except InvalidCourseSelection as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except SeatUnavailable as e:
             return Response(
-                {"message": "Registration successful", "selection_id": selection.selection_id},
-                status=status.HTTP_201_CREATED
-            )
\ No newline at end of file
+                {"error": str(e), "full_courses": e.course_ids},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return Response(
+            {"message": "Registration successful", "selection_id": selection.selection_id},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class RegistrationSeatAPIView(APIView):
+    """
+    GET: live seat counters of a window (no StudentSelection scan).
+    PUT: {"capacities": {"<course_id>": <capacity or null>}} sets limits.
+    """
+    permission_classes = [IsAuthenticated, IsCampusAdmin]
+
+    def get(self, request, window_id):
+        window = generics.get_object_or_404(RegistrationWindow, window_id=window_id)
+        seats = CourseSeat.objects.filter(window=window).select_related('course').order_by('course__course_code')
+        return Response([self._row(seat) for seat in seats])
+
+    def put(self, request, window_id):
+        window = generics.get_object_or_404(RegistrationWindow, window_id=window_id)
+        capacities = request.data.get('capacities')
+        if not isinstance(capacities, dict) or not capacities:
+            return Response({"error": "capacities must be a non-empty object"}, status=status.HTTP_400_BAD_REQUEST)
+
+        offered = {str(course_id): course_id for course_id in window_course_ids(window)}
+        parsed = {}
+        for course_id, capacity in capacities.items():
+            if str(course_id) not in offered:
+                return Response({"error": f"Course {course_id} is not offered in this window"}, status=status.HTTP_400_BAD_REQUEST)
+            if capacity is not None and (not isinstance(capacity, int) or capacity < 0):
+                return Response({"error": "capacity must be a non-negative integer or null"}, status=status.HTTP_400_BAD_REQUEST)
+            parsed[offered[str(course_id)]] = capacity
+
+        with transaction.atomic():
+            set_seat_capacities(window, parsed)
+
+        seats = CourseSeat.objects.filter(window=window).select_related('course').order_by('course__course_code')
+        return Response([self._row(seat) for seat in seats])
+
+    def _row(self, seat):
+        return {
+            "course_id": seat.course_id,
+            "course_code": seat.course.course_code,
+            "course_name": seat.course.course_name,
+            "capacity": seat.capacity,
+            "taken": seat.taken,
+            "available": seat.available,
+        }
\ No newline at end of file
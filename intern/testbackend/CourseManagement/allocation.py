@@ -0,0 +1,151 @@
+"""
+Roll-number class allocation.
+
+Allocating a batch to classes is split in two steps:
+
+    plan = plan_class_allocation(students, sections, strength, strategy)
+    classes = apply_class_allocation(plan, strength, **class_fields)
+
+The plan is computed in memory from one (student_id, roll_no, gender)
+query and is shared by the preview and the commit endpoints, so what is
+previewed is what gets written. The apply step writes every AcademicClass
+and AcademicClassStudent with bulk_create and sets Student.section with one
+UPDATE per section, so the number of queries does not grow with the number
+of students.
+
+Strategies (the number of classes is always ceil(students / strength)):
+
+    max_strength     consecutive roll ranges, every class full but the last
+    balanced         consecutive roll ranges, class sizes differ by at most one
+    gender_balanced  each gender dealt evenly across classes in roll order
+"""
+
+from collections import Counter
+from math import ceil
+
+from django.db import transaction
+
+from AcademicSetup.models import Section
+from UserDataManagement.models import Student
+from .models import AcademicClass, AcademicClassStudent
+
+UPDATE_BATCH_SIZE = 900
+
+STRATEGIES = ("max_strength", "balanced", "gender_balanced")
+
+
+class AllocationError(Exception):
+    pass
+
+
+def eligible_students(department_id, semester_id, regulation_id, batch):
+    """[(student_id, roll_no, gender)] of active students, ordered by roll_no (one query)."""
+    return list(
+        Student.objects.filter(
+            department_id=department_id,
+            regulation_id=regulation_id,
+            semester_id=semester_id,
+            batch=batch,
+            is_active=True
+        ).order_by("roll_no").values_list("student_id", "roll_no", "student_gender")
+    )
+
+
+def available_sections():
+    return Section.objects.filter(is_active=True).order_by("name", "section_id")
+
+
+def _max_strength(students, number_of_classes, strength):
+    return [students[i * strength:(i + 1) * strength] for i in range(number_of_classes)]
+
+
+def _balanced(students, number_of_classes, strength):
+    size, extra = divmod(len(students), number_of_classes)
+    groups, start = [], 0
+    for i in range(number_of_classes):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(students[start:end])
+        start = end
+    return groups
+
+
+def _gender_balanced(students, number_of_classes, strength):
+    # Deal students round-robin, one gender after another, so every class
+    # gets an even share of each gender and sizes differ by at most one.
+    by_gender = sorted(students, key=lambda s: (str(s[2] or "").strip().upper(), s[1]))
+    groups = [[] for _ in range(number_of_classes)]
+    for i, student in enumerate(by_gender):
+        groups[i % number_of_classes].append(student)
+    return [sorted(group, key=lambda s: s[1]) for group in groups]
+
+
+_SPLITTERS = {
+    "max_strength": _max_strength,
+    "balanced": _balanced,
+    "gender_balanced": _gender_balanced,
+}
+
+
+def plan_class_allocation(students, sections, strength, strategy="max_strength"):
+    """
+    Split the roll-ordered students into ceil(len(students) / strength)
+    classes using `strategy` and pair each class with the next section.
+
+    Returns a list of {"section", "student_ids", "roll_range", "gender_counts"}
+    dicts. Raises AllocationError when there are no students or too few sections.
+    """
+    if strategy not in _SPLITTERS:
+        raise AllocationError(f"Unknown allocation strategy '{strategy}'")
+    if not students:
+        raise AllocationError("No students found for allocation")
+
+    sections = list(sections)
+    number_of_classes = ceil(len(students) / strength)
+    if len(sections) < number_of_classes:
+        raise AllocationError("Not enough active sections available")
+
+    plan = []
+    for section, group in zip(sections, _SPLITTERS[strategy](students, number_of_classes, strength)):
+        plan.append({
+            "section": section,
+            "student_ids": [student[0] for student in group],
+            "roll_range": {"from": group[0][1], "to": group[-1][1]},
+            "gender_counts": dict(Counter(str(student[2] or "").strip().upper() for student in group)),
+        })
+
+    return plan
+
+
+def apply_class_allocation(plan, strength, **class_fields):
+    """
+    Create one AcademicClass per planned chunk, map its students and set
+    their Student.section. `class_fields` are the remaining AcademicClass
+    fields (school_id, department_id, academic_year, ...).
+
+    Returns the created classes in plan order.
+    """
+    classes = [
+        AcademicClass(section=entry["section"], strength=strength, status="ACTIVE", **class_fields)
+        for entry in plan
+    ]
+
+    with transaction.atomic():
+        AcademicClass.objects.bulk_create(classes)
+
+        AcademicClassStudent.objects.bulk_create(
+            [
+                AcademicClassStudent(academic_class=academic_class, student_id=student_id)
+                for academic_class, entry in zip(classes, plan)
+                for student_id in entry["student_ids"]
+            ],
+            batch_size=1000,
+        )
+
+        for entry in plan:
+            student_ids = entry["student_ids"]
+            for start in range(0, len(student_ids), UPDATE_BATCH_SIZE):
+                Student.objects.filter(
+                    student_id__in=student_ids[start:start + UPDATE_BATCH_SIZE]
+                ).update(section=entry["section"].name)
+
+    return classes
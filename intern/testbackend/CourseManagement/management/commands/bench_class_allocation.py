@@ -0,0 +1,108 @@
+import time
+from datetime import date
+from math import ceil
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from Creation.bench import build_bench_hierarchy, rolled_back
+from AcademicSetup.models import Section
+from CourseManagement.allocation import (
+    apply_class_allocation, available_sections, eligible_students, plan_class_allocation
+)
+from CourseManagement.models import AcademicClass, AcademicClassStudent
+from UserDataManagement.models import Student
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark roll-number class allocation (plan + bulk apply) against the '
+        'previous per-student create/save loop. All writes are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 10000], help='Batch sizes to benchmark')
+        parser.add_argument('--strength', type=int, default=60, help='Students per class')
+
+    def handle(self, *args, **options):
+        strength = options['strength']
+        self.stdout.write(f"{'students':>8}  {'classes':>7}  {'bulk':>9}  {'queries':>7}  {'per-row':>9}  {'queries':>7}")
+
+        for size in options['sizes']:
+            results = []
+            for allocate in (self._bulk, self._per_row):
+                with rolled_back():
+                    context = self._build_batch(size, ceil(size / strength))
+                    queries = []
+                    with connection.execute_wrapper(self._counter(queries)):
+                        started = time.perf_counter()
+                        allocate(context, strength)
+                        results.append((time.perf_counter() - started, len(queries)))
+
+            (bulk, bulk_queries), (per_row, per_row_queries) = results
+            self.stdout.write(
+                f"{size:>8}  {ceil(size / strength):>7}  {bulk * 1000:>7.1f}ms  {bulk_queries:>7}  "
+                f"{per_row * 1000:>7.1f}ms  {per_row_queries:>7}"
+            )
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def _counter(self, queries):
+        def wrapper(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+        return wrapper
+
+    def _bulk(self, context, strength):
+        students = eligible_students(
+            context['department'].pk, context['semester'].pk, context['regulation'].pk, context['batch']
+        )
+        plan = plan_class_allocation(students, available_sections(), strength)
+        apply_class_allocation(plan, strength, **self._class_fields(context))
+
+    def _per_row(self, context, strength):
+        # The allocator as it was before the plan/apply split.
+        students = Student.objects.filter(
+            department=context['department'], regulation=context['regulation'],
+            semester=context['semester'], batch=context['batch'], is_active=True
+        ).order_by('roll_no')
+        sections = Section.objects.filter(is_active=True).order_by('section_id')
+
+        for i in range(ceil(students.count() / strength)):
+            section = sections[i]
+            academic_class = AcademicClass.objects.create(
+                section=section, strength=strength, status='ACTIVE', **self._class_fields(context)
+            )
+            for student in students[i * strength:(i + 1) * strength]:
+                AcademicClassStudent.objects.create(academic_class=academic_class, student=student)
+                student.section = section.name
+                student.save(update_fields=['section'])
+
+    def _class_fields(self, context):
+        return {
+            'school': context['school'], 'degree': context['degree'], 'department': context['department'],
+            'semester': context['semester'], 'regulation': context['regulation'],
+            'batch': context['batch'], 'academic_year': 'AY 2025-26',
+        }
+
+    def _build_batch(self, size, number_of_sections):
+        context = build_bench_hierarchy()
+        cohort = {
+            'degree': context['degree'], 'department': context['department'],
+            'regulation': context['regulation'], 'semester': context['semester'], 'batch': context['batch'],
+        }
+
+        Section.objects.bulk_create([
+            Section(name=f'S{i:03d}', school=context['school'], **cohort)
+            for i in range(number_of_sections)
+        ])
+        Student.objects.bulk_create([
+            Student(
+                roll_no=f'BENCH{i:05d}', student_name=f'Student {i}', student_email=f'bench{i}@example.com',
+                student_gender='MALE', student_date_of_birth=date(2005, 1, 1), student_phone_number='9876543210',
+                parent_name='Parent', parent_phone_number='9876543210', **cohort
+            )
+            for i in range(size)
+        ], batch_size=1000)
+
+        return context
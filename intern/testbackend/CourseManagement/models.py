@@ -38,7 +38,7 @@ class AcademicClass(models.Model):
         unique_together = ('department', 'semester', 'section', 'academic_year')
 
     def __str__(self):
-        return f"{self.department.name} - {self.section.name} ({self.academic_year})"
+        return f"{self.department.dept_name} - {self.section.name} ({self.academic_year})"
 
 
 
@@ -0,0 +1,258 @@
+"""
+Automatic timetable construction.
+
+Every ACTIVE FacultyAllocation of a department / semester needs the
+lecture + tutorial + practical hours of its course each week; one hour
+takes one teaching slot of a TimeTableTemplate (break and Sunday slots are
+skipped). Timetable rows the allocation already has count towards its hours.
+
+TimetableSolver works on plain dicts against a ClashIndex preloaded with
+the stored timetable, so it respects exactly the faculty, class and virtual
+section clashes create_timetable() checks:
+
+1. Greedy: allocations are taken most-constrained first (busiest faculty
+   and group), and each hour goes to the free slot with the best score:
+   practical hours prefer "Lab" slots and theory hours avoid them, an
+   allocation's hours are spread over the week and a group's days are kept
+   even.
+2. Repair: an hour with no free slot may take a slot blocked by a single
+   hour placed in this run, if that hour can move to another free slot.
+
+Hours that still do not fit are reported as unplaced, never forced.
+
+    problem = load_problem(department_id, semester_id, academic_year, template)
+    result = TimetableSolver(**problem).solve()
+"""
+
+from django.db.models import Count, Q
+
+from .models import FacultyAllocation
+from .timetable import ClashIndex, TIMETABLE_DAYS, is_break
+
+HOUR_KINDS = (
+    ("L", "lecture_hours"),
+    ("T", "tutorial_hours"),
+    ("P", "practical_hours"),
+)
+
+DAY_ORDER = {
+    day: position
+    for position, day in enumerate(["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY"])
+}
+
+
+def is_lab(slot_type):
+    return bool(slot_type) and "lab" in slot_type.lower()
+
+
+def teaching_slots(template_slots):
+    """Slots hours can go into, in weekly order."""
+    return sorted(
+        (
+            slot for slot in template_slots
+            if not is_break(slot["slot_type"]) and slot["day"] in TIMETABLE_DAYS
+        ),
+        key=lambda slot: (DAY_ORDER[slot["day"]], slot["start_time"])
+    )
+
+
+def load_problem(department_id, semester_id, academic_year, template):
+    """
+    Allocations (with hours still to place) and template slots of a
+    department / semester, plus a ClashIndex of the stored timetable.
+    Three queries.
+    """
+    allocations = list(
+        FacultyAllocation.objects.filter(
+            Q(academic_class__department_id=department_id) | Q(virtual_section__department_id=department_id),
+            semester_id=semester_id,
+            academic_year=academic_year,
+            status="ACTIVE",
+        )
+        .annotate(scheduled=Count(
+            "timetables",
+            filter=Q(timetables__status="ACTIVE", timetables__academic_year=academic_year)
+        ))
+        .values(
+            "allocation_id", "faculty_id", "academic_class_id", "virtual_section_id", "scheduled",
+            "course__course_code", "course__lecture_hours", "course__tutorial_hours", "course__practical_hours",
+        )
+        .order_by("course__course_code", "allocation_id")
+    )
+
+    for allocation in allocations:
+        # Rows already in the timetable count as lecture, then tutorial, then practical hours.
+        scheduled = allocation.pop("scheduled")
+        hours = {}
+        for kind, field in HOUR_KINDS:
+            required = allocation.pop(f"course__{field}")
+            hours[kind] = max(required - scheduled, 0)
+            scheduled = max(scheduled - required, 0)
+        allocation["hours"] = hours
+        allocation["course_code"] = allocation.pop("course__course_code")
+
+    template_slots = list(
+        template.slots.values("slot_id", "day", "start_time", "end_time", "slot_order", "slot_type")
+    )
+
+    days = {slot["day"] for slot in teaching_slots(template_slots)}
+    index = ClashIndex.load(academic_year, [
+        {
+            "day_of_week": day,
+            "academic_class_id": allocation["academic_class_id"],
+            "virtual_section_id": allocation["virtual_section_id"],
+            "faculty_id": allocation["faculty_id"],
+        }
+        for allocation in allocations
+        for day in days
+    ])
+
+    return {"allocations": allocations, "template_slots": template_slots, "index": index}
+
+
+class TimetableSolver:
+    def __init__(self, allocations, template_slots, index=None):
+        self.allocations = allocations
+        self.slots = teaching_slots(template_slots)
+        self.index = index if index is not None else ClashIndex()
+        self.has_labs = any(is_lab(slot["slot_type"]) for slot in self.slots)
+
+        # unit id -> placed timetable slot; unit ids are the ClashIndex refs.
+        self.placed = {}
+        self._day_hours = {}
+
+    # -------------------------------------------------
+    # UNITS
+    # -------------------------------------------------
+    def _units(self):
+        """(unit id, allocation, kind) for every hour to place, most constrained first."""
+        load = {}
+        for allocation in self.allocations:
+            total = sum(allocation["hours"].values())
+            for key in self._resources(allocation):
+                load[key] = load.get(key, 0) + total
+
+        ordered = sorted(
+            self.allocations,
+            key=lambda a: (-max((load[key] for key in self._resources(a)), default=0), -sum(a["hours"].values()))
+        )
+
+        units = []
+        for allocation in ordered:
+            # Practical hours first: lab slots are the scarcest.
+            for kind in ("P", "L", "T"):
+                for _ in range(allocation["hours"][kind]):
+                    units.append((len(units), allocation, kind))
+        return units
+
+    @staticmethod
+    def _resources(allocation):
+        if allocation["academic_class_id"] is not None:
+            yield "class", allocation["academic_class_id"]
+        if allocation["virtual_section_id"] is not None:
+            yield "virtual", allocation["virtual_section_id"]
+        yield "faculty", allocation["faculty_id"]
+
+    @staticmethod
+    def _group(allocation):
+        return allocation["academic_class_id"] or allocation["virtual_section_id"]
+
+    # -------------------------------------------------
+    # PLACEMENT
+    # -------------------------------------------------
+    def _entry(self, allocation, kind, slot):
+        return {
+            "faculty_allocation_id": allocation["allocation_id"],
+            "course_code": allocation["course_code"],
+            "faculty_id": allocation["faculty_id"],
+            "academic_class_id": allocation["academic_class_id"],
+            "virtual_section_id": allocation["virtual_section_id"],
+            "day_of_week": slot["day"],
+            "start_time": slot["start_time"],
+            "end_time": slot["end_time"],
+            "slot_id": slot["slot_id"],
+            "kind": kind,
+        }
+
+    def _score(self, allocation, kind, slot):
+        mismatch = self.has_labs and (kind == "P") != is_lab(slot["slot_type"])
+        same_day = self._day_hours.get((allocation["allocation_id"], slot["day"]), 0)
+        group_day = self._day_hours.get((self._group(allocation), slot["day"]), 0)
+        return (mismatch, same_day, group_day)
+
+    def _candidates(self, allocation, kind, exclude=None):
+        return sorted(
+            (slot for slot in self.slots if slot is not exclude),
+            key=lambda slot: self._score(allocation, kind, slot)
+        )
+
+    def _count(self, entry, allocation, step):
+        for key in (allocation["allocation_id"], self._group(allocation)):
+            key = (key, entry["day_of_week"])
+            self._day_hours[key] = self._day_hours.get(key, 0) + step
+
+    def _place(self, unit_id, allocation, kind, slot):
+        entry = self._entry(allocation, kind, slot)
+        self.index.add(entry, ref=unit_id)
+        self.placed[unit_id] = (allocation, entry)
+        self._count(entry, allocation, 1)
+
+    def _unplace(self, unit_id):
+        allocation, entry = self.placed.pop(unit_id)
+        self.index.remove(entry, ref=unit_id)
+        self._count(entry, allocation, -1)
+        return allocation, entry
+
+    def _place_free(self, unit_id, allocation, kind, exclude=None):
+        for slot in self._candidates(allocation, kind, exclude):
+            if self.index.is_free(self._entry(allocation, kind, slot)):
+                self._place(unit_id, allocation, kind, slot)
+                return True
+        return False
+
+    def _repair(self, unit_id, allocation, kind):
+        """Take a slot held by one movable hour and move that hour elsewhere."""
+        for slot in self._candidates(allocation, kind):
+            refs = {ref for _, ref in self.index.clashes(self._entry(allocation, kind, slot))}
+            if len(refs) != 1:
+                continue
+            blocker = refs.pop()
+            if blocker not in self.placed:
+                continue  # stored timetable rows are fixed
+
+            blocker_allocation, blocker_entry = self._unplace(blocker)
+            blocker_slot = next(s for s in self.slots if s["slot_id"] == blocker_entry["slot_id"])
+            self._place(unit_id, allocation, kind, slot)
+            if self._place_free(blocker, blocker_allocation, blocker_entry["kind"], exclude=blocker_slot):
+                return True
+
+            self._unplace(unit_id)
+            self._place(blocker, blocker_allocation, blocker_entry["kind"], blocker_slot)
+        return False
+
+    def solve(self):
+        """
+        {"placed": [slot dicts for create_timetable()], "unplaced":
+        [{"faculty_allocation_id", "course_code", "kind", "hours"}]}
+        """
+        pending = []
+        for unit_id, allocation, kind in self._units():
+            if not self._place_free(unit_id, allocation, kind):
+                pending.append((unit_id, allocation, kind))
+
+        unplaced = {}
+        for unit_id, allocation, kind in pending:
+            if not self._repair(unit_id, allocation, kind):
+                key = (allocation["allocation_id"], kind)
+                unplaced.setdefault(key, {
+                    "faculty_allocation_id": allocation["allocation_id"],
+                    "course_code": allocation["course_code"],
+                    "kind": kind,
+                    "hours": 0,
+                })["hours"] += 1
+
+        placed = sorted(
+            (entry for _, entry in self.placed.values()),
+            key=lambda entry: (DAY_ORDER[entry["day_of_week"]], entry["start_time"], str(entry["faculty_allocation_id"]))
+        )
+        return {"placed": placed, "unplaced": list(unplaced.values())}
@@ -32,6 +32,7 @@ class DeptAdminAssignCoursesSerializer(serializers.Serializer):
 # =====================================================
 
 from rest_framework import serializers
+from .allocation import STRATEGIES
 from .models import AcademicClass
 
 
@@ -46,6 +47,7 @@ class AcademicClassCreateSerializer(serializers.Serializer):
     academic_year = serializers.CharField(max_length=20)
 
     strength = serializers.IntegerField(min_value=1)
+    strategy = serializers.ChoiceField(choices=STRATEGIES, default="max_strength")
 
     def validate(self, data):
         """
@@ -237,6 +239,7 @@ class FacultyAllocationViewSerializer(serializers.ModelSerializer):
 # =====================================================
 
 from .models import Timetable, FacultyAllocation
+from .timetable import ClashIndex, CLASH_MESSAGES
 
 
 class TimetableCreateSerializer(serializers.Serializer):
@@ -280,38 +283,84 @@ class TimetableCreateSerializer(serializers.Serializer):
                 "Faculty allocation does not belong to this class."
             )
 
-        # 3️⃣ Prevent Class Slot Overlap
-        if Timetable.objects.filter(
-            academic_class_id=academic_class_id,
-            day_of_week=day_of_week,
-            start_time=start_time,
-            academic_year=academic_year,
-            status="ACTIVE"
-        ).exists():
+        # 3️⃣ Basic time validation
+        if start_time >= end_time:
             raise serializers.ValidationError(
-                "This class already has a subject at this time."
+                "End time must be after start time."
             )
 
-        # 4️⃣ Prevent Faculty Double Booking
-        if Timetable.objects.filter(
-            faculty_allocation__faculty=allocation.faculty,
-            day_of_week=day_of_week,
-            start_time=start_time,
-            academic_year=academic_year,
-            status="ACTIVE"
-        ).exists():
-            raise serializers.ValidationError(
-                "Faculty already assigned to another class at this time."
-            )
+        # 4️⃣ Prevent class / faculty overlap (any intersecting interval, one query)
+        slot = {
+            "day_of_week": day_of_week,
+            "start_time": start_time,
+            "end_time": end_time,
+            "academic_class_id": academic_class_id,
+            "faculty_id": allocation.faculty_id,
+        }
+        clashes = ClashIndex.load(academic_year, [slot]).clashes(slot)
+        if clashes:
+            raise serializers.ValidationError(CLASH_MESSAGES[clashes[0][0]])
 
-        # 5️⃣ Basic time validation
-        if start_time >= end_time:
+        return data
+
+
+class TimetableSlotSerializer(serializers.Serializer):
+    """One slot of a bulk timetable request; class / virtual section default to the allocation's."""
+
+    faculty_allocation_id = serializers.UUIDField()
+    academic_class_id = serializers.UUIDField(required=False, allow_null=True)
+    virtual_section_id = serializers.UUIDField(required=False, allow_null=True)
+
+    day_of_week = serializers.ChoiceField(choices=[
+        'MONDAY', 'TUESDAY', 'WEDNESDAY',
+        'THURSDAY', 'FRIDAY', 'SATURDAY'
+    ])
+
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+
+
+class TimetableBulkCreateSerializer(serializers.Serializer):
+    academic_year = serializers.CharField(max_length=20)
+    slots = TimetableSlotSerializer(many=True, allow_empty=False)
+    dry_run = serializers.BooleanField(default=False)
+
+
+class TemplateAssignmentSerializer(serializers.Serializer):
+    faculty_allocation_id = serializers.UUIDField()
+    slot_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+
+class TimetableFromTemplateSerializer(serializers.Serializer):
+    """
+    Template slots assigned to faculty allocations. A class or virtual
+    section may be given to restrict the allocations to that group; without
+    one, allocations of every group of the department can be sent at once.
+    """
+
+    template_id = serializers.UUIDField()
+    academic_year = serializers.CharField(max_length=20)
+    academic_class_id = serializers.UUIDField(required=False, allow_null=True)
+    virtual_section_id = serializers.UUIDField(required=False, allow_null=True)
+    assignments = TemplateAssignmentSerializer(many=True, allow_empty=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        if data.get("academic_class_id") and data.get("virtual_section_id"):
             raise serializers.ValidationError(
-                "End time must be after start time."
+                "Provide either academic_class_id or virtual_section_id, not both."
             )
-
         return data
 
+
+class TimetableSolveSerializer(serializers.Serializer):
+    department_id = serializers.UUIDField()
+    semester_id = serializers.UUIDField()
+    academic_year = serializers.CharField(max_length=20)
+    # Defaults to the department's active template for the semester.
+    template_id = serializers.UUIDField(required=False)
+    dry_run = serializers.BooleanField(default=False)
+
 # =====================================================
 # TIMETABLE VIEW SERIALIZER
 # =====================================================
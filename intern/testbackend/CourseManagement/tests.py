@@ -1,3 +1,485 @@
+import random
+from datetime import date, time
+
+from django.db import transaction
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from custom_auth.models import User
+from Creation.models import School, Degree, Department, Regulation, Semester
+from AcademicSetup.models import Section, TimeSlot, TimeTableTemplate
+from CourseConfiguration.models import Course
+from UserDataManagement.models import Faculty, Student
+from .models import AcademicClass, AcademicClassStudent, FacultyAllocation, Timetable
+from .scheduler import TimetableSolver
+from .timetable import ClashIndex
+
+
+class ClassAllocationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="alloc_ac", password="password", role="ACADEMIC_COORDINATOR", email="alloc_ac@test.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        self.degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH",
+            degree_duration=4, number_of_semesters=8, school=self.school
+        )
+        self.dept = Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=self.degree)
+        self.regulation = Regulation.objects.create(degree=self.degree, regulation_code="R25", batch="2025-2029")
+        self.semester = Semester.objects.create(
+            degree=self.degree, department=self.dept, sem_number=1, sem_name="Sem 1", year=1
+        )
+
+        self.sections = [
+            Section.objects.create(
+                name=name, school=self.school, degree=self.degree, department=self.dept,
+                regulation=self.regulation, batch="2025-2029", semester=self.semester
+            )
+            for name in ("A", "B", "C")
+        ]
+
+        # Created out of roll order on purpose.
+        Student.objects.bulk_create([
+            Student(
+                roll_no=f"25CSE{i:03d}", student_name=f"Student {i}", student_email=f"alloc{i}@test.com",
+                student_gender="FEMALE" if i % 3 == 0 else "MALE", student_date_of_birth=date(2005, 1, 1), student_phone_number="9876543210",
+                parent_name="Parent", parent_phone_number="9876543210", batch="2025-2029",
+                degree=self.degree, department=self.dept, regulation=self.regulation, semester=self.semester
+            )
+            for i in reversed(range(1, 26))
+        ])
+
+        self.payload = {
+            "school_id": str(self.school.pk),
+            "degree_id": str(self.degree.pk),
+            "department_id": str(self.dept.pk),
+            "semester_id": str(self.semester.pk),
+            "regulation_id": str(self.regulation.pk),
+            "batch": "2025-2029",
+            "academic_year": "AY 2025-26",
+            "strength": 10,
+        }
+
+    def test_students_split_by_roll_number(self):
+        response = self.client.post("/course-mgmt/academic/class-allocation/", self.payload, format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["total_students"], 25)
+        self.assertEqual(response.data["total_classes_created"], 3)
+        self.assertEqual([d["student_count"] for d in response.data["details"]], [10, 10, 5])
+
+        for detail, section in zip(response.data["details"], self.sections):
+            academic_class = AcademicClass.objects.get(class_id=detail["class_id"])
+            self.assertEqual(academic_class.section, section)
+
+            rolls = sorted(
+                AcademicClassStudent.objects.filter(academic_class=academic_class)
+                .values_list("student__roll_no", flat=True)
+            )
+            self.assertEqual(len(rolls), detail["student_count"])
+            self.assertEqual(
+                set(Student.objects.filter(roll_no__in=rolls).values_list("section", flat=True)),
+                {section.name}
+            )
+
+        first = AcademicClass.objects.get(class_id=response.data["details"][0]["class_id"])
+        self.assertEqual(
+            sorted(first.students.values_list("student__roll_no", flat=True)),
+            [f"25CSE{i:03d}" for i in range(1, 11)]
+        )
+
+    def test_query_count_independent_of_batch_size(self):
+        # 2 savepoint pairs, duplicate check, students, sections,
+        # one INSERT each for classes and mappings, one UPDATE per section.
+        with self.assertNumQueries(12):
+            response = self.client.post("/course-mgmt/academic/class-allocation/", self.payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+
+    def test_not_enough_sections(self):
+        response = self.client.post(
+            "/course-mgmt/academic/class-allocation/", {**self.payload, "strength": 5}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"], "Not enough active sections available")
+        self.assertFalse(AcademicClass.objects.exists())
+
+    def test_preview_matches_commit(self):
+        for strategy in ("max_strength", "balanced", "gender_balanced"):
+            payload = {**self.payload, "strategy": strategy}
+
+            with self.assertNumQueries(3):
+                preview = self.client.post("/course-mgmt/academic/class-allocation/preview/", payload, format="json")
+            self.assertEqual(preview.status_code, 200, preview.data)
+
+            with transaction.atomic():
+                response = self.client.post("/course-mgmt/academic/class-allocation/", payload, format="json")
+                self.assertEqual(response.status_code, 201, response.data)
+                self.assertEqual(
+                    [(d["section_id"], d["student_count"]) for d in preview.data["distribution"]],
+                    [(d["section"], d["student_count"]) for d in response.data["details"]]
+                )
+                transaction.set_rollback(True)
+
+    def test_strategies(self):
+        url = "/course-mgmt/academic/class-allocation/preview/"
+
+        balanced = self.client.post(url, {**self.payload, "strategy": "balanced"}, format="json").data
+        self.assertEqual([d["student_count"] for d in balanced["distribution"]], [9, 8, 8])
+        self.assertEqual(balanced["distribution"][1]["roll_range"], {"from": "25CSE010", "to": "25CSE017"})
+
+        # 8 of the 25 students are FEMALE.
+        gender = self.client.post(url, {**self.payload, "strategy": "gender_balanced"}, format="json").data
+        self.assertEqual(
+            [d["gender_counts"] for d in gender["distribution"]],
+            [{"FEMALE": 3, "MALE": 6}, {"FEMALE": 3, "MALE": 5}, {"FEMALE": 2, "MALE": 6}]
+        )
+
+        response = self.client.post(url, {**self.payload, "strategy": "random"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class TimetableTestData:
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="tt_ac", password="password", role="ACADEMIC_COORDINATOR", email="tt_ac@test.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.school = school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        self.degree = degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH", degree_duration=4, number_of_semesters=8, school=school
+        )
+        self.dept = dept = Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=degree)
+        self.regulation = regulation = Regulation.objects.create(
+            degree=degree, regulation_code="R25", batch="2025-2029"
+        )
+        self.semester = Semester.objects.create(degree=degree, department=dept, sem_number=1, sem_name="Sem 1", year=1)
+
+        self.classes = []
+        for name in ("A", "B"):
+            section = Section.objects.create(
+                name=name, school=school, degree=degree, department=dept,
+                regulation=regulation, batch="2025-2029", semester=self.semester
+            )
+            self.classes.append(AcademicClass.objects.create(
+                school=school, degree=degree, department=dept, semester=self.semester, regulation=regulation,
+                batch="2025-2029", academic_year="AY 2025-26", section=section, strength=60
+            ))
+
+        self.courses = [
+            Course.objects.create(
+                course_name=f"Course {i}", course_code=f"CS10{i}", course_type="CORE",
+                school=school, degree=degree, department=dept, regulation=regulation,
+                credit_value=3, course_category="THEORY"
+            )
+            for i in range(3)
+        ]
+        self.faculty = [
+            Faculty.objects.create(
+                user=User.objects.create_user(
+                    username=f"tt_f{i}", password="password", role="FACULTY", email=f"tt_f{i}@test.com"
+                ),
+                employee_id=f"TTF{i}", faculty_name=f"Faculty {i}",
+                faculty_email=f"tt_f{i}@test.com", faculty_gender="MALE"
+            )
+            for i in range(2)
+        ]
+
+        # Faculty 0 teaches course 0 to both classes; faculty 1 teaches course 1 to class A.
+        self.alloc_a0, self.alloc_b0, self.alloc_a1 = [
+            FacultyAllocation.objects.create(
+                faculty=faculty, course=course, academic_class=academic_class,
+                semester=self.semester, academic_year="AY 2025-26"
+            )
+            for faculty, course, academic_class in [
+                (self.faculty[0], self.courses[0], self.classes[0]),
+                (self.faculty[0], self.courses[0], self.classes[1]),
+                (self.faculty[1], self.courses[1], self.classes[0]),
+            ]
+        ]
+        Timetable.objects.create(
+            academic_class=self.classes[0], faculty_allocation=self.alloc_a0, day_of_week="MONDAY",
+            start_time=time(10, 0), end_time=time(10, 50), academic_year="AY 2025-26"
+        )
+
+
+class TimetableClashTests(TimetableTestData, TestCase):
+    def _single(self, allocation, start, end, day="MONDAY"):
+        return self.client.post("/course-mgmt/academic/timetable/create/", {
+            "academic_class_id": str(allocation.academic_class_id),
+            "faculty_allocation_id": str(allocation.allocation_id),
+            "day_of_week": day, "start_time": start, "end_time": end, "academic_year": "AY 2025-26",
+        }, format="json")
+
+    def test_single_create_detects_overlaps(self):
+        # Different start time, same class: the old equality check let this through.
+        response = self._single(self.alloc_a1, "10:30", "11:20")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("This class already has a subject at this time.", str(response.data))
+
+        # Faculty 0 is busy in class A, so class B cannot have them at 10:40.
+        response = self._single(self.alloc_b0, "10:40", "11:30")
+        self.assertIn("Faculty already assigned to another class at this time.", str(response.data))
+
+        self.assertEqual(self._single(self.alloc_a1, "10:50", "11:40").status_code, 201)
+
+    def test_bulk_create_validates_whole_timetable(self):
+        url = "/course-mgmt/academic/timetable/bulk-create/"
+        slots = [
+            {"faculty_allocation_id": str(self.alloc_a1.allocation_id), "day_of_week": "TUESDAY",
+             "start_time": "09:00", "end_time": "09:50"},
+            {"faculty_allocation_id": str(self.alloc_b0.allocation_id), "day_of_week": "TUESDAY",
+             "start_time": "09:00", "end_time": "09:50"},
+            {"faculty_allocation_id": str(self.alloc_a0.allocation_id), "day_of_week": "TUESDAY",
+             "start_time": "09:30", "end_time": "10:20"},
+        ]
+
+        response = self.client.post(url, {"academic_year": "AY 2025-26", "slots": slots}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["details"], [
+            {"index": 2, "error": "This class already has a subject at this time.", "clashes_with_index": 0}
+        ])
+        self.assertEqual(Timetable.objects.count(), 1)
+
+        slots[2]["start_time"], slots[2]["end_time"] = "11:00", "11:50"
+        response = self.client.post(
+            url, {"academic_year": "AY 2025-26", "slots": slots, "dry_run": True}, format="json"
+        )
+        self.assertEqual(response.data, {"valid": True, "slot_count": 3})
+        self.assertEqual(Timetable.objects.count(), 1)
+
+        # Allocations, existing timetable, savepoint pair and one INSERT.
+        with self.assertNumQueries(5):
+            response = self.client.post(url, {"academic_year": "AY 2025-26", "slots": slots}, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created_count"], 3)
+        self.assertEqual(
+            Timetable.objects.get(timetable_id=response.data["timetable_ids"][1]).academic_class, self.classes[1]
+        )
+
+    def test_index_matches_pairwise_check(self):
+        rng = random.Random(3)
+        slots = []
+        for i in range(2000):
+            start = rng.randrange(8 * 60, 17 * 60, 10)
+            slots.append({
+                "day_of_week": rng.choice(["MONDAY", "TUESDAY", "WEDNESDAY"]),
+                "start_time": time(start // 60, start % 60),
+                "end_time": time((start + 50) // 60, (start + 50) % 60),
+                "academic_class_id": rng.randrange(40),
+                "faculty_id": rng.randrange(60),
+            })
+
+        with self.assertNumQueries(0):
+            errors = ClashIndex().validate(slots)
+
+        accepted = []
+        expected = set()
+        for i, slot in enumerate(slots):
+            if any(
+                other["day_of_week"] == slot["day_of_week"]
+                and other["start_time"] < slot["end_time"] and slot["start_time"] < other["end_time"]
+                and (other["academic_class_id"] == slot["academic_class_id"] or other["faculty_id"] == slot["faculty_id"])
+                for other in accepted
+            ):
+                expected.add(i)
+            else:
+                accepted.append(slot)
+
+        self.assertEqual({e["index"] for e in errors}, expected)
+
+    def test_index_finds_overlap_behind_nested_interval(self):
+        # Stored rows can overlap each other (saved before clash checks existed).
+        index = ClashIndex()
+        index.add({"day_of_week": "MONDAY", "start_time": time(9), "end_time": time(12), "faculty_id": 1}, ref="long")
+        index.add({"day_of_week": "MONDAY", "start_time": time(10), "end_time": time(10, 30), "faculty_id": 1}, ref="short")
+
+        slot = {"day_of_week": "MONDAY", "start_time": time(11), "end_time": time(11, 30), "faculty_id": 1}
+        self.assertEqual(index.clashes(slot), [("faculty", "long")])
+        self.assertEqual(index.clashes({**slot, "start_time": time(12), "end_time": time(13)}), [])
+
+
+class TimetableTemplateTests(TimetableTestData, TestCase):
+    url = "/course-mgmt/academic/timetable/from-template/"
+
+    def setUp(self):
+        super().setUp()
+        self.template = TimeTableTemplate.objects.create(
+            name="CSE Sem 1", school=self.school, degree=self.degree, department=self.dept, semester=self.semester
+        )
+        self.mon_1, self.mon_break, self.mon_2, self.tue_1, self.sun_1 = [
+            TimeSlot.objects.create(
+                template=self.template, day=day, slot_order=order, slot_type=kind,
+                start_time=time(*start), end_time=time(*end)
+            )
+            for day, order, kind, start, end in [
+                ("MONDAY", 1, "Theory", (9, 0), (9, 50)),
+                ("MONDAY", 2, "Break", (9, 50), (10, 0)),
+                ("MONDAY", 3, "Theory", (10, 0), (10, 50)),
+                ("TUESDAY", 1, "Theory", (9, 0), (9, 50)),
+                ("SUNDAY", 1, "Theory", (9, 0), (9, 50)),
+            ]
+        ]
+
+    def _post(self, assignments, **extra):
+        return self.client.post(self.url, {
+            "template_id": str(self.template.template_id),
+            "academic_year": "AY 2025-26",
+            "assignments": [
+                {"faculty_allocation_id": str(allocation.allocation_id), "slot_ids": [str(s.slot_id) for s in slots]}
+                for allocation, slots in assignments
+            ],
+            **extra,
+        }, format="json")
+
+    def test_invalid_slots_reported_per_assignment(self):
+        response = self._post([(self.alloc_a1, [self.mon_break, self.sun_1])])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [d["error"] for d in response.data["details"]],
+            ["Break slots cannot be assigned.", "Timetables do not have Sunday slots."]
+        )
+
+        # Class A already has course 0 on Monday at 10:00.
+        response = self._post([(self.alloc_a1, [self.mon_2])])
+        self.assertEqual(response.data["details"][0]["slot_id"], str(self.mon_2.slot_id))
+        self.assertIn("clashes_with_timetable", response.data["details"][0])
+
+        response = self._post([(self.alloc_a0, [self.tue_1])], academic_class_id=str(self.classes[1].pk))
+        self.assertEqual(response.data["details"][0]["error"], "Faculty allocation does not belong to this class.")
+        self.assertEqual(Timetable.objects.count(), 1)
+
+    def test_department_week_in_one_request(self):
+        assignments = [
+            (self.alloc_a0, [self.mon_1]),
+            (self.alloc_a1, [self.tue_1]),
+            (self.alloc_b0, [self.mon_1]),
+        ]
+        response = self._post(assignments)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["details"], [{
+            "faculty_allocation_id": str(self.alloc_b0.allocation_id),
+            "slot_id": str(self.mon_1.slot_id),
+            "error": "Faculty already assigned to another class at this time.",
+            "clashes_with": {
+                "faculty_allocation_id": str(self.alloc_a0.allocation_id), "slot_id": str(self.mon_1.slot_id)
+            },
+        }])
+
+        assignments[2] = (self.alloc_b0, [self.tue_1])
+        self.assertEqual(self._post(assignments, dry_run=True).data, {"valid": True, "slot_count": 3})
+
+        # Template, its slots, allocations, existing timetable, savepoint pair and one INSERT.
+        with self.assertNumQueries(7):
+            response = self._post(assignments)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created_count"], 3)
+        self.assertEqual(
+            Timetable.objects.filter(day_of_week="TUESDAY", start_time=time(9, 0)).count(), 2
+        )
+
+
+class TimetableSolverTests(TimetableTestData, TestCase):
+    url = "/course-mgmt/academic/timetable/solve/"
+
+    def setUp(self):
+        super().setUp()
+        Course.objects.filter(pk=self.courses[0].pk).update(lecture_hours=2)
+        Course.objects.filter(pk=self.courses[1].pk).update(lecture_hours=1, practical_hours=1)
+
+        self.template = TimeTableTemplate.objects.create(
+            name="CSE Sem 1", school=self.school, degree=self.degree, department=self.dept, semester=self.semester
+        )
+        for day, order, kind, start, end in [
+            ("MONDAY", 1, "Theory", (9, 0), (9, 50)),
+            ("MONDAY", 2, "Break", (9, 50), (10, 0)),
+            ("MONDAY", 3, "Theory", (10, 0), (10, 50)),
+            ("MONDAY", 4, "Lab", (11, 0), (11, 50)),
+            ("TUESDAY", 1, "Theory", (9, 0), (9, 50)),
+        ]:
+            TimeSlot.objects.create(
+                template=self.template, day=day, slot_order=order, slot_type=kind,
+                start_time=time(*start), end_time=time(*end)
+            )
+        self.payload = {
+            "department_id": str(self.dept.pk), "semester_id": str(self.semester.pk), "academic_year": "AY 2025-26",
+        }
+
+    def test_fills_remaining_hours_without_clashes(self):
+        # Class A and faculty 0 each have exactly three free teaching slots for three hours.
+        response = self.client.post(self.url, {**self.payload, "dry_run": True}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["required_hours"], 5)
+        self.assertEqual(response.data["unplaced"], [])
+        self.assertEqual(Timetable.objects.count(), 1)
+
+        lab = [s for s in response.data["timetable"] if s["kind"] == "P"]
+        self.assertEqual([(s["day_of_week"], s["start_time"]) for s in lab], [("MONDAY", time(11, 0))])
+
+        response = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created_count"], 5)
+
+        rows = Timetable.objects.values(
+            "academic_class_id", "faculty_allocation__faculty_id", "day_of_week", "start_time", "end_time"
+        )
+        slots = [
+            {**row, "faculty_id": row.pop("faculty_allocation__faculty_id")} for row in rows
+        ]
+        self.assertEqual(ClashIndex().validate(slots), [])
+
+        # Everything is placed now, so a second run has nothing to do.
+        response = self.client.post(self.url, {**self.payload, "dry_run": True}, format="json")
+        self.assertEqual(response.data["required_hours"], 0)
+
+    def test_reports_hours_that_do_not_fit(self):
+        # Class A now needs five more hours but only has three free slots.
+        Course.objects.filter(pk=self.courses[1].pk).update(lecture_hours=3)
+
+        response = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["required_hours"], 7)
+        self.assertEqual(response.data["placed_hours"], 5)
+        self.assertEqual(sum(entry["hours"] for entry in response.data["unplaced"]), 2)
+        self.assertLessEqual(
+            {entry["faculty_allocation_id"] for entry in response.data["unplaced"]},
+            {self.alloc_a0.allocation_id, self.alloc_a1.allocation_id}
+        )
+
+    def test_packed_department_week_in_memory(self):
+        days = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY"]
+        template_slots = [
+            {
+                "slot_id": f"{day}-{order}", "day": day, "slot_order": order,
+                "start_time": time(9 + order), "end_time": time(9 + order, 50),
+                "slot_type": "Break" if order == 3 else ("Lab" if order >= 5 else "Theory"),
+            }
+            for day in days
+            for order in range(8)
+        ]
+        # 10 classes x 10 courses = 100 allocations, 42 hours per class for 42 teaching slots.
+        rng = random.Random(5)
+        faculty = list(range(25))
+        rng.shuffle(faculty)
+        allocations = [
+            {
+                "allocation_id": f"{c}-{k}", "faculty_id": faculty[(c * 10 + k) % 25], "course_code": f"C{k}",
+                "academic_class_id": f"class-{c}", "virtual_section_id": None,
+                "hours": {"L": 3, "T": 1 if k < 6 else 0, "P": 2 if k >= 7 else 0},
+            }
+            for c in range(10)
+            for k in range(10)
+        ]
+
+        with self.assertNumQueries(0):
+            result = TimetableSolver(allocations, template_slots).solve()
 
-# Create your tests here.
+        self.assertEqual(result["unplaced"], [])
+        self.assertEqual(len(result["placed"]), 420)
+        self.assertEqual(ClashIndex().validate([dict(slot) for slot in result["placed"]]), [])
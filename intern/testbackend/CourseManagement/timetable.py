@@ -0,0 +1,293 @@
+"""
+Timetable clash detection.
+
+ClashIndex keeps, per (day, resource), the booked intervals sorted by start
+time. Resources are academic classes, virtual sections and faculty members,
+so one lookup answers "is this class / section / teacher free from 10:00
+to 10:50 on Monday?" with a bisect instead of a query. Intervals are
+half-open: a slot ending at 10:50 does not clash with one starting at 10:50.
+
+    index = ClashIndex.load(academic_year, slots)     # one query
+    errors = index.validate(slots)                   # in memory, adds accepted slots
+
+A slot is a dict with day_of_week, start_time, end_time, faculty_id and
+academic_class_id and/or virtual_section_id (plus any extra keys callers
+want to carry along).
+
+expand_template() turns an AcademicSetup.TimeTableTemplate plus
+"allocation -> template slots" assignments into such slots, so a whole
+department's week goes through the same validation and single bulk_create.
+"""
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from django.db.models import Q
+
+from .models import Timetable, FacultyAllocation
+
+CLASH_MESSAGES = {
+    "class": "This class already has a subject at this time.",
+    "virtual": "This virtual section already has a subject at this time.",
+    "faculty": "Faculty already assigned to another class at this time.",
+}
+
+
+class TimetableError(Exception):
+    pass
+
+
+def _start(interval):
+    return interval[0]
+
+
+def _resources(slot):
+    if slot.get("academic_class_id") is not None:
+        yield "class", slot["academic_class_id"]
+    if slot.get("virtual_section_id") is not None:
+        yield "virtual", slot["virtual_section_id"]
+    if slot.get("faculty_id") is not None:
+        yield "faculty", slot["faculty_id"]
+
+
+class ClashIndex:
+    def __init__(self):
+        # (day, kind, resource_id) -> sorted [(start, end, ref)]
+        self._intervals = defaultdict(list)
+
+    @classmethod
+    def load(cls, academic_year, slots=None):
+        """
+        Index the ACTIVE timetable of `academic_year` with one query. When
+        `slots` is given only the days and resources they touch are loaded.
+        """
+        index = cls()
+        existing = Timetable.objects.filter(academic_year=academic_year, status="ACTIVE")
+
+        if slots is not None:
+            slots = list(slots)
+            if not slots:
+                return index
+            scope = Q()
+            for kind, field in (
+                ("class", "academic_class_id__in"),
+                ("virtual", "virtual_section_id__in"),
+                ("faculty", "faculty_allocation__faculty_id__in"),
+            ):
+                ids = {rid for slot in slots for k, rid in _resources(slot) if k == kind}
+                if ids:
+                    scope |= Q(**{field: ids})
+            existing = existing.filter(scope, day_of_week__in={slot["day_of_week"] for slot in slots})
+
+        for row in existing.values(
+            "timetable_id", "academic_class_id", "virtual_section_id",
+            "faculty_allocation__faculty_id", "day_of_week", "start_time", "end_time"
+        ):
+            index.add({
+                "day_of_week": row["day_of_week"],
+                "start_time": row["start_time"],
+                "end_time": row["end_time"],
+                "academic_class_id": row["academic_class_id"],
+                "virtual_section_id": row["virtual_section_id"],
+                "faculty_id": row["faculty_allocation__faculty_id"],
+            }, ref=row["timetable_id"])
+
+        return index
+
+    def add(self, slot, ref=None):
+        for kind, resource_id in _resources(slot):
+            insort(
+                self._intervals[(slot["day_of_week"], kind, resource_id)],
+                (slot["start_time"], slot["end_time"], ref),
+                key=_start
+            )
+
+    def remove(self, slot, ref=None):
+        for kind, resource_id in _resources(slot):
+            intervals = self._intervals[(slot["day_of_week"], kind, resource_id)]
+            intervals.remove((slot["start_time"], slot["end_time"], ref))
+
+    def clashes(self, slot):
+        """[(kind, ref)] of booked intervals overlapping the slot, per resource."""
+        found = []
+        start, end = slot["start_time"], slot["end_time"]
+        for kind, resource_id in _resources(slot):
+            intervals = self._intervals.get((slot["day_of_week"], kind, resource_id))
+            if not intervals:
+                continue
+            # Every interval starting before `end` may overlap: a long one can
+            # contain shorter ones that end before `start`, so there is no
+            # point where the walk back can stop early. Lists are one
+            # resource's day, a handful of entries.
+            for booked_start, booked_end, ref in reversed(intervals[:bisect_left(intervals, end, key=_start)]):
+                if booked_end > start:
+                    found.append((kind, ref))
+        return found
+
+    def is_free(self, slot):
+        return not self.clashes(slot)
+
+    def validate(self, slots):
+        """
+        Check slots in order against the index and each other; accepted
+        slots are added. Returns [{"index", "error"}] (empty when clash-free).
+        """
+        errors = []
+        for position, slot in enumerate(slots):
+            if slot["start_time"] >= slot["end_time"]:
+                errors.append({"index": position, "error": "End time must be after start time."})
+                continue
+
+            clashes = self.clashes(slot)
+            if clashes:
+                kind, ref = clashes[0]
+                error = {"index": position, "error": CLASH_MESSAGES[kind]}
+                if isinstance(ref, int):
+                    error["clashes_with_index"] = ref
+                elif ref is not None:
+                    error["clashes_with_timetable"] = str(ref)
+                errors.append(error)
+                continue
+
+            self.add(slot, ref=position)
+        return errors
+
+
+def resolve_slots(slots, semester_id=None):
+    """
+    Attach faculty_id to each slot from its faculty_allocation_id and fill in
+    the allocation's class / virtual section when the slot omits them (one
+    query). Returns [{"index", "error"}] for slots whose allocation is
+    missing, inactive or belongs to another group (or, when `semester_id` is
+    given, another semester).
+    """
+    allocation_ids = {slot["faculty_allocation_id"] for slot in slots}
+    allocations = {
+        a["allocation_id"]: a
+        for a in FacultyAllocation.objects.filter(
+            allocation_id__in=allocation_ids, status="ACTIVE"
+        ).values("allocation_id", "faculty_id", "academic_class_id", "virtual_section_id", "semester_id")
+    }
+
+    errors = []
+    for position, slot in enumerate(slots):
+        allocation = allocations.get(slot["faculty_allocation_id"])
+        if allocation is None:
+            errors.append({"index": position, "error": "Invalid or inactive faculty allocation."})
+            continue
+        if semester_id is not None and allocation["semester_id"] != semester_id:
+            errors.append({"index": position, "error": "Faculty allocation belongs to another semester."})
+            continue
+
+        for field in ("academic_class_id", "virtual_section_id"):
+            if not slot.get(field):
+                slot[field] = allocation[field]
+            elif slot[field] != allocation[field]:
+                errors.append({"index": position, "error": "Faculty allocation does not belong to this class."})
+                break
+        slot["faculty_id"] = allocation["faculty_id"]
+
+    return errors
+
+
+def validate_timetable(slots, academic_year, semester_id=None):
+    """Resolve allocations, then check clashes; [{"index", "error", ...}] or []."""
+    return (
+        resolve_slots(slots, semester_id)
+        or ClashIndex.load(academic_year, slots).validate(slots)
+    )
+
+
+def create_timetable(slots, academic_year, semester_id=None):
+    """
+    Validate `slots` (dicts as accepted by TimetableSlotSerializer) against
+    the stored timetable and each other, then write them with one
+    bulk_create. Raises TimetableError with the list of errors; nothing is
+    written in that case.
+    """
+    errors = validate_timetable(slots, academic_year, semester_id)
+    if errors:
+        raise TimetableError(errors)
+
+    return Timetable.objects.bulk_create(
+        [
+            Timetable(
+                academic_class_id=slot["academic_class_id"],
+                virtual_section_id=slot["virtual_section_id"],
+                faculty_allocation_id=slot["faculty_allocation_id"],
+                day_of_week=slot["day_of_week"],
+                start_time=slot["start_time"],
+                end_time=slot["end_time"],
+                academic_year=academic_year,
+                status="ACTIVE",
+            )
+            for slot in slots
+        ],
+        batch_size=500,
+    )
+
+
+# =====================================================
+# TEMPLATE EXPANSION
+# =====================================================
+
+TIMETABLE_DAYS = {day for day, _ in Timetable._meta.get_field("day_of_week").choices}
+
+
+def is_break(slot_type):
+    return bool(slot_type) and "break" in slot_type.lower()
+
+
+def expand_template(template, assignments, academic_class_id=None, virtual_section_id=None):
+    """
+    Expand [{"faculty_allocation_id", "slot_ids"}] into timetable slots using
+    the template's TimeSlots (one query). Every slot carries its template
+    slot_id; when a class / virtual section is given it is set on every slot
+    so resolve_slots() rejects allocations of other groups.
+
+    Returns (slots, errors) with errors as [{"faculty_allocation_id",
+    "slot_id", "error"}]; slots is only meaningful when errors is empty.
+    """
+    template_slots = {slot.slot_id: slot for slot in template.slots.all()}
+
+    slots, errors = [], []
+    for assignment in assignments:
+        allocation_id = assignment["faculty_allocation_id"]
+        for slot_id in assignment["slot_ids"]:
+            template_slot = template_slots.get(slot_id)
+            if template_slot is None:
+                error = "Slot does not belong to this template."
+            elif is_break(template_slot.slot_type):
+                error = "Break slots cannot be assigned."
+            elif template_slot.day not in TIMETABLE_DAYS:
+                error = f"Timetables do not have {template_slot.day.title()} slots."
+            else:
+                slots.append({
+                    "slot_id": slot_id,
+                    "faculty_allocation_id": allocation_id,
+                    "academic_class_id": academic_class_id,
+                    "virtual_section_id": virtual_section_id,
+                    "day_of_week": template_slot.day,
+                    "start_time": template_slot.start_time,
+                    "end_time": template_slot.end_time,
+                })
+                continue
+            errors.append({"faculty_allocation_id": str(allocation_id), "slot_id": str(slot_id), "error": error})
+
+    return slots, errors
+
+
+def describe_template_errors(errors, slots):
+    """Replace positional indexes in validation errors by allocation / template slot ids."""
+    def ids(slot):
+        return {"faculty_allocation_id": str(slot["faculty_allocation_id"]), "slot_id": str(slot["slot_id"])}
+
+    described = []
+    for error in errors:
+        entry = {**ids(slots[error["index"]]), "error": error["error"]}
+        if "clashes_with_index" in error:
+            entry["clashes_with"] = ids(slots[error["clashes_with_index"]])
+        elif "clashes_with_timetable" in error:
+            entry["clashes_with_timetable"] = error["clashes_with_timetable"]
+        described.append(entry)
+    return described
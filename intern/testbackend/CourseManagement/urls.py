@@ -8,6 +8,9 @@ from .views import (
     FacultyAllocationAPIView,
     FacultyAllocationListAPIView,
     TimetableCreateAPIView,
+    TimetableBulkCreateAPIView,
+    TimetableFromTemplateAPIView,
+    TimetableSolveAPIView,
     TimetableListAPIView,
     BulkImportTemplateView,
     BulkImportUploadView,
@@ -29,6 +32,9 @@ urlpatterns = [
     path('academic/faculty-allocation/', FacultyAllocationAPIView.as_view(),name='faculty-allocation'),
     path('academic/faculty-allocation/list/', FacultyAllocationListAPIView.as_view(),name='faculty-allocation-list'),
     path('academic/timetable/create/', TimetableCreateAPIView.as_view(),name='timetable-create'),
+    path('academic/timetable/bulk-create/', TimetableBulkCreateAPIView.as_view(), name='timetable-bulk-create'),
+    path('academic/timetable/from-template/', TimetableFromTemplateAPIView.as_view(), name='timetable-from-template'),
+    path('academic/timetable/solve/', TimetableSolveAPIView.as_view(), name='timetable-solve'),
     path('academic/timetable/list/', TimetableListAPIView.as_view(), name='timetable-list'),
     
     # Bulk Import (Course Only)
@@ -3,23 +3,41 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from Creation.permissions import IsAcademicCoordinator
+from Creation.excel import ExcelSheet
+from Creation.hierarchy import get_hierarchy
+from ImportJobs.models import ImportJob
+from ImportJobs.queue import enqueue_import, wants_async
+from ImportJobs.serializers import ImportJobSerializer
 
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.http import HttpResponse
 import pandas as pd
 import io
 from rest_framework.parsers import MultiPartParser, FormParser
-from Creation.models import School, Degree, Department, Regulation, Semester
-from AcademicSetup.models import Section
+from AcademicSetup.models import TimeTableTemplate
+from .allocation import (
+    AllocationError,
+    apply_class_allocation,
+    available_sections,
+    eligible_students,
+    plan_class_allocation,
+)
+from .scheduler import TimetableSolver, load_problem
+from .timetable import (
+    TimetableError,
+    create_timetable,
+    describe_template_errors,
+    expand_template,
+    validate_timetable,
+)
 from .models import (
     AcademicClass, 
-    AcademicClassStudent, 
     VirtualSection,
     FacultyAllocation,
     Timetable,
 )
-from math import ceil
 
+from CourseConfiguration.seats import InvalidCourseSelection, SeatUnavailable, set_selection_courses
 from CourseConfiguration.models import (
     RegistrationWindow,
     StudentSelection,
@@ -40,6 +58,9 @@ from .serializers import (
     FacultyAllocationCreateSerializer,
     FacultyAllocationViewSerializer,
     TimetableCreateSerializer,
+    TimetableBulkCreateSerializer,
+    TimetableFromTemplateSerializer,
+    TimetableSolveSerializer,
     TimetableViewSerializer
 )
 
@@ -273,27 +294,36 @@ class DeptAdminAssignCoursesAPIView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        selection, _ = StudentSelection.objects.get_or_create(
-            student=student,
-            window=window
-        )
-
         courses = Course.objects.filter(
             course_id__in=serializer.validated_data['course_ids'],
             department=assignment.department,
             regulation=window.regulation,
-            semester=window.semester,
-            is_active=True
+            status=True
         )
         
-        if courses.count() != len(serializer.validated_data['course_ids']):
+        # The window's semester is checked by set_selection_courses().
+        if courses.count() != len(set(serializer.validated_data['course_ids'])):
             return Response(
                 {"error": "Invalid course selection"},
                 status=status.HTTP_400_BAD_REQUEST
                 )
-            
-        selection.courses.set(courses)
-        selection.save()
+
+        # Seat counters are kept in step with the selection (CourseConfiguration/seats.py).
+        try:
+            with transaction.atomic():
+                selection, _ = StudentSelection.objects.get_or_create(
+                    student=student,
+                    window=window
+                )
+                set_selection_courses(selection, serializer.validated_data['course_ids'])
+                selection.save()
+        except InvalidCourseSelection as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except SeatUnavailable as e:
+            return Response(
+                {"error": str(e), "full_courses": e.course_ids},
+                status=status.HTTP_409_CONFLICT
+            )
 
         return Response(
             {"message": "Student course registration updated successfully"},
@@ -322,82 +352,63 @@ class AcademicClassAllocationAPIView(APIView):
         academic_year = data["academic_year"]
         strength = data["strength"]
 
-        # 1️⃣ Fetch eligible students ordered by roll_no
-        students = Student.objects.filter(
-            department_id=department_id,
-            regulation_id=regulation_id,
-            semester_id=semester_id,
-            batch=batch,
-            is_active=True
-        ).order_by("roll_no")
-
-        total_students = students.count()
-
-        if total_students == 0:
-            return Response(
-                {"error": "No students found for allocation"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # 2️⃣ Calculate required number of classes
-        number_of_classes = ceil(total_students / strength)
-
-        # 3️⃣ Fetch sections
-        sections = Section.objects.filter(
-            is_active=True
-        ).order_by("section_id")
-        if sections.count() < number_of_classes:
+        # 1️⃣ Plan the classes in memory (one student query)
+        try:
+            plan, total_students = plan_from_request(data)
+        except AllocationError as e:
             return Response(
-                {"error": "Not enough active sections available"},
+                {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        created_classes = []
-
-        # 4️⃣ Create classes and assign students
-        for i in range(number_of_classes):
-
-            section = sections[i]
-
-            academic_class = AcademicClass.objects.create(
-                school_id=data["school_id"],
-                degree_id=data["degree_id"],
-                department_id=department_id,
-                semester_id=semester_id,
-                regulation_id=regulation_id,
-                batch=batch,
-                academic_year=academic_year,
-                section=section,
-                strength=strength,
-                status="ACTIVE"
-            )
+        number_of_classes = len(plan)
 
-            chunk_students = students[i * strength:(i + 1) * strength]
-
-            for student in chunk_students:
-                AcademicClassStudent.objects.create(
-                    academic_class=academic_class,
-                    student=student
-                )
-                student.section = section.name  
-                student.save(update_fields=["section"])
+        # 2️⃣ Create classes and assign students in bulk
+        classes = apply_class_allocation(
+            plan,
+            strength,
+            school_id=data["school_id"],
+            degree_id=data["degree_id"],
+            department_id=department_id,
+            semester_id=semester_id,
+            regulation_id=regulation_id,
+            batch=batch,
+            academic_year=academic_year,
+        )
 
-            created_classes.append({
+        created_classes = [
+            {
                 "class_id": str(academic_class.class_id),
-                "section": str(section.section_id),
-                "student_count": chunk_students.count()
-            })
+                "section": str(entry["section"].section_id),
+                "student_count": len(entry["student_ids"])
+            }
+            for academic_class, entry in zip(classes, plan)
+        ]
 
         return Response(
             {
                 "message": "Classes created successfully",
                 "total_students": total_students,
                 "total_classes_created": number_of_classes,
+                "strategy": data["strategy"],
                 "details": created_classes
             },
             status=status.HTTP_201_CREATED
         )
 
+def plan_from_request(data):
+    """
+    Shared by the allocation preview and commit endpoints so both always
+    produce the same distribution. Returns (plan, total_students).
+    """
+    students = eligible_students(
+        data["department_id"], data["semester_id"], data["regulation_id"], data["batch"]
+    )
+    plan = plan_class_allocation(
+        students, available_sections(), data["strength"], data["strategy"]
+    )
+    return plan, len(students)
+
 # =====================================================
 # ACADEMIC CLASS LIST API
 # =====================================================
@@ -441,61 +452,33 @@ class AcademicClassAllocationPreviewAPIView(APIView):
         serializer.is_valid(raise_exception=True)
 
         data = serializer.validated_data
-
-        department_id = data["department_id"]
-        semester_id = data["semester_id"]
-        regulation_id = data["regulation_id"]
-        batch = data["batch"]
         strength = data["strength"]
 
-        # Fetch students
-        students = Student.objects.filter(
-            department_id=department_id,
-            regulation_id=regulation_id,
-            semester_id=semester_id,
-            batch=batch,
-            is_active=True
-        ).order_by("roll_no")
-
-        total_students = students.count()
-
-        if total_students == 0:
-            return Response(
-                {"error": "No students found"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        from math import ceil
-        number_of_classes = ceil(total_students / strength)
-
-        sections = Section.objects.filter(
-            is_active=True
-        ).order_by("name")
-
-        if sections.count() < number_of_classes:
+        try:
+            plan, total_students = plan_from_request(data)
+        except AllocationError as e:
             return Response(
-                {"error": "Not enough active sections available"},
+                {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        preview_data = []
-
-        for i in range(number_of_classes):
-            section = sections[i]
-            chunk_students = students[i * strength:(i + 1) * strength]
+        number_of_classes = len(plan)
 
-            preview_data.append({
-                "section_id": section.id,
-                "student_count": chunk_students.count(),
-                "roll_range": {
-                    "from": chunk_students.first().roll_no if chunk_students else None,
-                    "to": chunk_students.last().roll_no if chunk_students else None
-                }
-            })
+        preview_data = [
+            {
+                "section_id": str(entry["section"].section_id),
+                "section_name": entry["section"].name,
+                "student_count": len(entry["student_ids"]),
+                "roll_range": entry["roll_range"],
+                "gender_counts": entry["gender_counts"]
+            }
+            for entry in plan
+        ]
 
         return Response({
             "total_students": total_students,
             "strength_per_class": strength,
+            "strategy": data["strategy"],
             "total_classes_to_be_created": number_of_classes,
             "distribution": preview_data
         })
@@ -668,6 +651,203 @@ class TimetableCreateAPIView(APIView):
             status=status.HTTP_201_CREATED
         )
 
+# =====================================================
+# TIMETABLE BULK CREATE API
+# =====================================================
+
+class TimetableBulkCreateAPIView(APIView):
+    """
+    Validates a whole (weekly) timetable in one call and creates it with a
+    single bulk_create. Clashes are checked against the stored timetable and
+    between the submitted slots; with "dry_run": true nothing is written.
+    """
+    permission_classes = [IsAuthenticated, IsAcademicCoordinator]
+
+    def post(self, request):
+        serializer = TimetableBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        slots = [dict(slot) for slot in data["slots"]]
+
+        if data["dry_run"]:
+            errors = validate_timetable(slots, data["academic_year"])
+            if errors:
+                return Response(
+                    {"error": "Timetable has clashes or invalid slots", "details": errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response({"valid": True, "slot_count": len(slots)}, status=status.HTTP_200_OK)
+
+        try:
+            with transaction.atomic():
+                timetables = create_timetable(slots, data["academic_year"])
+        except TimetableError as e:
+            return Response(
+                {"error": "Timetable has clashes or invalid slots", "details": e.args[0]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except IntegrityError:
+            return Response(
+                {"error": "A slot with the same start time already exists for this class."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {
+                "message": "Timetable created successfully",
+                "created_count": len(timetables),
+                "timetable_ids": [str(t.timetable_id) for t in timetables]
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+
+class TimetableFromTemplateAPIView(APIView):
+    """
+    Builds timetables from a TimeTableTemplate: each assignment places a
+    faculty allocation in some of the template's slots. Every slot is checked
+    in memory (template membership, breaks, allocation group and semester,
+    clashes) and the whole set is written with one bulk_create in one
+    transaction; "dry_run": true only validates.
+    """
+    permission_classes = [IsAuthenticated, IsAcademicCoordinator]
+
+    def post(self, request):
+        serializer = TimetableFromTemplateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        # 1️⃣ Template
+        try:
+            template = TimeTableTemplate.objects.get(template_id=data["template_id"])
+        except TimeTableTemplate.DoesNotExist:
+            return Response({"error": "Template not found"}, status=status.HTTP_404_NOT_FOUND)
+        if not template.is_active:
+            return Response({"error": "Template is inactive"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 2️⃣ Expand assignments into slots
+        slots, errors = expand_template(
+            template, data["assignments"],
+            academic_class_id=data.get("academic_class_id"),
+            virtual_section_id=data.get("virtual_section_id"),
+        )
+        if errors:
+            return Response(
+                {"error": "Timetable has clashes or invalid slots", "details": errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 3️⃣ Validate / create
+        try:
+            if data["dry_run"]:
+                errors = validate_timetable(slots, data["academic_year"], template.semester_id)
+                if errors:
+                    raise TimetableError(errors)
+            else:
+                with transaction.atomic():
+                    timetables = create_timetable(slots, data["academic_year"], template.semester_id)
+        except TimetableError as e:
+            return Response(
+                {
+                    "error": "Timetable has clashes or invalid slots",
+                    "details": describe_template_errors(e.args[0], slots)
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except IntegrityError:
+            return Response(
+                {"error": "A slot with the same start time already exists for this class."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if data["dry_run"]:
+            return Response({"valid": True, "slot_count": len(slots)}, status=status.HTTP_200_OK)
+
+        return Response(
+            {
+                "message": "Timetable created from template",
+                "template": template.name,
+                "created_count": len(timetables),
+                "timetable_ids": [str(t.timetable_id) for t in timetables]
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+
+class TimetableSolveAPIView(APIView):
+    """
+    Schedules every active faculty allocation of a department / semester
+    into the template's slots (see CourseManagement/scheduler.py) and
+    creates the result in one transaction. Hours that could not be placed
+    clash-free are listed under "unplaced"; with "dry_run": true the
+    proposed timetable is returned without writing it.
+    """
+    permission_classes = [IsAuthenticated, IsAcademicCoordinator]
+
+    def post(self, request):
+        serializer = TimetableSolveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        # 1️⃣ Template of the department / semester
+        templates = TimeTableTemplate.objects.filter(
+            department_id=data["department_id"], semester_id=data["semester_id"], is_active=True
+        )
+        if data.get("template_id"):
+            template = templates.filter(template_id=data["template_id"]).first()
+        else:
+            template = templates.order_by("-created_at").first()
+        if template is None:
+            return Response(
+                {"error": "No active timetable template for this department and semester"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # 2️⃣ Solve in memory
+        problem = load_problem(data["department_id"], data["semester_id"], data["academic_year"], template)
+        if not problem["allocations"]:
+            return Response(
+                {"error": "No active faculty allocations for this department and semester"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        result = TimetableSolver(**problem).solve()
+
+        payload = {
+            "template": template.name,
+            "allocation_count": len(problem["allocations"]),
+            "required_hours": sum(sum(a["hours"].values()) for a in problem["allocations"]),
+            "placed_hours": len(result["placed"]),
+            "unplaced": result["unplaced"],
+            "timetable": [
+                {key: slot[key] for key in (
+                    "faculty_allocation_id", "course_code", "academic_class_id", "virtual_section_id",
+                    "day_of_week", "start_time", "end_time", "kind",
+                )}
+                for slot in result["placed"]
+            ],
+        }
+        if data["dry_run"] or not result["placed"]:
+            return Response(payload, status=status.HTTP_200_OK)
+
+        # 3️⃣ Write the placed hours
+        try:
+            with transaction.atomic():
+                timetables = create_timetable(result["placed"], data["academic_year"], template.semester_id)
+        except TimetableError as e:
+            return Response(
+                {"error": "Timetable has clashes or invalid slots", "details": e.args[0]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except IntegrityError:
+            return Response(
+                {"error": "A slot with the same start time already exists for this class."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        payload["created_count"] = len(timetables)
+        return Response(payload, status=status.HTTP_201_CREATED)
+
 # =====================================================
 # TIMETABLE LIST API
 # =====================================================
@@ -761,11 +941,18 @@ class BulkImportTemplateView(APIView):
 # =====================================================
 # BULK IMPORT UPLOAD (COURSE ONLY)
 # =====================================================
+BULK_IMPORT_COURSE_COLUMNS = [
+    'Course Name', 'Course Code', 'School Code', 'Degree Code',
+    'Department Code', 'Regulation Code', 'Credit Value',
+]
+BULK_IMPORT_COURSE_OPTIONAL_COLUMNS = [
+    'Course Short Name', 'L', 'T', 'P', 'Category', 'Course Type',
+]
+
 class BulkImportUploadView(APIView):
     permission_classes = [IsAuthenticated, IsAcademicCoordinator]
     parser_classes = [MultiPartParser, FormParser]
 
-    @transaction.atomic
     def post(self, request, entity_type):
 
         if entity_type != 'course':
@@ -778,68 +965,97 @@ class BulkImportUploadView(APIView):
         if not file.name.endswith('.xlsx'):
             return Response({"error": "Please upload a valid Excel (.xlsx) file"}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            df = pd.read_excel(file)
-            df = df.where(pd.notnull(df), None)
-        except Exception as e:
-            return Response({"error": f"Failed to read file: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
+        if wants_async(request):
+            job = enqueue_import(ImportJob.COURSE_IMPORT, file, request.user, params={"entity_type": entity_type})
+            return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
-        created_count = 0
-        errors = []
+        data, status_code = import_course_catalog_sheet(file)
+        return Response(data, status=status_code)
 
-        try:
-            for index, row in df.iterrows():
-                try:
-                    # 1. Extract Fields
-                    course_name = row.get('Course Name')
-                    course_short_name = row.get('Course Short Name')  # Optional field
-                    course_code = row.get('Course Code')
-                    school_code = row.get('School Code')
-                    degree_code = row.get('Degree Code')
-                    dept_code = row.get('Department Code')
-                    reg_code = row.get('Regulation Code')
-                    credit_value = row.get('Credit Value')
-                    l = row.get('L', 0)
-                    t = row.get('T', 0)
-                    p = row.get('P', 0)
-                    category = str(row.get('Category', 'THEORY')).upper()
-                    course_type = str(row.get('Course Type', 'CORE')).upper()
-
-                    if not all([course_name, course_code, school_code, degree_code, dept_code, reg_code, credit_value]):
-                        errors.append(f"Row {index+2}: Missing required fields")
-                        continue
-
-                    # 2. Resolve Foreign Keys
-                    school = School.objects.filter(school_code=school_code).first()
-                    if not school:
-                        errors.append(f"Row {index+2}: School '{school_code}' not found")
-                        continue
-
-                    degree = Degree.objects.filter(degree_code=degree_code, school=school).first()
-                    if not degree:
-                        errors.append(f"Row {index+2}: Degree '{degree_code}' not found in School '{school_code}'")
-                        continue
-
-                    dept = Department.objects.filter(dept_code=dept_code, degree=degree).first()
-                    if not dept:
-                        errors.append(f"Row {index+2}: Department '{dept_code}' not found in Degree '{degree_code}'")
-                        continue
-
-                    regulation = Regulation.objects.filter(regulation_code=reg_code, degree=degree).first()
-                    if not regulation:
-                        errors.append(f"Row {index+2}: Regulation '{reg_code}' not found")
-                        continue
-
-                    # 3. Create/Update Course (batch is now accessed via regulation.batch)
+
+def import_course_catalog_sheet(file, params=None, progress=None):
+    """
+    Create/update courses row by row. Returns (payload, status_code) as
+    BulkImportUploadView responds; also the COURSE_IMPORT job handler.
+    """
+    try:
+        sheet = ExcelSheet(
+            file,
+            BULK_IMPORT_COURSE_COLUMNS,
+            optional_columns=BULK_IMPORT_COURSE_OPTIONAL_COLUMNS,
+        )
+    except Exception as e:
+        return {"error": f"Failed to read file: {str(e)}"}, 400
+
+    if sheet.missing_columns:
+        sheet.close()
+        return {"error": "Missing required columns", "missing_columns": sheet.missing_columns}, 400
+
+    if progress:
+        progress.start(total=sheet.row_count)
+
+    created_count = 0
+    errors = []
+    hierarchy = get_hierarchy()
+
+    try:
+        for done, (row_no, row) in enumerate(sheet.rows(), start=1):
+            if progress:
+                progress.update(done, errors)
+
+            try:
+                # 1. Extract Fields
+                course_name = row.get('Course Name')
+                course_short_name = row.get('Course Short Name')  # Optional field
+                course_code = row.get('Course Code')
+                school_code = row.get('School Code')
+                degree_code = row.get('Degree Code')
+                dept_code = row.get('Department Code')
+                reg_code = row.get('Regulation Code')
+                credit_value = row.get('Credit Value')
+                l = row.get('L', 0)
+                t = row.get('T', 0)
+                p = row.get('P', 0)
+                category = str(row.get('Category', 'THEORY')).upper()
+                course_type = str(row.get('Course Type', 'CORE')).upper()
+
+                if not all([course_name, course_code, school_code, degree_code, dept_code, reg_code, credit_value]):
+                    errors.append(f"Row {row_no}: Missing required fields")
+                    continue
+
+                # 2. Resolve Foreign Keys (O(1) hits on the cached hierarchy)
+                school_id = hierarchy.school_id_for_code(school_code)
+                if not school_id:
+                    errors.append(f"Row {row_no}: School '{school_code}' not found")
+                    continue
+
+                degree_id = hierarchy.degree_id_for_code(degree_code, school_id=school_id)
+                if not degree_id:
+                    errors.append(f"Row {row_no}: Degree '{degree_code}' not found in School '{school_code}'")
+                    continue
+
+                dept_id = hierarchy.department_id_for_code(dept_code, degree_id)
+                if not dept_id:
+                    errors.append(f"Row {row_no}: Department '{dept_code}' not found in Degree '{degree_code}'")
+                    continue
+
+                regulation_id = hierarchy.regulation_id_for_code(reg_code, degree_id)
+                if not regulation_id:
+                    errors.append(f"Row {row_no}: Regulation '{reg_code}' not found")
+                    continue
+
+                # 3. Create/Update Course (batch is now accessed via regulation.batch)
+                # Savepoint per row: one failing row must not poison the rest.
+                with transaction.atomic():
                     Course.objects.update_or_create(
                         course_code=course_code,
-                        regulation=regulation,
+                        regulation_id=regulation_id,
                         defaults={
                             'course_name': course_name,
-                            'course_short_name': course_short_name if pd.notna(course_short_name) else None,
-                            'school': school,
-                            'degree': degree,
-                            'department': dept,
+                            'course_short_name': course_short_name,
+                            'school_id': school_id,
+                            'degree_id': degree_id,
+                            'department_id': dept_id,
                             'credit_value': credit_value,
                             'lecture_hours': l,
                             'tutorial_hours': t,
@@ -849,15 +1065,15 @@ class BulkImportUploadView(APIView):
                             'status': True
                         }
                     )
-                    created_count += 1
+                created_count += 1
 
-                except Exception as e:
-                    errors.append(f"Row {index+2}: {str(e)}")
-            
-            return Response({
-                "message": f"Successfully processed {created_count} courses",
-                "errors": errors if errors else None
-            }, status=status.HTTP_201_CREATED if created_count > 0 else status.HTTP_200_OK)
+            except Exception as e:
+                errors.append(f"Row {row_no}: {str(e)}")
+
+        return {
+            "message": f"Successfully processed {created_count} courses",
+            "errors": errors if errors else None
+        }, 201 if created_count > 0 else 200
 
-        except Exception as e:
-             return Response({"error": f"Processing error: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+    except Exception as e:
+        return {"error": f"Processing error: {str(e)}"}, 500
\ No newline at end of file
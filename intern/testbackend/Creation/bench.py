@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the bench_* management commands.
+
+Benchmarks build their data inside a transaction that is always rolled
+back, so they can run against a development database without leaving
+anything behind:
+
+    with rolled_back():
+        hierarchy = build_bench_hierarchy()
+        ...                                  # build rows, time the code
+
+build_bench_hierarchy() creates the School -> Degree -> Department /
+Regulation / Semester chain every benchmark starts from and returns it as a
+dict (plus "batch", the regulation's batch).
+"""
+
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from .models import School, Degree, Department, Regulation, Semester
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is rolled back when it ends."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def build_bench_hierarchy(sem_number=1):
+    school = School.objects.create(school_name='Bench School', school_code='BENCH-SCH')
+    degree = Degree.objects.create(
+        degree_name='Bench Degree', degree_code='BENCH-DEG',
+        degree_duration=4, number_of_semesters=8, school=school
+    )
+    department = Department.objects.create(degree=degree, dept_code='BENCHD', dept_name='Bench Dept')
+    regulation = Regulation.objects.create(degree=degree, regulation_code='BENCHR', batch='2025-2029')
+    semester = Semester.objects.create(
+        degree=degree, sem_number=sem_number, sem_name=f'Semester {sem_number}', year=(sem_number + 1) // 2
+    )
+
+    return {
+        'school': school, 'degree': degree, 'department': department,
+        'regulation': regulation, 'semester': semester, 'batch': regulation.batch,
+    }
@@ -0,0 +1,32 @@
+"""
+Version numbers for versioned cache invalidation.
+
+Cached data whose keys include a version number is invalidated by bumping
+that number: old keys are simply never read again and expire on their TTL.
+The numbers live in Django's cache without a timeout, so with a shared
+cache backend every process sees a bump at once.
+
+    key = f"catalog:{current_version(VERSION_KEY)}:{window_id}"
+    bump_version(VERSION_KEY)       # on change
+
+Used by Creation/hierarchy.py, CourseConfiguration/catalog.py and
+faculty/quiz_payload.py.
+"""
+
+from django.core.cache import cache
+
+
+def current_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted or never set: start again above whatever is there now.
+        cache.set(key, current_version(key) + 1, timeout=None)
@@ -0,0 +1,175 @@
+"""
+Streaming Excel ingestion shared by the upload endpoints.
+
+Workbooks are opened with read_only=True, so openpyxl parses the sheet XML
+lazily and memory stays flat however many rows the file has (full mode
+builds a Cell object for every cell up front). Headers are checked once,
+then rows are yielded one at a time as dicts keyed by column name.
+
+Usage:
+    sheet = ExcelSheet(file, ["employee_id", "faculty_date_of_birth", ...],
+                       date_columns=["faculty_date_of_birth"])
+    if sheet.missing_columns:
+        sheet.close()
+        ...  # 400 response
+    for row_no, row in sheet.rows():
+        row["employee_id"], row.errors
+"""
+
+from datetime import date, datetime
+
+from openpyxl import load_workbook
+
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d")
+
+
+def parse_excel_date(value):
+    """
+    Normalise an Excel cell to a `date`.
+
+    Date-formatted cells come back from openpyxl as datetime/date; text cells
+    are accepted as DD/MM/YYYY or YYYY-MM-DD.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except Exception:
+            pass
+
+    raise ValueError(
+        f"Invalid date format '{value}'. Expected DD/MM/YYYY or YYYY-MM-DD"
+    )
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+class ExcelHeaderError(ValueError):
+    def __init__(self, missing_columns):
+        self.missing_columns = missing_columns
+        super().__init__(
+            "Missing required columns: " + ", ".join(missing_columns)
+        )
+
+
+class ExcelRow(dict):
+    """
+    One data row keyed by column name. Date columns that could not be parsed
+    keep their raw value and get a message in `errors[column]`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors = {}
+
+
+class ExcelSheet:
+    """
+    Reads the active sheet of an uploaded .xlsx file in streaming mode.
+
+    columns:          required columns.
+    optional_columns: columns that may be absent from the sheet; they are only
+                      present in the row dicts when the sheet has them.
+    by_header:        match columns by header text (case/whitespace
+                      insensitive). With by_header=False the sheet is read
+                      positionally: columns + optional_columns are the
+                      first N cells of every row, whatever the header says.
+    date_columns:     normalised with parse_excel_date().
+    """
+
+    def __init__(self, file, columns, optional_columns=(), by_header=True, date_columns=()):
+        self.columns = list(columns)
+        self.optional_columns = list(optional_columns)
+        self.by_header = by_header
+        self.date_columns = set(date_columns)
+
+        self.workbook = load_workbook(file, read_only=True, data_only=True)
+        self.sheet = self.workbook.active
+
+        header = next(self.sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        self.headers = [_clean(value) for value in header]
+        while self.headers and self.headers[-1] is None:
+            self.headers.pop()
+
+        self.column_index, self.missing_columns = self._map_columns()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # read_only workbooks keep the underlying zip file open.
+        self.workbook.close()
+
+    def _map_columns(self):
+        if not self.by_header:
+            width = len(self.headers)
+            wanted = self.columns + self.optional_columns
+            index = {name: pos for pos, name in enumerate(wanted) if pos < width}
+            missing = [name for name in self.columns if name not in index]
+            return index, missing
+
+        positions = {}
+        for pos, value in enumerate(self.headers):
+            if value is not None:
+                positions.setdefault(str(value).lower(), pos)
+
+        index = {}
+        for name in self.columns + self.optional_columns:
+            pos = positions.get(name.lower())
+            if pos is not None:
+                index[name] = pos
+
+        missing = [name for name in self.columns if name not in index]
+        return index, missing
+
+    @property
+    def row_count(self):
+        """Data rows according to the sheet's dimension record (None if unknown)."""
+        max_row = self.sheet.max_row
+        return max(max_row - 1, 0) if max_row else None
+
+    def validate(self):
+        if self.missing_columns:
+            raise ExcelHeaderError(self.missing_columns)
+
+    def rows(self, skip_blank=True):
+        """
+        Yield (row_no, ExcelRow) for every data row, starting at row 2.
+        The workbook is closed once the generator is exhausted.
+        """
+        self.validate()
+
+        try:
+            for row_no, values in enumerate(
+                self.sheet.iter_rows(min_row=2, values_only=True), start=2
+            ):
+                if skip_blank and not any(v not in (None, "") for v in values):
+                    continue
+
+                row = ExcelRow()
+                for name, pos in self.column_index.items():
+                    row[name] = _clean(values[pos]) if pos < len(values) else None
+
+                for name in self.date_columns:
+                    if row.get(name) is None:
+                        continue
+                    try:
+                        row[name] = parse_excel_date(row[name])
+                    except ValueError as e:
+                        row.errors[name] = str(e)
+
+                yield row_no, row
+        finally:
+            self.close()
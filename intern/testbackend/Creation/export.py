@@ -0,0 +1,77 @@
+"""
+Streaming CSV / XLSX exports, the write-side counterpart of Creation/excel.py.
+
+Rows come from an iterable - normally a values_list(...).iterator(chunk_size=
+EXPORT_CHUNK_SIZE) - so only one chunk of model rows is in memory at a time:
+
+* CSV is written line by line straight into a StreamingHttpResponse.
+* XLSX uses openpyxl's write_only workbook, which serializes each row to a
+  temporary file as it is appended. The finished workbook is spooled to a
+  temporary file and sent with FileResponse (a StreamingHttpResponse) in
+  blocks, so neither the workbook nor the response body is held in memory.
+
+Header rows use the same column names as the upload templates, so an export
+can be edited and fed back to the importer.
+
+Usage:
+    rows = Student.objects.values_list(...).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    return export_response("students", "Students", HEADERS, rows, file_type)
+"""
+
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FILE_TYPES = ("xlsx", "csv")
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the generator."""
+
+    def write(self, value):
+        return value
+
+
+def csv_response(filename, headers, rows):
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(lines(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_response(filename, title, headers, rows, column_widths=None):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    # write_only sheets take column widths before the first row.
+    for index, width in enumerate(column_widths or [], start=1):
+        sheet.column_dimensions[get_column_letter(index)].width = width
+
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(row)
+
+    spool = tempfile.TemporaryFile()
+    workbook.save(spool)
+    spool.seek(0)
+
+    return FileResponse(
+        spool, as_attachment=True, filename=f"{filename}.xlsx", content_type=XLSX_CONTENT_TYPE
+    )
+
+
+def export_response(filename, title, headers, rows, file_type="xlsx", column_widths=None):
+    if file_type == "csv":
+        return csv_response(filename, headers, rows)
+    return xlsx_response(filename, title, headers, rows, column_widths)
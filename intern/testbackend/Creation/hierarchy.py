@@ -0,0 +1,170 @@
+"""
+In-process cache of the academic hierarchy
+(School -> Degree -> Department / Regulation / Semester).
+
+The hierarchy changes rarely but is resolved on almost every request:
+dropdowns, upload validation, mapping pickers. get_hierarchy() returns an
+immutable snapshot built with one query per table; code -> id lookups and
+parent -> children lists are plain dict hits on it.
+
+Invalidation is versioned: post_save/post_delete on the Creation models bump
+a version number kept in Django's cache (see Creation/models.py). Each
+process compares its snapshot against that version, so with a shared cache
+backend every worker rebuilds after a change. With the default per-process
+LocMemCache, HIERARCHY_CACHE_TTL bounds how stale another process can be.
+Bulk writes that skip signals (queryset.update, bulk_create) should call
+invalidate_hierarchy() themselves.
+"""
+
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+from .cache_versions import bump_version, current_version
+from .models import School, Degree, Department, Regulation, Semester
+
+VERSION_KEY = "creation:hierarchy:version"
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def _ttl():
+    return getattr(settings, "HIERARCHY_CACHE_TTL", 300)
+
+
+def _as_uuid(value):
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def invalidate_hierarchy(*args, **kwargs):
+    """Signal-compatible: bump the shared version and drop this process's snapshot."""
+    global _snapshot
+    bump_version(VERSION_KEY)
+    _snapshot = None
+
+
+def get_hierarchy():
+    global _snapshot
+    version = current_version(VERSION_KEY)
+    snapshot = _snapshot
+
+    if snapshot is None or snapshot.version != version or snapshot.expires_at < time.monotonic():
+        with _lock:
+            snapshot = _snapshot
+            if snapshot is None or snapshot.version != version or snapshot.expires_at < time.monotonic():
+                snapshot = Hierarchy(version)
+                _snapshot = snapshot
+
+    return snapshot
+
+
+class Hierarchy:
+    """
+    Snapshot of the hierarchy. Records are the dicts `.values()` returns,
+    keyed by primary key; adjacency lists hold child ids in query order.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.expires_at = time.monotonic() + _ttl()
+
+        self.schools = {
+            row["school_id"]: row
+            for row in School.objects.values(
+                "school_id", "school_name", "school_code", "is_active"
+            )
+        }
+        self.degrees = {
+            row["degree_id"]: row
+            for row in Degree.objects.values(
+                "degree_id", "degree_name", "degree_code", "school_id", "is_active"
+            )
+        }
+        self.departments = {
+            row["dept_id"]: row
+            for row in Department.objects.values(
+                "dept_id", "dept_name", "dept_code", "degree_id", "is_active"
+            )
+        }
+        # Meta ordering (-created_at): first entry per code is what `.first()` returned.
+        self.regulations = {
+            row["regulation_id"]: row
+            for row in Regulation.objects.values(
+                "regulation_id", "regulation_code", "batch", "degree_id", "is_active"
+            )
+        }
+        self.semesters = {
+            row["sem_id"]: row
+            for row in Semester.objects.values(
+                "sem_id", "sem_number", "sem_name", "degree_id", "department_id", "year", "is_active"
+            )
+        }
+
+        # ---------- code -> id ----------
+        self.school_by_code = {row["school_code"]: pk for pk, row in self.schools.items()}
+        self.degree_by_code = {row["degree_code"]: pk for pk, row in self.degrees.items()}
+        self.department_by_code = {
+            (row["degree_id"], row["dept_code"]): pk for pk, row in self.departments.items()
+        }
+        self.regulations_by_code = {}
+        for pk, row in self.regulations.items():
+            self.regulations_by_code.setdefault((row["degree_id"], row["regulation_code"]), []).append(pk)
+
+        # ---------- parent -> children ----------
+        self.degrees_by_school = {}
+        for pk, row in self.degrees.items():
+            self.degrees_by_school.setdefault(row["school_id"], []).append(pk)
+
+        self.departments_by_degree = {}
+        for pk, row in self.departments.items():
+            self.departments_by_degree.setdefault(row["degree_id"], []).append(pk)
+
+        self.regulations_by_degree = {}
+        for pk, row in self.regulations.items():
+            self.regulations_by_degree.setdefault(row["degree_id"], []).append(pk)
+
+        self.semesters_by_degree = {}
+        for pk, row in sorted(self.semesters.items(), key=lambda item: item[1]["sem_number"]):
+            self.semesters_by_degree.setdefault(row["degree_id"], []).append(pk)
+
+    # -------------------------------------------------
+    # CODE LOOKUPS (exact match, like filter(code=...))
+    # -------------------------------------------------
+    def school_id_for_code(self, code):
+        return self.school_by_code.get(str(code))
+
+    def degree_id_for_code(self, code, school_id=None):
+        degree_id = self.degree_by_code.get(str(code))
+        if degree_id and school_id and self.degrees[degree_id]["school_id"] != school_id:
+            return None
+        return degree_id
+
+    def department_id_for_code(self, code, degree_id):
+        return self.department_by_code.get((degree_id, str(code)))
+
+    def regulation_id_for_code(self, code, degree_id):
+        ids = self.regulations_by_code.get((degree_id, str(code)))
+        return ids[0] if ids else None
+
+    # -------------------------------------------------
+    # CHILDREN
+    # -------------------------------------------------
+    def degrees_for_school(self, school_id):
+        return [self.degrees[pk] for pk in self.degrees_by_school.get(_as_uuid(school_id), [])]
+
+    def departments_for_degree(self, degree_id):
+        return [self.departments[pk] for pk in self.departments_by_degree.get(_as_uuid(degree_id), [])]
+
+    def regulations_for_degree(self, degree_id):
+        return [self.regulations[pk] for pk in self.regulations_by_degree.get(_as_uuid(degree_id), [])]
+
+    def semesters_for_degree(self, degree_id):
+        return [self.semesters[pk] for pk in self.semesters_by_degree.get(_as_uuid(degree_id), [])]
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from openpyxl import Workbook, load_workbook
+
+from Creation.excel import ExcelSheet
+
+COLUMNS = [
+    "roll_no", "student_name", "student_email", "student_gender",
+    "student_date_of_birth", "student_phone_number", "parent_name",
+    "parent_phone_number", "regulation", "dept_code", "section",
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare peak memory of full-mode openpyxl loading vs the streaming ExcelSheet reader.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='Row counts to benchmark')
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            path = self._build_file(size)
+            try:
+                full_peak, full_time = self._measure(self._read_full, path)
+                stream_peak, stream_time = self._measure(self._read_streaming, path)
+            finally:
+                os.remove(path)
+
+            self.stdout.write(
+                f'{size:>7} rows: full {full_peak / 2**20:8.1f} MiB peak {full_time:6.2f}s | '
+                f'streaming {stream_peak / 2**20:8.1f} MiB peak {stream_time:6.2f}s'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def _build_file(self, size):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(COLUMNS)
+        for i in range(size):
+            ws.append([
+                f'BENCH{i:07d}', f'Student {i}', f'bench{i}@example.com', 'MALE',
+                date(2005, 1, 1), '9876543210', f'Parent {i}', '9876543210',
+                'R25', 'CSE', 'A',
+            ])
+
+        fd, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        wb.save(path)
+        return path
+
+    def _measure(self, reader, path):
+        tracemalloc.start()
+        started = time.perf_counter()
+        reader(path)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, elapsed
+
+    def _read_full(self, path):
+        sheet = load_workbook(path).active
+        for _ in sheet.iter_rows(min_row=2, values_only=True):
+            pass
+
+    def _read_streaming(self, path):
+        sheet = ExcelSheet(path, COLUMNS, date_columns=["student_date_of_birth"])
+        for _ in sheet.rows():
+            pass
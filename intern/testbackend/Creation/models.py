@@ -196,3 +196,31 @@ class Regulation(models.Model):
 
     def __str__(self):
         return f"{self.regulation_code} ({self.batch})"
+
+
+# ------------------------------------------
+# HIERARCHY CACHE INVALIDATION
+# ------------------------------------------
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=School)
+@receiver(post_delete, sender=School)
+@receiver(post_save, sender=Degree)
+@receiver(post_delete, sender=Degree)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+@receiver(post_save, sender=Regulation)
+@receiver(post_delete, sender=Regulation)
+def invalidate_hierarchy_cache(sender, **kwargs):
+    from .hierarchy import invalidate_hierarchy
+
+    # Once now (this request sees its own write) and again after commit,
+    # in case another request rebuilt from the pre-commit state meanwhile.
+    invalidate_hierarchy()
+    transaction.on_commit(invalidate_hierarchy)
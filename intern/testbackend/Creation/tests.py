@@ -1,3 +1,59 @@
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import School, Degree, Department, Regulation
+from .hierarchy import get_hierarchy
+
+User = get_user_model()
+
+
+class HierarchyCacheTests(TestCase):
+    def setUp(self):
+        self.school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        self.degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH",
+            degree_duration=4, number_of_semesters=8, school=self.school
+        )
+        self.dept = Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=self.degree)
+
+    def test_lookups_are_served_without_queries(self):
+        get_hierarchy()
+
+        with self.assertNumQueries(0):
+            hierarchy = get_hierarchy()
+            self.assertEqual(hierarchy.school_id_for_code("SOE"), self.school.school_id)
+            self.assertEqual(hierarchy.degree_id_for_code("BTECH", school_id=self.school.school_id), self.degree.degree_id)
+            self.assertEqual(hierarchy.department_id_for_code("CSE", self.degree.degree_id), self.dept.dept_id)
+            self.assertEqual(
+                [d["dept_code"] for d in hierarchy.departments_for_degree(str(self.degree.degree_id))], ["CSE"]
+            )
+
+    def test_saves_and_deletes_invalidate(self):
+        before = get_hierarchy()
+        regulation = Regulation.objects.create(degree=self.degree, regulation_code="R25", batch="2025-2029")
+
+        after = get_hierarchy()
+        self.assertNotEqual(before.version, after.version)
+        self.assertEqual(after.regulation_id_for_code("R25", self.degree.degree_id), regulation.regulation_id)
+
+        self.dept.delete()
+        self.assertEqual(get_hierarchy().departments_for_degree(self.degree.degree_id), [])
+
+    def test_dropdown_endpoints(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(
+            username='h_admin', password='password', role='COLLEGE_ADMIN', email='h_admin@test.com'
+        ))
+
+        response = client.get(f"/users/dept-admin/degrees-for-school/?school_id={self.school.school_id}")
+        self.assertEqual([d["degree_code"] for d in response.data], ["BTECH"])
+
+        response = client.get("/users/dept-admin/departments-for-degree/?degree_id=not-a-uuid")
+        self.assertEqual(response.data, [])
+
+        response = client.get("/users/faculty/mapping-options/")
+        self.assertEqual(
+            [o["label"] for o in response.data],
+            ["School of Engineering (Full School)", "School of Engineering - Computer Science"]
+        )
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import ImportJob
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('job_id', 'job_type', 'status', 'processed_rows', 'total_rows', 'error_count', 'created_by', 'created_at')
+    list_filter = ('job_type', 'status')
@@ -0,0 +1,52 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ImportJobs.worker import worker_main
+
+
+class Command(BaseCommand):
+    help = 'Process queued import jobs (faculty/student/course uploads) with N worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--stale-after', type=int, default=1800,
+                            help='Re-queue RUNNING jobs with no progress for this many seconds (0 = never)')
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+
+    def handle(self, *args, **options):
+        worker_options = {
+            'once': options['once'],
+            'poll_interval': options['poll_interval'],
+            'stale_after': options['stale_after'] or None,
+        }
+
+        if options['workers'] <= 1:
+            worker_main(0, worker_options)
+            self.stdout.write(self.style.SUCCESS('Worker finished.'))
+            return
+
+        # Child processes must not share the parent's DB connections.
+        connections.close_all()
+
+        processes = [
+            multiprocessing.Process(target=worker_main, args=(index, worker_options), daemon=False)
+            for index in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+
+        self.stdout.write(f"Started {len(processes)} import workers.")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+        self.stdout.write(self.style.SUCCESS('Workers finished.'))
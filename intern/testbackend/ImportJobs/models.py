@@ -0,0 +1,77 @@
+import uuid
+from django.db import models
+from django.conf import settings
+
+
+class ImportJob(models.Model):
+    """
+    One uploaded file waiting for / being processed by a background worker.
+    The table doubles as the queue (see ImportJobs/queue.py).
+    """
+
+    FACULTY_UPLOAD = 'FACULTY_UPLOAD'
+    STUDENT_UPLOAD = 'STUDENT_UPLOAD'
+    COURSE_UPLOAD = 'COURSE_UPLOAD'
+    COURSE_IMPORT = 'COURSE_IMPORT'
+
+    JOB_TYPE_CHOICES = [
+        (FACULTY_UPLOAD, 'Faculty Excel Upload'),
+        (STUDENT_UPLOAD, 'Student Excel Upload'),
+        (COURSE_UPLOAD, 'Course Bulk Upload'),
+        (COURSE_IMPORT, 'Course Bulk Import'),
+    ]
+
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    SUCCESS = 'SUCCESS'
+    PARTIAL_SUCCESS = 'PARTIAL_SUCCESS'
+    FAILED = 'FAILED'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (SUCCESS, 'Success'),
+        (PARTIAL_SUCCESS, 'Partial Success'),
+        (FAILED, 'Failed'),
+    ]
+
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job_type = models.CharField(max_length=30, choices=JOB_TYPE_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+
+    file = models.FileField(upload_to='import_jobs/', null=True, blank=True)
+    params = models.JSONField(default=dict, blank=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='import_jobs'
+    )
+
+    # Progress (updated by the worker while the job runs)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+
+    # Final response body / status code the synchronous endpoint would have returned
+    result = models.JSONField(null=True, blank=True)
+    result_status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    worker = models.CharField(max_length=100, blank=True, default='')
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.job_type} {self.job_id} ({self.status})"
@@ -0,0 +1,205 @@
+"""
+DB-backed queue for import jobs.
+
+No broker is needed: the ImportJob table is the queue. A worker claims a job
+with a conditional UPDATE (status PENDING -> RUNNING), which only one worker
+can win, so any number of workers can poll the same table safely on SQLite
+and MySQL alike.
+
+Job handlers are plain functions `handler(file, params, progress)` returning
+`(payload, status_code)`; the same functions back the synchronous upload
+endpoints (with progress=None).
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {
+    ImportJob.FACULTY_UPLOAD: 'UserDataManagement.importers.import_faculty_sheet',
+    ImportJob.STUDENT_UPLOAD: 'UserDataManagement.importers.import_student_sheet',
+    ImportJob.COURSE_UPLOAD: 'CourseConfiguration.views.import_course_sheet',
+    ImportJob.COURSE_IMPORT: 'CourseManagement.views.import_course_catalog_sheet',
+}
+
+# Only the first errors are kept on the job row; error_count has the total.
+MAX_STORED_ERRORS = 500
+
+
+def wants_async(request):
+    """Upload endpoints switch to a background job with ?async=1 (or an `async` form field)."""
+    value = request.query_params.get('async') or request.data.get('async')
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def enqueue_import(job_type, uploaded_file, user, params=None):
+    job = ImportJob(job_type=job_type, created_by=user, params=params or {})
+    job.file.save(uploaded_file.name, uploaded_file, save=False)
+    job.save()
+    return job
+
+
+class JobProgress:
+    """
+    Passed to handlers as `progress`. Writes rows done / errors so far to the
+    job row, throttled so a 100k-row import does not issue 100k UPDATEs.
+    """
+
+    def __init__(self, job, every_rows=200, every_seconds=1.0):
+        self.job = job
+        self.every_rows = every_rows
+        self.every_seconds = every_seconds
+        self.processed = 0
+        self.errors = []
+        self._last_rows = 0
+        self._last_time = 0.0
+
+    def start(self, total=None):
+        self._write(total_rows=total)
+
+    def update(self, processed, errors=None):
+        self.processed = processed
+        if errors is not None:
+            self.errors = errors
+
+        now = time.monotonic()
+        if (processed - self._last_rows >= self.every_rows
+                or now - self._last_time >= self.every_seconds):
+            self.flush()
+
+    def heartbeat(self):
+        """Show the job is alive during long steps that process no rows (hashing, writes)."""
+        if time.monotonic() - self._last_time >= self.every_seconds:
+            self.flush()
+
+    def flush(self):
+        self._write()
+
+    def _write(self, **extra):
+        self._last_rows = self.processed
+        self._last_time = time.monotonic()
+        # A job re-queued away from this worker belongs to its new worker.
+        ImportJob.objects.filter(job_id=self.job.job_id, worker=self.job.worker).update(
+            processed_rows=self.processed,
+            error_count=len(self.errors),
+            errors=list(self.errors[:MAX_STORED_ERRORS]),
+            heartbeat_at=timezone.now(),
+            **extra
+        )
+
+
+def requeue_stale_jobs(stale_after):
+    """Put RUNNING jobs whose worker stopped heart-beating back in the queue."""
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return ImportJob.objects.filter(
+        status=ImportJob.RUNNING,
+        heartbeat_at__lt=cutoff,
+    ).update(status=ImportJob.PENDING, worker='')
+
+
+def claim_next_job(worker_name):
+    candidates = ImportJob.objects.filter(
+        status=ImportJob.PENDING
+    ).order_by('created_at').values_list('job_id', flat=True)[:10]
+
+    for job_id in candidates:
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(
+            job_id=job_id,
+            status=ImportJob.PENDING,
+        ).update(
+            status=ImportJob.RUNNING,
+            worker=worker_name,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return ImportJob.objects.get(job_id=job_id)
+
+    return None
+
+
+def _finish_job(job, **fields):
+    """
+    Store the outcome, unless the job was re-queued as stale and claimed by
+    another worker meanwhile. Returns whether it was stored.
+    """
+    finished = ImportJob.objects.filter(
+        job_id=job.job_id, status=ImportJob.RUNNING, worker=job.worker,
+    ).update(finished_at=timezone.now(), **fields)
+    if not finished:
+        logger.warning("Import job %s was re-queued while %s ran it; result discarded", job.job_id, job.worker)
+    return bool(finished)
+
+
+def run_job(job):
+    handler = import_string(JOB_HANDLERS[job.job_type])
+    progress = JobProgress(job)
+
+    try:
+        with job.file.open('rb') as fh:
+            payload, status_code = handler(fh, job.params, progress)
+    except Exception as e:
+        logger.exception("Import job %s failed", job.job_id)
+        progress.flush()
+        _finish_job(
+            job,
+            status=ImportJob.FAILED,
+            result={"status": "FAILED", "error": f"Unexpected error during processing: {str(e)}"},
+            result_status_code=500,
+        )
+        return
+
+    progress.flush()
+
+    if status_code >= 400:
+        final_status = ImportJob.FAILED
+    elif progress.errors:
+        final_status = ImportJob.PARTIAL_SUCCESS
+    else:
+        final_status = ImportJob.SUCCESS
+
+    finished = _finish_job(
+        job,
+        status=final_status,
+        result=payload,
+        result_status_code=status_code,
+    )
+
+    # The upload is only kept around for failed jobs (to inspect / re-run).
+    if finished and final_status != ImportJob.FAILED:
+        job.file.delete(save=False)
+        ImportJob.objects.filter(job_id=job.job_id).update(file='')
+
+
+def work(worker_name, once=False, poll_interval=2.0, stale_after=None):
+    """Worker loop: claim and run jobs until interrupted (or the queue is empty with once=True)."""
+    processed = 0
+    last_stale_check = 0.0
+
+    while True:
+        if stale_after and time.monotonic() - last_stale_check >= stale_after / 2:
+            requeued = requeue_stale_jobs(stale_after)
+            if requeued:
+                logger.warning("[%s] re-queued %d stale job(s)", worker_name, requeued)
+            last_stale_check = time.monotonic()
+
+        job = claim_next_job(worker_name)
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        logger.info("[%s] running %s %s", worker_name, job.job_type, job.job_id)
+        run_job(job)
+        processed += 1
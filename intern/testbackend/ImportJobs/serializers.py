@@ -0,0 +1,28 @@
+from rest_framework import serializers
+from .models import ImportJob
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    status_url = serializers.SerializerMethodField()
+    percent_complete = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'job_id', 'job_type', 'status',
+            'total_rows', 'processed_rows', 'percent_complete',
+            'error_count', 'errors',
+            'result', 'result_status_code',
+            'created_at', 'started_at', 'finished_at',
+            'status_url',
+        ]
+
+    def get_status_url(self, obj):
+        return f"/jobs/{obj.job_id}/"
+
+    def get_percent_complete(self, obj):
+        if obj.status in (ImportJob.SUCCESS, ImportJob.PARTIAL_SUCCESS):
+            return 100
+        if not obj.total_rows:
+            return None
+        return min(100, round(obj.processed_rows * 100 / obj.total_rows))
@@ -0,0 +1,111 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openpyxl import Workbook
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from custom_auth.models import User
+from Creation.models import School, Degree, Department
+from UserDataManagement.models import Faculty
+from .models import ImportJob
+from .queue import claim_next_job, requeue_stale_jobs, run_job, work
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class ImportJobQueueTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='job_admin', password='password', role='COLLEGE_ADMIN', email='job_admin@test.com'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+        school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH",
+            degree_duration=4, number_of_semesters=8, school=school
+        )
+        Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=degree)
+
+    def _faculty_file(self):
+        wb = Workbook()
+        ws = wb.active
+        ws.append([
+            "employee_id", "faculty_name", "faculty_email", "faculty_mobile_no",
+            "faculty_date_of_birth", "faculty_gender", "dept_code", "school_code",
+        ])
+        ws.append(["E001", "Fac One", "f1@test.com", "9876543210", "1985-08-15", "MALE", "CSE", "SOE"])
+        ws.append(["E002", "Fac Two", "f2@test.com", "9876543211", "1985-08-15", "UNKNOWN", "CSE", "SOE"])
+        buffer = BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        buffer.name = "faculty.xlsx"
+        return buffer
+
+    def test_async_upload_is_processed_by_worker(self):
+        response = self.client.post(
+            "/users/faculty/upload-bulk/?async=1", {"file": self._faculty_file()}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], ImportJob.PENDING)
+        self.assertFalse(Faculty.objects.exists())
+
+        self.assertEqual(work("test-worker", once=True, poll_interval=0), 1)
+
+        poll = self.client.get(response.data["status_url"])
+        self.assertEqual(poll.status_code, status.HTTP_200_OK)
+        self.assertEqual(poll.data["status"], ImportJob.PARTIAL_SUCCESS)
+        self.assertEqual(poll.data["processed_rows"], 2)
+        self.assertEqual(poll.data["error_count"], 1)
+        self.assertEqual(poll.data["result"]["summary"]["created_faculty"], 1)
+        self.assertTrue(Faculty.objects.filter(employee_id="E001").exists())
+
+    def test_job_is_claimed_once(self):
+        job = ImportJob.objects.create(job_type=ImportJob.FACULTY_UPLOAD, created_by=self.admin_user)
+
+        self.assertEqual(claim_next_job("worker-a").job_id, job.job_id)
+        self.assertIsNone(claim_next_job("worker-b"))
+
+        ImportJob.objects.filter(job_id=job.job_id).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(stale_after=60), 1)
+        self.assertEqual(claim_next_job("worker-b").attempts, 2)
+
+    def test_requeued_job_result_is_not_overwritten(self):
+        response = self.client.post(
+            "/users/faculty/upload-bulk/?async=1", {"file": self._faculty_file()}, format="multipart"
+        )
+        stale = claim_next_job("worker-a")
+
+        ImportJob.objects.filter(job_id=stale.job_id).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        requeue_stale_jobs(stale_after=60)
+        self.assertEqual(claim_next_job("worker-b").job_id, stale.job_id)
+
+        # worker-a finishes late: the job stays with worker-b.
+        run_job(stale)
+        job = ImportJob.objects.get(job_id=response.data["job_id"])
+        self.assertEqual((job.status, job.worker), (ImportJob.RUNNING, "worker-b"))
+        self.assertIsNone(job.finished_at)
+        self.assertTrue(job.file)
+
+    def test_other_users_cannot_poll_job(self):
+        job = ImportJob.objects.create(job_type=ImportJob.FACULTY_UPLOAD, created_by=self.admin_user)
+        other = User.objects.create_user(username='other', password='password', email='other@test.com')
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get(f"/jobs/{job.job_id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
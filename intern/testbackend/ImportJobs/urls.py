@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import ImportJobListAPIView, ImportJobDetailAPIView
+
+urlpatterns = [
+    path('', ImportJobListAPIView.as_view(), name='import-job-list'),
+    path('<uuid:job_id>/', ImportJobDetailAPIView.as_view(), name='import-job-detail'),
+]
@@ -0,0 +1,38 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django.shortcuts import get_object_or_404
+
+from .models import ImportJob
+from .serializers import ImportJobSerializer
+
+
+class ImportJobListAPIView(APIView):
+    """Recent import jobs started by the current user."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        jobs = ImportJob.objects.filter(created_by=request.user).defer('errors', 'result')[:50]
+        data = [
+            {
+                "job_id": job.job_id,
+                "job_type": job.job_type,
+                "status": job.status,
+                "processed_rows": job.processed_rows,
+                "total_rows": job.total_rows,
+                "error_count": job.error_count,
+                "created_at": job.created_at,
+                "status_url": f"/jobs/{job.job_id}/",
+            }
+            for job in jobs
+        ]
+        return Response(data)
+
+
+class ImportJobDetailAPIView(APIView):
+    """Poll a job: rows done, errors so far and, once finished, the full result."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(ImportJob, job_id=job_id, created_by=request.user)
+        return Response(ImportJobSerializer(job).data)
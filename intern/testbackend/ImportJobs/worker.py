@@ -0,0 +1,32 @@
+"""
+Process entry point for `run_import_worker --workers N`.
+
+Kept free of model imports at module level so it can be the target of a
+spawned (not forked) process, which has to set Django up itself.
+"""
+
+import logging
+import os
+import socket
+
+
+def worker_main(index, options):
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+    from .queue import work
+
+    # Job progress and failures go through the ImportJobs.queue logger; give
+    # it a console handler unless the project configured logging already.
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    worker_name = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    work(
+        worker_name,
+        once=options['once'],
+        poll_interval=options['poll_interval'],
+        stale_after=options['stale_after'],
+    )
@@ -1,7 +1,10 @@
+import uuid
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status, viewsets
+from django.http import HttpResponse
 from django.utils import timezone
 from django.db import transaction
 
@@ -10,11 +13,16 @@ from .models import (
 )
 from faculty.models import (
     Assignment, StudentSubmission, Quiz, Question, Option, 
-    StudentQuizAttempt, StudentAnswer, Resource, StudentAttendance
+    StudentQuizAttempt, StudentAnswer, Resource, StudentAttendanceSummary
 )
+from faculty.attendance import summarize
+from faculty.grading import AnswerKey, quiz_msq_scoring, score_attempts
+from faculty.quiz_payload import get_quiz_payload
+from faculty.quiz_results import invalidate_quiz_results
+from faculty.answers import AttemptClosed, closed_reason, remaining_seconds, save_attempt_answers
 from CourseManagement.models import AcademicClassStudent, FacultyAllocation
 from CourseConfiguration.models import Course, RegistrationWindow, StudentSelection
-from CourseConfiguration.serializers import RegistrationWindowSerializer, StudentSelectionSerializer
+from CourseConfiguration.serializers import StudentSelectionSerializer
 
 from .serializers import (
     DocumentRequestSerializer,
@@ -23,7 +31,6 @@ from .serializers import (
     AssignmentSerializer,
     StudentSubmissionSerializer,
     QuizSerializer,
-    QuestionSerializer,
     StudentQuizAttemptSerializer,
     StudentAnswerSerializer,
     ResourceSerializer
@@ -119,7 +126,7 @@ class DocumentRequestHistoryView(APIView):
 
 from rest_framework.decorators import action
 from CourseConfiguration.models import Course, RegistrationWindow
-from CourseConfiguration.serializers import CourseSerializer
+from CourseConfiguration.catalog import catalog_response, open_window
 
 # =====================================================
 # COURSE REGISTRATION VIEWS
@@ -145,25 +152,14 @@ class CourseRegistrationViewSet(viewsets.ReadOnlyModelViewSet):
         
         student = request.user.student_profile
         
-        # 1. Find active window for this student
-        window = RegistrationWindow.objects.filter(
-            department=student.department,
-            batch=student.batch,
-            is_active=True,
-            status='ACTIVE',
-            start_datetime__lte=timezone.now(),
-            end_datetime__gte=timezone.now()
-        ).first()
+        # 1. Find the open window for this student (cached per cohort)
+        window_id = open_window(student)
         
-        if not window:
+        if not window_id:
             return Response({"detail": "No active registration window found for your semester/regulation."}, status=404)
         
-        # 2. Fetch courses from the window
-        return Response({
-            "window": RegistrationWindowSerializer(window).data,
-            "major_subjects": CourseSerializer(window.major_subjects.all(), many=True).data,
-            "elective_subjects": CourseSerializer(window.elective_subjects.all(), many=True).data,
-        })
+        # 2. Courses from the window, pre-rendered once per window
+        return catalog_response(window_id)
 
 # =====================================================
 # STUDENT PORTAL / DASHBOARD VIEWS
@@ -184,17 +180,22 @@ class StudentDashboardSummaryView(APIView):
         # 2. Document Requests (Recent 3)
         recent_docs = DocumentRequest.objects.filter(student=student).order_by('-created_at')[:3]
         
-        # 3. Attendance Summary
-        attendance_records = StudentAttendance.objects.filter(student=student)
-        total_sessions = attendance_records.count()
-        attended_sessions = attendance_records.filter(status='PRESENT').count()
-        overall_percentage = (attended_sessions / total_sessions * 100) if total_sessions > 0 else 0
-        
-        attendance_summary = {
-            "overall_percentage": round(overall_percentage, 2),
-            "classes_attended": attended_sessions,
-            "total_classes": total_sessions
-        }
+        # 3. Attendance Summary (one pre-aggregated row per course)
+        course_summaries = StudentAttendanceSummary.objects.filter(
+            student=student
+        ).select_related('faculty_allocation__course').order_by('faculty_allocation__course__course_code')
+
+        attendance_summary = summarize(course_summaries)
+        attendance_summary["courses"] = [
+            {
+                "course_code": s.faculty_allocation.course.course_code,
+                "course_name": s.faculty_allocation.course.course_name,
+                "classes_attended": s.present_sessions,
+                "total_classes": s.total_sessions,
+                "percentage": s.percentage
+            }
+            for s in course_summaries
+        ]
         
         # 4. Academic Info
         academic_info = {
@@ -303,18 +304,26 @@ class StudentQuizViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=True, methods=['get'])
     def questions(self, request, pk=None):
-        quiz = self.get_object()
-        student = request.user.student_profile
-        
-        attempt = StudentQuizAttempt.objects.filter(quiz=quiz, student=student).first()
-        if not attempt:
+        # The attempt lookup also checks what get_queryset() does (quiz
+        # published, student in its class), so it is the only query; the
+        # payload comes from cache.
+        try:
+            quiz_id = uuid.UUID(str(pk))
+        except ValueError:
+            return Response({"detail": "Not found."}, status=404)
+
+        is_submitted = StudentQuizAttempt.objects.filter(
+            quiz_id=quiz_id, student=request.user,
+            quiz__is_published=True,
+            quiz__academic_class__students__student__user=request.user,
+        ).values_list('is_submitted', flat=True).first()
+        if is_submitted is None:
             return Response({"detail": "You must start the attempt first."}, status=400)
             
-        if attempt.is_submitted:
+        if is_submitted:
             return Response({"detail": "Quiz already submitted."}, status=400)
             
-        questions = quiz.questions.all().order_by('order')
-        return Response(QuestionSerializer(questions, many=True).data)
+        return HttpResponse(get_quiz_payload(quiz_id), content_type="application/json")
 
     @action(detail=True, methods=['post'])
     def start_attempt(self, request, pk=None):
@@ -341,6 +350,8 @@ class StudentQuizViewSet(viewsets.ReadOnlyModelViewSet):
         
         if attempt.is_submitted:
             return Response({"detail": "Already submitted"}, status=400)
+        if timezone.now() > attempt.calculated_end_time:
+            return Response({"detail": "Time is up for this attempt."}, status=400)
             
         question_id = request.data.get('question_id')
         option_ids = request.data.get('option_ids', [])
@@ -358,17 +369,61 @@ class StudentQuizViewSet(viewsets.ReadOnlyModelViewSet):
         
         return Response({"status": "answer saved"})
 
+    @action(detail=True, methods=['post'])
+    def save_answers(self, request, pk=None):
+        """
+        Autosave: {"answers": [{"question_id", "option_ids", "text_answer"}, ...]}
+        with every answer changed since the last save.
+        """
+        quiz = self.get_object()
+        attempt = StudentQuizAttempt.objects.filter(quiz=quiz, student=request.user).first()
+        if not attempt:
+            return Response({"detail": "You must start the attempt first."}, status=400)
+
+        reason = closed_reason(attempt)
+        if reason:
+            return Response({"detail": reason}, status=400)
+
+        answers = request.data.get('answers', [])
+        if not isinstance(answers, list):
+            return Response({"detail": "answers must be a list"}, status=400)
+
+        try:
+            saved, errors = save_attempt_answers(attempt, answers)
+        except AttemptClosed as e:
+            return Response({"detail": str(e)}, status=400)
+        if errors:
+            return Response({"detail": "Invalid answers", "errors": errors}, status=400)
+
+        return Response({
+            "status": "answers saved",
+            "saved": saved,
+            "remaining_seconds": remaining_seconds(attempt),
+        })
+
     @action(detail=True, methods=['post'])
     def finalize(self, request, pk=None):
         quiz = self.get_object()
-        attempt = StudentQuizAttempt.objects.get(quiz=quiz, student=request.user)
-        
-        if attempt.is_submitted:
-            return Response({"detail": "Already submitted"}, status=400)
-            
-        attempt.is_submitted = True
-        attempt.submitted_at = timezone.now()
-        attempt.save()
+        key = AnswerKey.load(quiz.id)
+
+        # Locked like save_attempt_answers(), so no autosave can change the
+        # answers between scoring and marking the attempt submitted.
+        with transaction.atomic():
+            attempt = StudentQuizAttempt.objects.select_for_update().filter(
+                quiz=quiz, student=request.user
+            ).first()
+            if not attempt:
+                return Response({"detail": "You must start the attempt first."}, status=400)
+
+            if attempt.is_submitted:
+                return Response({"detail": "Already submitted"}, status=400)
+
+            attempt.total_score = score_attempts(key, [attempt.id], quiz_msq_scoring(quiz))[attempt.id]
+            attempt.is_submitted = True
+            attempt.submitted_at = timezone.now()
+            attempt.save(update_fields=["total_score", "is_submitted", "submitted_at"])
+
+        invalidate_quiz_results(quiz.id)
         return Response({"status": "quiz submitted"})
 
 
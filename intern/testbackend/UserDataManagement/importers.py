@@ -0,0 +1,610 @@
+"""
+Set-based import engine for student Excel uploads.
+
+The per-row flow used to run 6-8 queries for every student (duplicate check,
+four lookups, user existence check and two creates). The engine below reads
+the rows once, resolves every lookup key with one query per table, checks
+existing roll numbers / usernames / emails with IN queries and writes Users
+and Students with bulk_create in chunks.
+
+The report it returns is the same one StudentExcelUploadSerializer has always
+returned: {"created": int, "skipped": [...], "errors": [...]}.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from Creation.excel import ExcelSheet
+from Creation.models import School, Department, Regulation, Semester
+from AcademicSetup.models import Section
+from custom_auth.provisioning import bulk_create_users, hash_passwords
+from .models import Faculty, FacultyMapping, Student
+
+User = get_user_model()
+
+# Rows are written (and IN lookups issued) in chunks of this size.
+# Keeps every statement well below SQLite's bound-parameter limit.
+BATCH_SIZE = 500
+
+
+def chunked(values, size):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _is_blank(value):
+    return value in (None, "", " ")
+
+
+class StudentImportEngine:
+    """
+    Validates and creates students for an iterable of (row_no, row) tuples,
+    where each row is a dict keyed by REQUIRED_COLUMNS (see Creation.excel).
+
+    Usage:
+        engine = StudentImportEngine()
+        report = engine.run(rows)
+    """
+
+    REQUIRED_COLUMNS = [
+        "roll_no",
+        "student_name",
+        "student_email",
+        "student_gender",
+        "student_date_of_birth",
+        "student_phone_number",
+        "parent_name",
+        "parent_phone_number",
+        "regulation",
+        "dept_code",
+        "section",
+    ]
+
+    def __init__(self, batch_size=BATCH_SIZE, hash_workers=None, progress=None):
+        self.batch_size = batch_size
+        self.hash_workers = hash_workers
+        self.progress = progress
+        self.rows_seen = 0
+        self.processed = 0
+        self.created = 0
+        self.skipped = []
+        self.errors = []
+
+    # -------------------------------------------------
+    # PUBLIC ENTRY POINT
+    # -------------------------------------------------
+    def run(self, rows):
+        parsed = self._parse_rows(rows)
+
+        lookups = self._load_lookups(parsed)
+        existing = self._load_existing(parsed)
+
+        pending = self._validate(parsed, lookups, existing)
+        self._report_progress(self.rows_seen - len(pending))
+        self._write(pending)
+
+        self.skipped.sort(key=lambda item: item["row"])
+        self.errors.sort(key=lambda item: item["row"])
+
+        return {
+            "created": self.created,
+            "skipped": self.skipped,
+            "errors": self.errors,
+        }
+
+    def _report_progress(self, processed):
+        self.processed = processed
+        if self.progress:
+            self.progress.update(processed, self.errors)
+
+    # -------------------------------------------------
+    # 1️⃣ REQUIRED COLUMN CHECKS
+    # -------------------------------------------------
+    def _parse_rows(self, rows):
+        parsed = []
+
+        for row_no, row in rows:
+            self.rows_seen += 1
+            missing_columns = [
+                f"{column_name} is required"
+                for column_name in self.REQUIRED_COLUMNS
+                if _is_blank(row.get(column_name))
+            ]
+            if missing_columns:
+                self.errors.append({
+                    "row": row_no,
+                    "error": ", ".join(missing_columns),
+                })
+                continue
+
+            date_errors = getattr(row, "errors", None)
+            if date_errors:
+                self.errors.append({
+                    "row": row_no,
+                    "error": ", ".join(date_errors.values()),
+                })
+                continue
+
+            data = {column_name: row[column_name] for column_name in self.REQUIRED_COLUMNS}
+            data["row"] = row_no
+            parsed.append(data)
+
+        return parsed
+
+    # -------------------------------------------------
+    # 2️⃣ ONE QUERY PER LOOKUP TABLE
+    # -------------------------------------------------
+    def _load_lookups(self, parsed):
+        dept_codes = {str(r["dept_code"]).lower() for r in parsed}
+        regulation_codes = {str(r["regulation"]).lower() for r in parsed}
+
+        # `.first()` on the old per-row queries ordered departments by pk and
+        # regulations by their Meta ordering; keep the first hit per code.
+        departments = {}
+        for dept in (
+            Department.objects.annotate(code_lower=Lower("dept_code"))
+            .filter(code_lower__in=dept_codes)
+            .select_related("degree")
+            .order_by("pk")
+        ):
+            departments.setdefault(dept.code_lower, dept)
+
+        regulations = {}
+        for regulation in (
+            Regulation.objects.annotate(code_lower=Lower("regulation_code"))
+            .filter(code_lower__in=regulation_codes)
+        ):
+            regulations.setdefault(regulation.code_lower, regulation)
+
+        degree_ids = {dept.degree_id for dept in departments.values()}
+        first_semesters = {}
+        for semester in Semester.objects.filter(
+            degree_id__in=degree_ids
+        ).order_by("degree_id", "sem_number"):
+            first_semesters.setdefault(semester.degree_id, semester)
+
+        sections = set(
+            Section.objects.filter(
+                department_id__in=[d.pk for d in departments.values()],
+                regulation_id__in=[r.pk for r in regulations.values()],
+            )
+            .annotate(name_lower=Lower("name"))
+            .values_list("name_lower", "department_id", "regulation_id")
+        )
+
+        return {
+            "departments": departments,
+            "regulations": regulations,
+            "semesters": first_semesters,
+            "sections": sections,
+        }
+
+    # -------------------------------------------------
+    # 3️⃣ EXISTING ROLL NUMBERS / USERNAMES / EMAILS
+    # -------------------------------------------------
+    def _load_existing(self, parsed):
+        roll_nos = {str(r["roll_no"]) for r in parsed}
+        emails = {r["student_email"] for r in parsed}
+
+        existing_rolls = set()
+        existing_usernames = set()
+        for chunk in chunked(roll_nos, self.batch_size):
+            existing_rolls.update(
+                Student.objects.filter(roll_no__in=chunk).values_list("roll_no", flat=True)
+            )
+            existing_usernames.update(
+                User.objects.filter(username__in=chunk).values_list("username", flat=True)
+            )
+
+        existing_emails = set()
+        for chunk in chunked(emails, self.batch_size):
+            existing_emails.update(
+                User.objects.filter(email__in=chunk).values_list("email", flat=True)
+            )
+
+        return {
+            "roll_nos": existing_rolls,
+            "usernames": existing_usernames,
+            "emails": existing_emails,
+        }
+
+    # -------------------------------------------------
+    # 4️⃣ IN-MEMORY VALIDATION
+    # -------------------------------------------------
+    def _validate(self, parsed, lookups, existing):
+        pending = []
+        seen_emails = set()
+
+        for data in parsed:
+            row_no = data["row"]
+            roll_no = data["roll_no"]
+            roll_key = str(roll_no)
+
+            if roll_key in existing["roll_nos"]:
+                self.skipped.append({
+                    "row": row_no,
+                    "roll_no": roll_no,
+                    "error": "Student already exists",
+                })
+                continue
+
+            department = lookups["departments"].get(str(data["dept_code"]).lower())
+            if not department:
+                self.errors.append({"row": row_no, "error": "Invalid department code"})
+                continue
+
+            regulation = lookups["regulations"].get(str(data["regulation"]).lower())
+            if not regulation:
+                self.errors.append({"row": row_no, "error": "Invalid regulation code"})
+                continue
+
+            semester = lookups["semesters"].get(department.degree_id)
+            if not semester:
+                self.errors.append({"row": row_no, "error": "Semester not found"})
+                continue
+
+            section_key = (str(data["section"]).lower(), department.pk, regulation.pk)
+            if section_key not in lookups["sections"]:
+                self.errors.append({
+                    "row": row_no,
+                    "error": f"Section '{data['section']}' does not exist for department '{data['dept_code']}' and regulation '{data['regulation']}'. Please create the section first.",
+                })
+                continue
+
+            if roll_key in existing["usernames"]:
+                self.errors.append({"row": row_no, "error": "Auth user already exists"})
+                continue
+
+            email = data["student_email"]
+            if email in existing["emails"] or email in seen_emails:
+                self.errors.append({"row": row_no, "error": "Auth user with this email already exists"})
+                continue
+
+            # Later rows with the same roll_no behave as they did row-by-row:
+            # the first one wins, the rest are reported as duplicates.
+            existing["roll_nos"].add(roll_key)
+            existing["usernames"].add(roll_key)
+            seen_emails.add(email)
+
+            data["department"] = department
+            data["regulation_obj"] = regulation
+            data["semester"] = semester
+            pending.append(data)
+
+        return pending
+
+    # -------------------------------------------------
+    # 5️⃣ CHUNKED BULK WRITES
+    # -------------------------------------------------
+    def hash_passwords(self, raw_passwords):
+        heartbeat = self.progress.heartbeat if self.progress else None
+        return hash_passwords(raw_passwords, workers=self.hash_workers, heartbeat=heartbeat)
+
+    def _build_user(self, data, password_hash):
+        return User(
+            username=str(data["roll_no"]),
+            email=data["student_email"],
+            role="STUDENT",
+            is_active=True,
+            password=password_hash,
+        )
+
+    def _build_student(self, data, user):
+        department = data["department"]
+        regulation = data["regulation_obj"]
+        return Student(
+            user=user,
+            roll_no=data["roll_no"],
+            student_name=data["student_name"],
+            student_email=data["student_email"],
+            student_gender=data["student_gender"],
+            student_date_of_birth=data["student_date_of_birth"],
+            student_phone_number=str(data["student_phone_number"]),
+            parent_name=data["parent_name"],
+            parent_phone_number=str(data["parent_phone_number"]),
+            batch=regulation.batch,
+            degree=department.degree,
+            department=department,
+            regulation=regulation,
+            semester=data["semester"],
+            section=data["section"],
+            is_active=True,
+        )
+
+    def _write(self, pending):
+        # Hash everything up front in one pool run; starting a process pool
+        # per chunk would eat most of the parallel speed-up. The job keeps
+        # heart-beating while it hashes.
+        all_hashes = self.hash_passwords([str(data["roll_no"]) for data in pending])
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            hashes = all_hashes[start:start + self.batch_size]
+            try:
+                with transaction.atomic():
+                    self._bulk_write(chunk, hashes)
+                self.created += len(chunk)
+            except Exception:
+                # Something in this chunk failed at the DB level (bad date,
+                # race with another upload...). Replay it row by row so the
+                # report pinpoints the offending rows like it used to.
+                self._write_row_by_row(chunk, hashes)
+
+            self._report_progress(self.processed + len(chunk))
+
+    def _bulk_write(self, chunk, hashes):
+        users = bulk_create_users(
+            [self._build_user(data, password_hash) for data, password_hash in zip(chunk, hashes)]
+        )
+
+        Student.objects.bulk_create(
+            [self._build_student(data, user) for data, user in zip(chunk, users)]
+        )
+
+    def _write_row_by_row(self, chunk, hashes):
+        for data, password_hash in zip(chunk, hashes):
+            try:
+                with transaction.atomic():
+                    user = self._build_user(data, password_hash)
+                    user.save()
+                    self._build_student(data, user).save()
+                self.created += 1
+            except Exception as e:
+                self.errors.append({"row": data["row"], "error": str(e)})
+
+
+# =====================================================
+# STUDENT EXCEL UPLOAD
+# =====================================================
+def run_student_import(excel_file, progress=None):
+    """Stream the upload through StudentImportEngine and return its report."""
+    # Columns are read by position, as the upload template defines them.
+    sheet = ExcelSheet(
+        excel_file,
+        StudentImportEngine.REQUIRED_COLUMNS,
+        by_header=False,
+        date_columns=["student_date_of_birth"],
+    )
+
+    if sheet.missing_columns:
+        sheet.close()
+        return {
+            "created": 0,
+            "skipped": [],
+            "errors": [{
+                "row": 1,
+                "error": "Column count mismatch with template",
+            }],
+        }
+
+    if progress:
+        progress.start(total=sheet.row_count)
+
+    return StudentImportEngine(progress=progress).run(sheet.rows())
+
+
+def import_student_sheet(excel_file, params=None, progress=None):
+    """
+    Returns (payload, status_code) exactly as StudentExcelUploadAPIView
+    responds; also used as the STUDENT_UPLOAD import-job handler.
+    """
+    result = run_student_import(excel_file, progress=progress)
+
+    if result.get("errors"):
+        return {
+            "status": "PARTIAL_SUCCESS",
+            "created": result.get("created", 0),
+            "skipped": result.get("skipped", []),
+            "errors": result.get("errors", []),
+        }, 200
+
+    return {
+        "status": "SUCCESS",
+        "created": result.get("created", 0),
+        "skipped": result.get("skipped", []),
+        "errors": [],
+    }, 201
+
+
+# =====================================================
+# FACULTY EXCEL UPLOAD
+# =====================================================
+FACULTY_REQUIRED_HEADERS = [
+    "employee_id",
+    "faculty_name",
+    "faculty_email",
+    "faculty_mobile_no",
+    "faculty_date_of_birth",
+    "faculty_gender",
+    "dept_code",
+    "school_code",
+]
+
+FACULTY_ALLOWED_GENDERS = ["MALE", "FEMALE", "OTHER"]
+
+
+def import_faculty_sheet(excel_file, params=None, progress=None):
+    """
+    Validate and create faculty from an uploaded workbook.
+
+    Returns (payload, status_code) exactly as FacultyBulkUploadAPIView
+    responds; also used as the FACULTY_UPLOAD import-job handler.
+    """
+    sheet = ExcelSheet(
+        excel_file,
+        FACULTY_REQUIRED_HEADERS,
+        date_columns=["faculty_date_of_birth"],
+    )
+
+    if sheet.missing_columns:
+        sheet.close()
+        return {
+            "error": "Missing required columns",
+            "missing_columns": sheet.missing_columns
+        }, 400
+
+    if progress:
+        progress.start(total=sheet.row_count)
+
+    summary = {
+        "total_rows": 0,
+        "created_faculty": 0,
+        "skipped_rows": 0,
+    }
+
+    row_errors = []
+    valid_rows = []
+    seen_employee_ids = set()
+
+    for row_no, data in sheet.rows():
+        summary["total_rows"] += 1
+        if progress:
+            progress.update(summary["total_rows"], row_errors)
+
+        # ❗ STRICT REQUIRED CHECK
+        missing_fields = [
+            field for field in FACULTY_REQUIRED_HEADERS
+            if not data.get(field)
+        ]
+
+        if missing_fields:
+            summary["skipped_rows"] += 1
+            row_errors.append({
+                "row": row_no,
+                "errors": [
+                    "All columns must be filled: " +
+                    ", ".join(FACULTY_REQUIRED_HEADERS)
+                ]
+            })
+            continue
+
+        errors = []
+
+        # ---------- GENDER ----------
+        gender = str(data["faculty_gender"]).upper()
+        if gender not in FACULTY_ALLOWED_GENDERS:
+            errors.append(
+                f"Invalid gender '{data['faculty_gender']}'. "
+                f"Allowed: {FACULTY_ALLOWED_GENDERS}"
+            )
+
+        # ---------- DATE ----------
+        if "faculty_date_of_birth" in data.errors:
+            errors.append(data.errors["faculty_date_of_birth"])
+            dob = None
+        else:
+            dob = data["faculty_date_of_birth"]
+
+        # ---------- SCHOOL ----------
+        school = School.objects.filter(
+            school_code__iexact=str(data["school_code"]).strip()
+        ).first()
+        if not school:
+            errors.append(
+                f"Invalid school_code '{data['school_code']}'"
+            )
+
+        # ---------- DEPARTMENT ----------
+        department = None
+        if school:
+            department = Department.objects.filter(
+                dept_code__iexact=str(data["dept_code"]).strip(),
+                degree__school=school
+            ).first()
+
+            if not department:
+                errors.append(
+                    f"Invalid dept_code '{data['dept_code']}' "
+                    f"for school '{data['school_code']}'"
+                )
+
+        # ---------- DUPLICATE ----------
+        if data["employee_id"] in seen_employee_ids or Faculty.objects.filter(
+            employee_id=data["employee_id"]
+        ).exists():
+            errors.append(
+                "Faculty with this employee_id already exists"
+            )
+
+        if errors:
+            summary["skipped_rows"] += 1
+            row_errors.append({
+                "row": row_no,
+                "errors": errors
+            })
+            continue
+
+        seen_employee_ids.add(data["employee_id"])
+        valid_rows.append({
+            "data": data,
+            "dob": dob,
+            "gender": gender,
+            "school": school,
+            "department": department,
+        })
+
+    # ---------- SAVE ----------
+    # Passwords (= employee_id) for all new users are hashed in one
+    # parallel pass, outside any transaction so the job's heartbeat is
+    # visible, instead of paying a full PBKDF2 round inside the row loop.
+    # Users, faculty and mappings are then written chunk by chunk, each
+    # chunk in its own transaction.
+    employee_ids = [str(item["data"]["employee_id"]) for item in valid_rows]
+    users = User.objects.in_bulk(employee_ids, field_name="username")
+
+    new_ids = [employee_id for employee_id in employee_ids if employee_id not in users]
+    hashes = dict(zip(new_ids, hash_passwords(
+        new_ids, heartbeat=progress.heartbeat if progress else None
+    )))
+
+    for start in range(0, len(valid_rows), BATCH_SIZE):
+        chunk = valid_rows[start:start + BATCH_SIZE]
+        with transaction.atomic():
+            _save_faculty_chunk(chunk, users, hashes, summary)
+        if progress:
+            progress.heartbeat()
+
+    return {
+        "status": "PARTIAL_SUCCESS" if row_errors else "SUCCESS",
+        "summary": summary,
+        "row_errors": row_errors
+    }, 200
+
+
+def _save_faculty_chunk(chunk, users, hashes, summary):
+    for user in bulk_create_users([
+        User(
+            username=str(item["data"]["employee_id"]),
+            email=item["data"]["faculty_email"],
+            role="FACULTY",
+            password=hashes[str(item["data"]["employee_id"])],
+        )
+        for item in chunk
+        if str(item["data"]["employee_id"]) in hashes
+    ]):
+        users[user.username] = user
+
+    for item in chunk:
+        data = item["data"]
+        faculty, created = Faculty.objects.get_or_create(
+            employee_id=data["employee_id"],
+            defaults={
+                "user": users[str(data["employee_id"])],
+                "faculty_name": data["faculty_name"],
+                "faculty_email": data["faculty_email"],
+                "faculty_mobile_no": data["faculty_mobile_no"],
+                "faculty_date_of_birth": item["dob"],
+                "faculty_gender": item["gender"],
+            }
+        )
+
+        FacultyMapping.objects.get_or_create(
+            faculty=faculty,
+            school=item["school"],
+            department=item["department"]
+        )
+
+        if created:
+            summary["created_faculty"] += 1
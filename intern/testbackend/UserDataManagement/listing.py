@@ -0,0 +1,181 @@
+"""
+Keyset-paginated student listings (StudentListAPIView, StudentFilterAPIView).
+
+Pages are ordered by (roll_no, student_id) - roll numbers are only unique
+per department - and the cursor is the last row's pair, so every page is
+one indexed range query (`WHERE roll_no >= :roll AND ... LIMIT n`)
+that costs the same on page 1 and page 400. OFFSET pagination would scan
+every skipped row.
+
+?fields= picks a subset of the view's columns; only the joins those columns
+need are made. Totals are opt-in with ?total=exact (a COUNT per request) or
+?total=approx: the planner's row estimate on PostgreSQL for the unfiltered
+table, otherwise a COUNT cached per filter for STUDENT_COUNT_CACHE_TTL
+seconds.
+"""
+
+import base64
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+COUNT_KEY = "students:count:{}"
+
+# Response field -> ORM path, in response order.
+STUDENT_LIST_FIELDS = {
+    "roll_no": "roll_no",
+    "student_name": "student_name",
+    "student_email": "student_email",
+    "student_gender": "student_gender",
+    "student_date_of_birth": "student_date_of_birth",
+    "student_phone_number": "student_phone_number",
+    "department": "department__dept_code",
+    "regulation": "regulation__regulation_code",
+    "semester": "semester__sem_number",
+    "section": "section",
+    "is_active": "is_active",
+}
+
+STUDENT_FILTER_FIELDS = {
+    name: name
+    for name in (
+        "roll_no",
+        "student_name",
+        "student_email",
+        "degree__school__school_name",
+        "degree__degree_name",
+        "department__dept_name",
+        "regulation__regulation_code",
+        "semester__sem_number",
+        "section",
+        "is_active",
+    )
+}
+
+
+class ListingError(ValueError):
+    pass
+
+
+def filter_students(queryset, params):
+    """StudentFilterAPIView's independent, case-insensitive filters."""
+    for param, lookup in (
+        ("school_name", "degree__school__school_name__iexact"),
+        ("degree_name", "degree__degree_name__iexact"),
+        ("dept_name", "department__dept_name__iexact"),
+        ("regulation_code", "regulation__regulation_code__iexact"),
+    ):
+        if params.get(param):
+            queryset = queryset.filter(**{lookup: params[param]})
+    return queryset
+
+
+def _ttl():
+    return getattr(settings, "STUDENT_COUNT_CACHE_TTL", 60)
+
+
+def encode_cursor(roll_no, student_id):
+    raw = json.dumps([roll_no, str(student_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        roll_no, student_id = json.loads(raw)
+        return str(roll_no), uuid.UUID(student_id)
+    except (ValueError, TypeError, AttributeError):
+        raise ListingError("Invalid cursor")
+
+
+def parse_listing_params(params, available):
+    """
+    Validate ?fields=, ?cursor=, ?page_size= and ?total= against the view's
+    field map. Raises ListingError with a client-facing message.
+    """
+    fields = list(available)
+    if params.get("fields"):
+        fields = [name.strip() for name in params["fields"].split(",") if name.strip()]
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise ListingError(f"Unknown fields: {', '.join(unknown)}")
+
+    try:
+        page_size = int(params.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ListingError("page_size must be an integer")
+    if page_size < 1:
+        raise ListingError("page_size must be positive")
+
+    total = params.get("total")
+    if total not in (None, "", "exact", "approx"):
+        raise ListingError("total must be 'exact' or 'approx'")
+
+    cursor = params.get("cursor")
+    return {
+        "fields": fields,
+        "cursor": decode_cursor(cursor) if cursor else None,
+        "page_size": min(page_size, MAX_PAGE_SIZE),
+        "total": total or None,
+    }
+
+
+def approximate_count(queryset):
+    if connection.vendor == "postgresql" and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+
+    sql, params = queryset.query.sql_with_params()
+    key = COUNT_KEY.format(hashlib.sha1(f"{sql}|{params}".encode()).hexdigest())
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, _ttl())
+    return count
+
+
+def keyset_page(queryset, available, options):
+    """
+    One page of `queryset` as {"results", "next_cursor", "page_size"} (+
+    "count" when a total was asked for), with the selected fields only.
+    """
+    fields = options["fields"]
+    paths = [available[name] for name in fields]
+
+    page = queryset.order_by("roll_no", "student_id")
+    if options["cursor"]:
+        roll_no, student_id = options["cursor"]
+        # roll_no >= cursor gives the index range; the OR only trims ties.
+        page = page.filter(
+            Q(roll_no__gt=roll_no) | Q(student_id__gt=student_id),
+            roll_no__gte=roll_no,
+        )
+
+    rows = list(page.values("roll_no", "student_id", *paths)[:options["page_size"] + 1])
+    has_more = len(rows) > options["page_size"]
+    rows = rows[:options["page_size"]]
+
+    data = {
+        "results": [{name: row[path] for name, path in zip(fields, paths)} for row in rows],
+        "next_cursor": encode_cursor(rows[-1]["roll_no"], rows[-1]["student_id"]) if has_more else None,
+        "page_size": options["page_size"],
+    }
+    if options["total"] == "exact":
+        data["count"] = queryset.count()
+    elif options["total"] == "approx":
+        data["count"] = approximate_count(queryset)
+    return data
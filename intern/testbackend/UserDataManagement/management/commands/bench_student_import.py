@@ -0,0 +1,66 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from Creation.bench import build_bench_hierarchy, rolled_back
+from AcademicSetup.models import Section
+from UserDataManagement.importers import BATCH_SIZE, StudentImportEngine
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the set-based student import engine (rows/sec). All writes are rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='Row counts to benchmark')
+        parser.add_argument('--batch-size', type=int, default=None, help='Override the engine chunk size')
+        parser.add_argument('--hash-workers', type=int, default=None, help='Password hashing processes (default: PASSWORD_HASH_WORKERS)')
+        parser.add_argument('--real-hasher', action='store_true', help='Use the configured PASSWORD_HASHERS instead of a fast test hasher')
+
+    def handle(self, *args, **options):
+        hashers = None if options['real_hasher'] else ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+        for size in options['sizes']:
+            if hashers:
+                with override_settings(PASSWORD_HASHERS=hashers):
+                    elapsed, report = self._run(size, options['batch_size'], options['hash_workers'])
+            else:
+                elapsed, report = self._run(size, options['batch_size'], options['hash_workers'])
+
+            rate = size / elapsed if elapsed else 0
+            self.stdout.write(
+                f'{size:>7} rows: {elapsed:8.2f}s  {rate:10.0f} rows/sec  '
+                f'created={report["created"]} skipped={len(report["skipped"])} errors={len(report["errors"])}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def _run(self, size, batch_size, hash_workers):
+        with rolled_back():
+            rows = self._build_rows(size)
+            engine = StudentImportEngine(batch_size=batch_size or BATCH_SIZE, hash_workers=hash_workers)
+
+            started = time.perf_counter()
+            report = engine.run(rows)
+            elapsed = time.perf_counter() - started
+        return elapsed, report
+
+    def _build_rows(self, size):
+        hierarchy = build_bench_hierarchy()
+        Section.objects.create(
+            name='A', school=hierarchy['school'], degree=hierarchy['degree'], department=hierarchy['department'],
+            regulation=hierarchy['regulation'], batch=hierarchy['batch'], semester=hierarchy['semester']
+        )
+
+        return [
+            (
+                row_no,
+                dict(zip(StudentImportEngine.REQUIRED_COLUMNS, (
+                    f'BENCH{i:07d}', f'Student {i}', f'bench{i}@example.com', 'MALE',
+                    date(2005, 1, 1), '9876543210', f'Parent {i}', '9876543210',
+                    'BENCHR', 'BENCHD', 'A',
+                ))),
+            )
+            for i, row_no in enumerate(range(2, size + 2))
+        ]
@@ -0,0 +1,86 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from custom_auth.models import User
+from Creation.bench import build_bench_hierarchy, rolled_back
+from UserDataManagement.models import Student
+from UserDataManagement.listing import encode_cursor
+from UserDataManagement.views import StudentListAPIView
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark StudentListAPIView keyset pages at increasing depth against '
+        'the previous unpaginated listing. All writes are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=40000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20, help='GETs per measured page')
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            admin = self._build(options['students'])
+            view = StudentListAPIView.as_view()
+            factory = APIRequestFactory()
+
+            def get(params):
+                request = factory.get('/users/students/', params)
+                force_authenticate(request, user=admin)
+                response = view(request)
+                response.render()
+                return response
+
+            keys = list(Student.objects.order_by('roll_no', 'student_id').values_list('roll_no', 'student_id'))
+            for depth in (0, 0.25, 0.5, 0.99):
+                position = int(len(keys) * depth)
+                params = {'page_size': options['page_size']}
+                if position:
+                    params['cursor'] = encode_cursor(*keys[position - 1])
+
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    response = get(params)
+                elapsed = (time.perf_counter() - started) / options['repeat']
+                self.stdout.write(
+                    f"page at row {position:>7}: {elapsed * 1000:7.2f} ms  ({len(response.content) / 1024:.0f} KB)"
+                )
+
+            started = time.perf_counter()
+            students = Student.objects.select_related('department', 'degree', 'regulation', 'semester')
+            rows = [
+                {
+                    'roll_no': s.roll_no, 'student_name': s.student_name, 'student_email': s.student_email,
+                    'department': s.department.dept_code, 'regulation': s.regulation.regulation_code,
+                    'semester': s.semester.sem_number, 'section': s.section, 'is_active': s.is_active,
+                }
+                for s in students
+            ]
+            self.stdout.write(
+                f"previous full listing: {(time.perf_counter() - started) * 1000:7.0f} ms for {len(rows)} rows "
+                f"(before rendering)"
+            )
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def _build(self, size):
+        hierarchy = build_bench_hierarchy()
+
+        Student.objects.bulk_create([
+            Student(
+                roll_no=f'BENCH{i:07d}', student_name=f'Student {i}', student_email=f'bench{i}@example.com',
+                student_gender='MALE', student_date_of_birth=date(2005, 1, 1), student_phone_number='9876543210',
+                parent_name='Parent', parent_phone_number='9876543210', batch=hierarchy['batch'],
+                degree=hierarchy['degree'], department=hierarchy['department'], regulation=hierarchy['regulation'],
+                semester=hierarchy['semester'], section='A'
+            )
+            for i in range(size)
+        ], batch_size=1000)
+
+        return User.objects.create_user(
+            username='bench_list_admin', email='bench_list_admin@example.com', role='COLLEGE_ADMIN'
+        )
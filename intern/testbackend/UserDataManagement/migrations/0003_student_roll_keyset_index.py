@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-17 00:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Creation', '0001_initial'),
+        ('UserDataManagement', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['roll_no', 'student_id'], name='student_roll_keyset_idx'),
+        ),
+    ]
@@ -112,6 +112,10 @@ class Student(models.Model):
             ("department", "roll_no")  # dept-wise isolation
         ]
         ordering = ["roll_no"]
+        indexes = [
+            # Keyset pagination order (UserDataManagement/listing.py)
+            models.Index(fields=["roll_no", "student_id"], name="student_roll_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.roll_no} - {self.student_name}"
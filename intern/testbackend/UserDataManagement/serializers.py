@@ -3,7 +3,6 @@ import io
 import random
 import string
 from datetime import datetime
-from openpyxl import load_workbook
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth import authenticate
@@ -186,198 +185,22 @@ creates Students using .Xlsx file
 
 from django.db import transaction
 from rest_framework import serializers
-from openpyxl import load_workbook
 
 from django.contrib.auth import get_user_model
 from .models import Student, Department, Regulation, Semester
-from AcademicSetup.models import Section
+from .importers import StudentImportEngine, run_student_import
 
 User = get_user_model()
 
 class StudentExcelUploadSerializer(serializers.Serializer):
     file = serializers.FileField()
 
-    REQUIRED_COLUMNS = [
-        "roll_no",
-        "student_name",
-        "student_email",
-        "student_gender",
-        "student_date_of_birth",
-        "student_phone_number",
-        "parent_name",
-        "parent_phone_number",
-        "regulation",
-        "dept_code",
-        "section",
-    ]
+    REQUIRED_COLUMNS = StudentImportEngine.REQUIRED_COLUMNS
 
     def save(self, **kwargs):
-        workbook = load_workbook(self.validated_data["file"])
-        sheet = workbook.active
-
-        created = 0
-        skipped = []
-        errors = []
-
-        for row_no, row in enumerate(
-            sheet.iter_rows(min_row=2, values_only=True), start=2
-        ):
-
-            # -------------------------------------------------
-            # 1️⃣ BASIC TEMPLATE CHECK
-            # -------------------------------------------------
-            if not row or len(row) < len(self.REQUIRED_COLUMNS):
-                errors.append({
-                    "row": row_no,
-                    "error": "Column count mismatch with template",
-                })
-                continue
-
-            # -------------------------------------------------
-            # 2️⃣ COLLECT ALL MISSING COLUMN ERRORS (ONE LINE)
-            # -------------------------------------------------
-            missing_columns = []
-
-            for idx, column_name in enumerate(self.REQUIRED_COLUMNS):
-                if row[idx] in (None, "", " "):
-                    missing_columns.append(f"{column_name} is required")
-
-            if missing_columns:
-                errors.append({
-                    "row": row_no,
-                    "error": ", ".join(missing_columns),
-                })
-                continue
-
-            # -------------------------------------------------
-            # 3️⃣ SAFE UNPACKING
-            # -------------------------------------------------
-            (
-                roll_no,
-                student_name,
-                student_email,
-                student_gender,
-                student_date_of_birth,
-                student_phone_number,
-                parent_name,
-                parent_phone_number,
-                regulation_code,
-                dept_code,
-                section,
-            ) = row[:11]
-
-
-            # -------------------------------------------------
-            # 4️⃣ DUPLICATE STUDENT CHECK
-            # -------------------------------------------------
-            if Student.objects.filter(roll_no=roll_no).exists():
-                skipped.append({
-                    "row": row_no,
-                    "roll_no": roll_no,
-                    "error": "Student already exists",
-                })
-                continue
-
-            # -------------------------------------------------
-            # 5️⃣ FOREIGN KEY VALIDATIONS
-            # -------------------------------------------------
-            department = Department.objects.filter(
-                dept_code__iexact=dept_code
-            ).first()
-            if not department:
-                errors.append({
-                    "row": row_no,
-                    "error": "Invalid department code",
-                })
-                continue
-
-            regulation = Regulation.objects.filter(
-                regulation_code__iexact=regulation_code
-            ).first()
-            if not regulation:
-                errors.append({
-                    "row": row_no,
-                    "error": "Invalid regulation code",
-                })
-                continue
-
-            semester = Semester.objects.filter(
-                degree=department.degree
-            ).order_by("sem_number").first()
-            if not semester:
-                errors.append({
-                    "row": row_no,
-                    "error": "Semester not found",
-                })
-                continue
-
-            # Validate section exists
-            section_obj = Section.objects.filter(
-                name__iexact=section,
-                department=department,
-                regulation=regulation
-            ).first()
-            if not section_obj:
-                errors.append({
-                    "row": row_no,
-                    "error": f"Section '{section}' does not exist for department '{dept_code}' and regulation '{regulation_code}'. Please create the section first.",
-                })
-                continue
-
-            # -------------------------------------------------
-            # 6️⃣ PER-ROW ATOMIC SAVE
-            # -------------------------------------------------
-            try:
-                with transaction.atomic():
-
-                    if User.objects.filter(username=roll_no).exists():
-                        errors.append({
-                            "row": row_no,
-                            "error": "Auth user already exists",
-                        })
-                        continue
-
-                    user = User.objects.create(
-                        username=roll_no,
-                        email=student_email,
-                        role="STUDENT",
-                        is_active=True,
-                    )
-                    user.set_password(roll_no)
-                    user.save()
-
-                    Student.objects.create(
-                        user=user,
-                        roll_no=roll_no,
-                        student_name=student_name,
-                        student_email=student_email,
-                        student_gender=student_gender,
-                        student_date_of_birth=student_date_of_birth,
-                        student_phone_number=str(student_phone_number),
-                        parent_name=parent_name,
-                        parent_phone_number=str(parent_phone_number),
-                        batch=regulation.batch,
-                        degree=department.degree,
-                        department=department,
-                        regulation=regulation,
-                        semester=semester,
-                        section=section,
-                        is_active=True,
-                    )
-
-                created += 1
-
-            except Exception as e:
-                errors.append({
-                    "row": row_no,
-                    "error": str(e),
-                })
-
-        return {
-            "created": created,
-            "skipped": skipped,
-            "errors": errors,
-        }
+        # Lookups, duplicate checks and inserts are all done set-wise
+        # (see UserDataManagement/importers.py).
+        return run_student_import(self.validated_data["file"])
 
 
 class StudentCreateSerializer(serializers.ModelSerializer):
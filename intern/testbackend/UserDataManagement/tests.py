@@ -1,10 +1,13 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from Creation.models import School, Department, Degree, Regulation, Semester
 from .models import Faculty, Student, FacultyMapping, DepartmentAdminAssignment
-from .serializers import UserRoleSerializer
+from .serializers import UserRoleSerializer, StudentExcelUploadSerializer
+from AcademicSetup.models import Section
+from openpyxl import Workbook, load_workbook
+from io import BytesIO
 from datetime import date
 import traceback
 import sys
@@ -163,3 +166,226 @@ class DualRoleTests(TestCase):
         self.assertEqual(profile_details['name'], "Faculty User")
         self.assertEqual(profile_details['id'], "F123")
         self.assertIn("(Dept Admin)", profile_details['details'])
+
+
+class StudentExcelImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='import_admin', password='password', role='COLLEGE_ADMIN', email='import_admin@test.com'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+        self.school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        self.degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH",
+            degree_duration=4, number_of_semesters=8, school=self.school
+        )
+        self.dept = Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=self.degree)
+        self.regulation = Regulation.objects.create(degree=self.degree, regulation_code="R20", batch="2020-2024")
+        self.semester = Semester.objects.create(degree=self.degree, sem_number=1, sem_name="Sem 1", year=1)
+        Section.objects.create(
+            name="A", school=self.school, degree=self.degree, department=self.dept,
+            regulation=self.regulation, batch="2020-2024", semester=self.semester
+        )
+
+    def _upload(self, rows):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(StudentExcelUploadSerializer.REQUIRED_COLUMNS)
+        for row in rows:
+            ws.append(row)
+        buffer = BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        buffer.name = "students.xlsx"
+        return self.client.post("/users/students/upload-excel/", {"file": buffer}, format="multipart")
+
+    def _row(self, roll_no, email, dept="CSE", section="A"):
+        return [roll_no, "Name", email, "MALE", "2005-01-01", "9876543210", "Parent", "9876543210", "R20", dept, section]
+
+    def test_bulk_import_report(self):
+        response = self._upload([
+            self._row("CSE001", "s1@test.com"),
+            self._row("CSE002", "s2@test.com"),
+            self._row("CSE001", "dup@test.com"),            # duplicate roll_no in the sheet
+            self._row("CSE003", "s3@test.com", dept="XXX"),  # bad department
+            self._row("CSE004", "s4@test.com", section="Z"), # missing section
+            self._row("CSE005", "s1@test.com"),              # email already used above
+            ["CSE006", "Name"],                              # short row
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual([s["row"] for s in response.data["skipped"]], [4])
+        self.assertEqual([e["row"] for e in response.data["errors"]], [5, 6, 7, 8])
+        self.assertEqual(response.data["errors"][0]["error"], "Invalid department code")
+
+        student = Student.objects.get(roll_no="CSE001")
+        self.assertEqual(student.semester, self.semester)
+        self.assertEqual(student.batch, "2020-2024")
+        self.assertTrue(student.user.check_password("CSE001"))
+
+    def test_existing_students_are_skipped(self):
+        self._upload([self._row("CSE001", "s1@test.com")])
+        response = self._upload([self._row("CSE001", "s1@test.com"), self._row("CSE002", "s2@test.com")])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["skipped"][0]["roll_no"], "CSE001")
+
+    def test_export_round_trips_through_importer(self):
+        self._upload([self._row("CSE001", "s1@test.com"), self._row("CSE002", "s2@test.com")])
+
+        response = self.client.get("/users/students/export/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        exported = BytesIO(b"".join(response.streaming_content))
+
+        rows = list(load_workbook(exported, read_only=True).active.iter_rows(values_only=True))
+        self.assertEqual(list(rows[0]), StudentExcelUploadSerializer.REQUIRED_COLUMNS)
+        self.assertEqual(rows[1][:3], ("CSE001", "Name", "s1@test.com"))
+        self.assertEqual(rows[1][-3:], ("R20", "CSE", "A"))
+
+        User.objects.filter(role="STUDENT").delete()
+        exported.seek(0)
+        exported.name = "students.xlsx"
+        response = self.client.post("/users/students/upload-excel/", {"file": exported}, format="multipart")
+        self.assertEqual(response.data["created"], 2)
+
+        response = self.client.get("/users/students/export/", {"file_type": "csv", "dept_name": "Computer Science"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(","), StudentExcelUploadSerializer.REQUIRED_COLUMNS)
+        self.assertEqual(len(lines), 3)
+
+
+class StudentListingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='list_admin', password='password', role='COLLEGE_ADMIN', email='list_admin@test.com'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+        school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH", degree_duration=4, number_of_semesters=8, school=school
+        )
+        regulation = Regulation.objects.create(degree=degree, regulation_code="R20", batch="2020-2024")
+        semester = Semester.objects.create(degree=degree, sem_number=1, sem_name="Sem 1", year=1)
+
+        # Roll numbers repeat across departments, so pages must break ties on student_id.
+        students = []
+        for dept_code, dept_name in (("CSE", "Computer Science"), ("ECE", "Electronics")):
+            dept = Department.objects.create(dept_name=dept_name, dept_code=dept_code, degree=degree)
+            students += [
+                Student(
+                    roll_no=f"20R{i:03d}", student_name=f"{dept_code} {i}", student_email=f"{dept_code}{i}@test.com",
+                    student_gender="MALE", student_date_of_birth=date(2002, 1, 1), student_phone_number="9876543210",
+                    parent_name="Parent", parent_phone_number="9876543210", batch="2020-2024",
+                    degree=degree, department=dept, regulation=regulation, semester=semester, section="A"
+                )
+                for i in range(12)
+            ]
+        Student.objects.bulk_create(students)
+        self.expected = sorted((s.roll_no, str(s.student_id)) for s in students)
+
+    def _walk(self, url, params):
+        seen, cursor = [], None
+        while True:
+            response = self.client.get(url, {**params, **({"cursor": cursor} if cursor else {})})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            seen += response.data["results"]
+            cursor = response.data["next_cursor"]
+            if cursor is None:
+                return seen
+
+    def test_cursor_walk_covers_every_student_once(self):
+        rows = self._walk("/users/students/", {"page_size": 5})
+
+        self.assertEqual(len(rows), 24)
+        self.assertEqual([r["roll_no"] for r in rows], [roll_no for roll_no, _ in self.expected])
+        self.assertEqual(len({(r["roll_no"], r["department"]) for r in rows}), 24)
+
+    def test_deep_pages_are_one_query(self):
+        first = self.client.get("/users/students/", {"page_size": 20})
+        with self.assertNumQueries(1):
+            response = self.client.get("/users/students/", {"page_size": 20, "cursor": first.data["next_cursor"]})
+        self.assertEqual(len(response.data["results"]), 4)
+        self.assertNotIn("count", response.data)
+
+    def test_field_projection_and_totals(self):
+        response = self.client.get(
+            "/users/students/filter/",
+            {"dept_name": "Electronics", "fields": "roll_no,department__dept_name", "total": "exact"}
+        )
+        self.assertEqual(response.data["count"], 12)
+        self.assertEqual(response.data["results"][0], {"roll_no": "20R000", "department__dept_name": "Electronics"})
+
+        response = self.client.get("/users/students/", {"total": "approx", "fields": "roll_no"})
+        self.assertEqual(response.data["count"], 24)
+
+        self.assertEqual(self.client.get("/users/students/", {"fields": "password"}).status_code, 400)
+        self.assertEqual(self.client.get("/users/students/", {"cursor": "not-a-cursor"}).status_code, 400)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class FacultyExcelUploadTests(TestCase):
+    HEADERS = [
+        "employee_id", "faculty_name", "faculty_email", "faculty_mobile_no",
+        "faculty_date_of_birth", "faculty_gender", "dept_code", "school_code",
+    ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            username='fac_upload_admin', password='password', role='COLLEGE_ADMIN', email='fac_upload_admin@test.com'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+        school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH",
+            degree_duration=4, number_of_semesters=8, school=school
+        )
+        Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=degree)
+
+    def _upload(self, headers, rows):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(headers)
+        for row in rows:
+            ws.append(row)
+        buffer = BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        buffer.name = "faculty.xlsx"
+        return self.client.post("/users/faculty/upload-bulk/", {"file": buffer}, format="multipart")
+
+    def test_headers_matched_by_name_and_dates_normalised(self):
+        # Columns out of template order, header text padded / different case
+        headers = [" School_Code ", "dept_code"] + self.HEADERS[:6]
+        response = self._upload(headers, [
+            ["soe", "cse", "E001", "Fac One", "f1@test.com", "9876543210", "15/08/1985", "male"],
+            ["soe", "cse", "E002", "Fac Two", "f2@test.com", "9876543211", date(1990, 1, 2), "female"],
+            ["soe", "cse", "E003", "Fac Three", "f3@test.com", "9876543212", "1990.01.02", "male"],
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["summary"]["created_faculty"], 2)
+        self.assertEqual(response.data["row_errors"][0]["row"], 4)
+        self.assertIn("Invalid date format", response.data["row_errors"][0]["errors"][0])
+
+        self.assertEqual(Faculty.objects.get(employee_id="E001").faculty_date_of_birth, date(1985, 8, 15))
+        self.assertTrue(User.objects.get(username="E002").check_password("E002"))
+
+        response = self.client.get("/users/faculty/export/", {"file_type": "csv", "dept_code": "CSE"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(","), self.HEADERS)
+        self.assertEqual(lines[1], "E001,Fac One,f1@test.com,9876543210,1985-08-15,MALE,CSE,SOE")
+
+    def test_missing_headers_rejected(self):
+        response = self._upload(self.HEADERS[:-1], [])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["missing_columns"], ["school_code"])
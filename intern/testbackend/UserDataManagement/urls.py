@@ -17,7 +17,9 @@ from .views import (
     FacultyTemplateDownloadAPIView,
     FacultyFilterAPIView,
     StudentExcelTemplateDownloadAPIView,
-    StudentFilterAPIView
+    StudentFilterAPIView,
+    StudentExportAPIView,
+    FacultyExportAPIView,
 )
 
 router = DefaultRouter()
@@ -52,6 +54,13 @@ urlpatterns = [
         name="student-filter",
     ),
 
+    #  Streaming export (template column layout)
+    path(
+        "students/export/",
+        StudentExportAPIView.as_view(),
+        name="student-export",
+    ),
+
     #  Individual GET / PATCH
     path(
         "students/<str:roll_no>/",
@@ -80,6 +89,12 @@ urlpatterns = [
         name="faculty-template-download",
     ),
 
+    path(
+        "faculty/export/",
+        FacultyExportAPIView.as_view(),
+        name="faculty-export",
+    ),
+
     path(
         "faculty/filter/",
         FacultyFilterAPIView.as_view(),
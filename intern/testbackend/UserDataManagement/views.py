@@ -14,11 +14,30 @@ from openpyxl.styles import Font
 from openpyxl.utils import get_column_letter
 from io import BytesIO
 from django.contrib.auth import get_user_model
+from ImportJobs.models import ImportJob
+from ImportJobs.queue import enqueue_import, wants_async
+from ImportJobs.serializers import ImportJobSerializer
+from .importers import (
+    FACULTY_REQUIRED_HEADERS,
+    StudentImportEngine,
+    import_faculty_sheet,
+    import_student_sheet,
+)
+from .listing import (
+    STUDENT_FILTER_FIELDS,
+    STUDENT_LIST_FIELDS,
+    ListingError,
+    filter_students,
+    keyset_page,
+    parse_listing_params,
+)
 from Creation.models import School, Department, Degree
+from Creation.hierarchy import get_hierarchy
+from Creation.export import EXPORT_CHUNK_SIZE, EXPORT_FILE_TYPES, export_response
 from django.db import transaction
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q, F
+from django.db.models import Count, Q, F, OuterRef, Subquery
 from rest_framework import status
 from .serializers import (
     FacultySerializer, 
@@ -129,58 +148,27 @@ class FacultyMappingOptionsView(APIView):
     permission_classes = [IsCollegeAdmin]
 
     def get(self, request):
-        schools = School.objects.all().prefetch_related('degrees__departments')
+        hierarchy = get_hierarchy()
         options = []
 
-        for school in schools:
+        for school in hierarchy.schools.values():
             options.append({
-                "label": f"{school.school_name} (Full School)",
-                "school_id": str(school.school_id),
+                "label": f"{school['school_name']} (Full School)",
+                "school_id": str(school['school_id']),
                 "department_id": None
             })
 
-            for degree in school.degrees.all():
-                for dept in degree.departments.all():
+            for degree in hierarchy.degrees_for_school(school['school_id']):
+                for dept in hierarchy.departments_for_degree(degree['degree_id']):
                     options.append({
-                        "label": f"{school.school_name} - {dept.dept_name}",
-                        "school_id": str(school.school_id),
-                        "department_id": str(dept.dept_id)
+                        "label": f"{school['school_name']} - {dept['dept_name']}",
+                        "school_id": str(school['school_id']),
+                        "department_id": str(dept['dept_id'])
                     })
 
         return Response(options)
 
 
-User = get_user_model()
-
-REQUIRED_HEADERS = [
-    "employee_id",
-    "faculty_name",
-    "faculty_email",
-    "faculty_mobile_no",
-    "faculty_date_of_birth",
-    "faculty_gender",
-    "dept_code",
-    "school_code",
-]
-
-ALLOWED_GENDERS = ["MALE", "FEMALE", "OTHER"]
-
-
-def parse_excel_date(value):
-    if isinstance(value, datetime):
-        return value.date()
-
-    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(str(value), fmt).date()
-        except Exception:
-            pass
-
-    raise ValueError(
-        f"Invalid date format '{value}'. Expected DD/MM/YYYY or YYYY-MM-DD"
-    )
-
-
 class FacultyBulkUploadAPIView(APIView):
     permission_classes = [IsCollegeAdmin]
     parser_classes = [MultiPartParser]
@@ -194,158 +182,12 @@ class FacultyBulkUploadAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        wb = openpyxl.load_workbook(excel_file)
-        sheet = wb.active
-
-        headers = [cell.value for cell in sheet[1] if cell.value]
-        missing_headers = [h for h in REQUIRED_HEADERS if h not in headers]
-
-        if missing_headers:
-            return Response(
-                {
-                    "error": "Missing required columns",
-                    "missing_columns": missing_headers
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        header_index = {h: headers.index(h) for h in REQUIRED_HEADERS}
-
-        summary = {
-            "total_rows": 0,
-            "created_faculty": 0,
-            "skipped_rows": 0,
-        }
-
-        row_errors = []
-
-        for row_no, row in enumerate(sheet.iter_rows(min_row=2), start=2):
-            if not any(cell.value for cell in row):
-                continue
-
-            summary["total_rows"] += 1
-
-            data = {
-                h: row[header_index[h]].value
-                for h in REQUIRED_HEADERS
-            }
-
-            # ❗ STRICT REQUIRED CHECK
-            missing_fields = [
-                field for field in REQUIRED_HEADERS
-                if not data.get(field)
-            ]
-
-            if missing_fields:
-                summary["skipped_rows"] += 1
-                row_errors.append({
-                    "row": row_no,
-                    "errors": [
-                        "All columns must be filled: " +
-                        ", ".join(REQUIRED_HEADERS)
-                    ]
-                })
-                continue
-
-            errors = []
-
-            # ---------- GENDER ----------
-            gender = str(data["faculty_gender"]).upper()
-            if gender not in ALLOWED_GENDERS:
-                errors.append(
-                    f"Invalid gender '{data['faculty_gender']}'. "
-                    f"Allowed: {ALLOWED_GENDERS}"
-                )
-
-            # ---------- DATE ----------
-            try:
-                dob = parse_excel_date(data["faculty_date_of_birth"])
-            except ValueError as e:
-                errors.append(str(e))
-                dob = None
-
-            # ---------- SCHOOL ----------
-            school = School.objects.filter(
-                school_code__iexact=str(data["school_code"]).strip()
-            ).first()
-            if not school:
-                errors.append(
-                    f"Invalid school_code '{data['school_code']}'"
-                )
-
-            # ---------- DEPARTMENT ----------
-            department = None
-            if school:
-                department = Department.objects.filter(
-                    dept_code__iexact=str(data["dept_code"]).strip(),
-                    degree__school=school
-                ).first()
-
-                if not department:
-                    errors.append(
-                        f"Invalid dept_code '{data['dept_code']}' "
-                        f"for school '{data['school_code']}'"
-                    )
-
-            # ---------- DUPLICATE ----------
-            if Faculty.objects.filter(
-                employee_id=data["employee_id"]
-            ).exists():
-                errors.append(
-                    "Faculty with this employee_id already exists"
-                )
-
-            if errors:
-                summary["skipped_rows"] += 1
-                row_errors.append({
-                    "row": row_no,
-                    "errors": errors
-                })
-                continue
-
-            # ---------- SAVE ----------
-
-            user, user_created = User.objects.get_or_create(
-                        username=data["employee_id"],
-                        defaults={"email": data["faculty_email"]}
-                    )
-
-                    # Set password and role for newly created users
-            if user_created:
-                        user.set_password(data["employee_id"])  # password = employee_id
-                        user.role = "FACULTY"
-                        user.save()
-
-
-            faculty, created = Faculty.objects.get_or_create(
-                employee_id=data["employee_id"],
-                defaults={
-                    "user": user,
-                    "faculty_name": data["faculty_name"],
-                    "faculty_email": data["faculty_email"],
-                    "faculty_mobile_no": data["faculty_mobile_no"],
-                    "faculty_date_of_birth": dob,
-                    "faculty_gender": gender,
-                }
-            )
-
-            FacultyMapping.objects.get_or_create(
-                faculty=faculty,
-                school=school,
-                department=department
-            )
-
-            if created:
-                summary["created_faculty"] += 1
+        if wants_async(request):
+            job = enqueue_import(ImportJob.FACULTY_UPLOAD, excel_file, request.user)
+            return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
-        return Response(
-            {
-                "status": "PARTIAL_SUCCESS" if row_errors else "SUCCESS",
-                "summary": summary,
-                "row_errors": row_errors
-            },
-            status=status.HTTP_200_OK
-        )
+        data, status_code = import_faculty_sheet(excel_file)
+        return Response(data, status=status_code)
 
 """
 ----------------------------------------------------------------------------------------------------------------------------
@@ -363,16 +205,7 @@ class FacultyTemplateDownloadAPIView(APIView):
         ws = wb.active
         ws.title = "Faculty Template"
 
-        headers = [
-            "employee_id",
-            "faculty_name",
-            "faculty_email",
-            "faculty_mobile_no",
-            "faculty_date_of_birth",
-            "faculty_gender",
-            "dept_code",
-            "school_code",
-        ]
+        headers = FACULTY_REQUIRED_HEADERS
 
         # ---- HEADER ROW ----
         ws.append(headers)
@@ -410,6 +243,52 @@ class FacultyTemplateDownloadAPIView(APIView):
 
 
 
+class FacultyExportAPIView(APIView):
+    """
+    Streams faculty in the upload template's column layout. A faculty member
+    mapped to several departments is exported once, with their first
+    mapping (by school and department code). ?school_code= / ?dept_code=
+    narrow the export; ?file_type=xlsx (default) or csv.
+    """
+    permission_classes = [IsAuthenticated, IsCollegeAdmin]
+
+    def get(self, request):
+        file_type = request.query_params.get("file_type", "xlsx")
+        if file_type not in EXPORT_FILE_TYPES:
+            return Response(
+                {"error": f"file_type must be one of: {', '.join(EXPORT_FILE_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        first_mapping = FacultyMapping.objects.filter(
+            faculty=OuterRef("pk")
+        ).order_by("school__school_code", "department__dept_code")
+
+        faculty = Faculty.objects.annotate(
+            dept_code=Subquery(first_mapping.values("department__dept_code")[:1]),
+            school_code=Subquery(first_mapping.values("school__school_code")[:1]),
+        )
+
+        school_code = request.query_params.get("school_code")
+        dept_code = request.query_params.get("dept_code")
+        if school_code:
+            faculty = faculty.filter(mappings__school__school_code__iexact=school_code)
+        if dept_code:
+            faculty = faculty.filter(mappings__department__dept_code__iexact=dept_code)
+
+        rows = (
+            faculty.distinct()
+            .order_by("employee_id")
+            .values_list(*FACULTY_REQUIRED_HEADERS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+        return export_response(
+            "faculty", "Faculty", FACULTY_REQUIRED_HEADERS, rows,
+            file_type=file_type, column_widths=[25] * len(FACULTY_REQUIRED_HEADERS),
+        )
+
+
 """
 ----------------------------------------------------------------------------------------------------------------------------------
                                                 Filter for Faculty based on school_code and dept_code
@@ -526,29 +405,13 @@ class StudentExcelUploadAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        try:
-            result = serializer.save()
-
-            if result.get("errors"):
-                return Response(
-                    {
-                        "status": "PARTIAL_SUCCESS",
-                        "created": result.get("created", 0),
-                        "skipped": result.get("skipped", []),
-                        "errors": result.get("errors", []),
-                    },
-                    status=status.HTTP_200_OK,
-                )
+        if wants_async(request):
+            job = enqueue_import(ImportJob.STUDENT_UPLOAD, file_obj, request.user)
+            return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
-            return Response(
-                {
-                    "status": "SUCCESS",
-                    "created": result.get("created", 0),
-                    "skipped": result.get("skipped", []),
-                    "errors": [],
-                },
-                status=status.HTTP_201_CREATED,
-            )
+        try:
+            data, status_code = import_student_sheet(serializer.validated_data["file"])
+            return Response(data, status=status_code)
 
         except Exception as e:
             return Response(
@@ -568,32 +431,14 @@ class StudentListAPIView(APIView):
     permission_classes = [IsAuthenticated, IsCollegeAdmin]
 
     def get(self, request):
-        students = Student.objects.select_related(
-            "department", "degree", "regulation", "semester"
-        ).all()
-
-        data = [
-            {
-                "roll_no": s.roll_no,
-                "student_name": s.student_name,
-                "student_email": s.student_email,
-                "student_gender": s.student_gender,
-                "student_date_of_birth": s.student_date_of_birth,
-                "student_phone_number": s.student_phone_number,
-                "department": s.department.dept_code,
-                "regulation": s.regulation.regulation_code,
-                "semester": s.semester.sem_number,
-                "section": s.section,
-                "is_active": s.is_active,
-            }
-            for s in students
-        ]
+        """Keyset-paginated; see UserDataManagement/listing.py for ?cursor=, ?fields=, ?total=."""
+        try:
+            options = parse_listing_params(request.query_params, STUDENT_LIST_FIELDS)
+        except ListingError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(
-            {
-                "count": len(data),
-                "results": data,
-            },
+            keyset_page(Student.objects.all(), STUDENT_LIST_FIELDS, options),
             status=status.HTTP_200_OK,
         )
 
@@ -685,6 +530,10 @@ from openpyxl import Workbook
 from Creation.permissions import IsCollegeAdmin
 
 
+# Upload template / export column layout (StudentImportEngine.REQUIRED_COLUMNS)
+STUDENT_COLUMN_WIDTHS = [15, 20, 25, 15, 22, 22, 20, 22, 15, 15, 10]
+
+
 class StudentExcelTemplateDownloadAPIView(APIView):
     permission_classes = [IsAuthenticated, IsCollegeAdmin]
 
@@ -693,25 +542,13 @@ class StudentExcelTemplateDownloadAPIView(APIView):
         sheet = workbook.active
         sheet.title = "Student Upload Template"
 
-        headers = [
-            "roll_no",
-            "student_name",
-            "student_email",
-            "student_gender",
-            "student_date_of_birth",
-            "student_phone_number",
-            "parent_name",
-            "parent_phone_number",
-            "regulation",
-            "dept_code",
-            "section",
-        ]
+        headers = StudentImportEngine.REQUIRED_COLUMNS
 
         # Write header row
         sheet.append(headers)
 
         # Optional: set column widths (nice UX)
-        column_widths = [15, 20, 25, 15, 22, 22, 20, 22, 15, 15, 10]
+        column_widths = STUDENT_COLUMN_WIDTHS
         for i, width in enumerate(column_widths, start=1):
             sheet.column_dimensions[chr(64 + i)].width = width
 
@@ -725,72 +562,69 @@ class StudentExcelTemplateDownloadAPIView(APIView):
 
         workbook.save(response)
         return response
-"""
---------------------------------------------------------------------------------------------------------------------------------
-                                        Filtering students based on school code and dept code
---------------------------------------------------------------------------------------------------------------------------------
-"""
 
-class StudentFilterAPIView(APIView):
+
+class StudentExportAPIView(APIView):
+    """
+    Streams students in the upload template's column layout, so the file
+    can be edited and re-imported. Takes StudentFilterAPIView's filters and
+    ?file_type=xlsx (default) or csv.
+    """
     permission_classes = [IsAuthenticated, IsCollegeAdmin]
 
     def get(self, request):
+        file_type = request.query_params.get("file_type", "xlsx")
+        if file_type not in EXPORT_FILE_TYPES:
+            return Response(
+                {"error": f"file_type must be one of: {', '.join(EXPORT_FILE_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        school_name = request.query_params.get("school_name")
-        degree_name = request.query_params.get("degree_name")
-        dept_name = request.query_params.get("dept_name")
-        regulation_code = request.query_params.get("regulation_code")
+        rows = (
+            filter_students(Student.objects.all(), request.query_params)
+            .order_by("roll_no", "student_id")
+            .values_list(
+                "roll_no",
+                "student_name",
+                "student_email",
+                "student_gender",
+                "student_date_of_birth",
+                "student_phone_number",
+                "parent_name",
+                "parent_phone_number",
+                "regulation__regulation_code",
+                "department__dept_code",
+                "section",
+            )
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
 
-        students = Student.objects.select_related(
-            "degree__school",
-            "department",
-            "regulation",
-            "semester",
+        return export_response(
+            "students", "Students", StudentImportEngine.REQUIRED_COLUMNS, rows,
+            file_type=file_type, column_widths=STUDENT_COLUMN_WIDTHS,
         )
 
-        # -------------------------
-        # INDEPENDENT FILTERING
-        # -------------------------
 
-        if school_name:
-            students = students.filter(
-                degree__school__school_name__iexact=school_name
-            )
+"""
+--------------------------------------------------------------------------------------------------------------------------------
+                                        Filtering students based on school code and dept code
+--------------------------------------------------------------------------------------------------------------------------------
+"""
 
-        if degree_name:
-            students = students.filter(
-                degree__degree_name__iexact=degree_name
-            )
+class StudentFilterAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsCollegeAdmin]
 
-        if dept_name:
-            students = students.filter(
-                department__dept_name__iexact=dept_name
-            )
+    def get(self, request):
 
-        if regulation_code:
-            students = students.filter(
-                regulation__regulation_code__iexact=regulation_code
-            )
+        try:
+            options = parse_listing_params(request.query_params, STUDENT_FILTER_FIELDS)
+        except ListingError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        data = students.values(
-            "roll_no",
-            "student_name",
-            "student_email",
-            "degree__school__school_name",
-            "degree__degree_name",
-            "department__dept_name",
-            "regulation__regulation_code",
-            "semester__sem_number",
-            "section",
-            "is_active",
-        )
+        # Independent filters: school_name, degree_name, dept_name, regulation_code
+        students = filter_students(Student.objects.all(), request.query_params)
 
-        return Response(
-            {
-                "count": students.count(),
-                "results": data,
-            }
-        )
+        return Response(keyset_page(students, STUDENT_FILTER_FIELDS, options))
 
 
 
@@ -939,12 +773,17 @@ class DegreesForSchoolView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get all degrees for this school
-        degrees = Degree.objects.filter(school_id=school_id).values(
-            'degree_id', 'degree_name', 'degree_code'
-        )
+        # Get all degrees for this school (served from the hierarchy cache)
+        degrees = [
+            {
+                'degree_id': degree['degree_id'],
+                'degree_name': degree['degree_name'],
+                'degree_code': degree['degree_code'],
+            }
+            for degree in get_hierarchy().degrees_for_school(school_id)
+        ]
         
-        return Response(list(degrees))
+        return Response(degrees)
 
 
 class DepartmentsForDegreeView(APIView):
@@ -967,12 +806,17 @@ class DepartmentsForDegreeView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get all departments for this degree
-        departments = Department.objects.filter(degree_id=degree_id).values(
-            'dept_id', 'dept_name', 'dept_code'
-        )
+        # Get all departments for this degree (served from the hierarchy cache)
+        departments = [
+            {
+                'dept_id': dept['dept_id'],
+                'dept_name': dept['dept_name'],
+                'dept_code': dept['dept_code'],
+            }
+            for dept in get_hierarchy().departments_for_degree(degree_id)
+        ]
         
-        return Response(list(departments))
+        return Response(departments)
 
 
 class FacultySearchView(APIView):
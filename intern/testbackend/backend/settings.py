@@ -65,6 +65,7 @@ INSTALLED_APPS = [
     'CourseConfiguration',
     'CourseManagement',
     'faculty',
+    'ImportJobs',
 ]
 
 MIDDLEWARE = [
@@ -139,6 +140,13 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock when a transaction starts, so concurrent
+            # writers (e.g. registration bursts) queue on `timeout` instead of
+            # failing with "database is locked" when a read upgrades to a write.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -148,6 +156,48 @@ DATABASES = {
 
 AUTH_USER_MODEL = 'custom_auth.User'
 
+# Processes used to hash passwords during bulk account provisioning
+# (faculty / student Excel uploads). 0 = one per CPU core, 1 = serial.
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '0'))
+
+# Max age (seconds) of the in-process School/Degree/Department/... snapshot
+# (Creation/hierarchy.py). Saves/deletes invalidate it immediately.
+HIERARCHY_CACHE_TTL = int(os.environ.get('HIERARCHY_CACHE_TTL', '300'))
+
+# Max age (seconds) of a cached faculty dashboard summary (faculty/dashboard.py).
+# Allocation / attendance / assignment / quiz / roster changes invalidate it.
+FACULTY_DASHBOARD_CACHE_TTL = int(os.environ.get('FACULTY_DASHBOARD_CACHE_TTL', '600'))
+
+# Max age (seconds) of a cached per-calendar date index
+# (AcademicSetup/calendar_index.py). Event writes invalidate it.
+CALENDAR_INDEX_CACHE_TTL = int(os.environ.get('CALENDAR_INDEX_CACHE_TTL', '3600'))
+
+# Max age (seconds) of cached registration-window monitoring statistics
+# (CourseConfiguration/monitoring.py). Not invalidated on registration.
+REGISTRATION_MONITOR_CACHE_TTL = int(os.environ.get('REGISTRATION_MONITOR_CACHE_TTL', '15'))
+
+# Max age (seconds) of pre-rendered registration catalogs and cohort window
+# lists (CourseConfiguration/catalog.py). Window / subject / course writes
+# invalidate them.
+REGISTRATION_CATALOG_CACHE_TTL = int(os.environ.get('REGISTRATION_CATALOG_CACHE_TTL', '300'))
+
+# Max age (seconds) of a cached ?total=approx student count
+# (UserDataManagement/listing.py). Not invalidated on writes.
+STUDENT_COUNT_CACHE_TTL = int(os.environ.get('STUDENT_COUNT_CACHE_TTL', '60'))
+
+# Max age (seconds) of a pre-rendered quiz question payload
+# (faculty/quiz_payload.py). Question / option / quiz edits through the
+# faculty API invalidate it; published quizzes are locked.
+QUIZ_PAYLOAD_CACHE_TTL = int(os.environ.get('QUIZ_PAYLOAD_CACHE_TTL', '86400'))
+
+# Max age (seconds) of cached quiz results / item analysis
+# (faculty/quiz_results.py). Grading and re-grading invalidate it.
+QUIZ_RESULTS_CACHE_TTL = int(os.environ.get('QUIZ_RESULTS_CACHE_TTL', '600'))
+
+# Partial credit for multiple-select quiz questions (faculty/grading.py):
+# "exact", "proportional" or "penalty".
+QUIZ_MSQ_SCORING = os.environ.get('QUIZ_MSQ_SCORING', 'proportional')
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
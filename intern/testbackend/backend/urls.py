@@ -28,4 +28,5 @@ urlpatterns = [
     path('course-config/', include('CourseConfiguration.urls')),
     path('course-mgmt/', include('CourseManagement.urls')),
     path('faculty/', include('faculty.urls')),
+    path('jobs/', include('ImportJobs.urls')),
 ]
@@ -0,0 +1,118 @@
+"""
+Helpers for provisioning many User accounts at once.
+
+Hashing is the expensive part of creating an account: the default PBKDF2
+hasher is deliberately slow and holds the GIL, so hashing a few thousand
+passwords serially dominates any bulk upload. hash_passwords() spreads the
+work over a ProcessPoolExecutor; bulk_create_users() then inserts the
+pre-hashed Users in one statement per chunk.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.utils.module_loading import import_string
+
+# Below this many passwords the pool start-up costs more than it saves.
+PARALLEL_THRESHOLD = 16
+
+
+def get_hash_workers(workers=None):
+    """Resolve the worker count: explicit arg, then settings, then CPU count."""
+    if workers is None:
+        workers = getattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    if not workers or workers < 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def _hasher_path(hasher):
+    return f"{type(hasher).__module__}.{type(hasher).__qualname__}"
+
+
+def _hash_chunk(args):
+    # Runs in a worker process. The hasher is rebuilt from its import path so
+    # the worker does not depend on (possibly overridden) parent settings.
+    hasher_path, raw_passwords = args
+    hasher = import_string(hasher_path)()
+    return [hasher.encode(raw, hasher.salt()) for raw in raw_passwords]
+
+
+def hash_passwords(raw_passwords, workers=None, heartbeat=None):
+    """
+    Return encoded password hashes for `raw_passwords`, in the same order.
+
+    Uses the default hasher from PASSWORD_HASHERS, exactly like
+    User.set_password(), so the results can be assigned to `user.password`.
+    `heartbeat`, if given, is called without arguments after every hash (or
+    pool chunk) so a long-running import job can show it is still alive.
+    """
+    raw_passwords = [str(raw) for raw in raw_passwords]
+    if not raw_passwords:
+        return []
+
+    hasher = get_hasher("default")
+    workers = get_hash_workers(workers)
+
+    if workers == 1 or len(raw_passwords) < PARALLEL_THRESHOLD:
+        hashed = []
+        for raw in raw_passwords:
+            hashed.append(hasher.encode(raw, hasher.salt()))
+            if heartbeat:
+                heartbeat()
+        return hashed
+
+    # A few chunks per worker keeps the pool busy without paying IPC per item.
+    chunk_size = max(1, len(raw_passwords) // (workers * 4))
+    chunks = [
+        (_hasher_path(hasher), raw_passwords[start:start + chunk_size])
+        for start in range(0, len(raw_passwords), chunk_size)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        hashed = []
+        for result in executor.map(_hash_chunk, chunks):
+            hashed.extend(result)
+            if heartbeat:
+                heartbeat()
+    return hashed
+
+
+def bulk_create_users(users, batch_size=None):
+    """
+    bulk_create pre-hashed Users and make sure every instance has its pk.
+
+    Backends without RETURNING support (MySQL) leave pk unset after
+    bulk_create, so the ids are fetched back by username in that case.
+    """
+    User = get_user_model()
+    users = User.objects.bulk_create(users, batch_size=batch_size)
+
+    if any(user.pk is None for user in users):
+        ids = dict(
+            User.objects.filter(
+                username__in=[user.username for user in users]
+            ).values_list("username", "id")
+        )
+        for user in users:
+            user.pk = ids[user.username]
+
+    return users
+
+
+def provision_users(specs, workers=None, batch_size=None):
+    """
+    Create Users from a list of dicts with username/email/role/raw_password
+    (plus any other User field). Passwords are hashed in parallel first.
+    """
+    User = get_user_model()
+    specs = [dict(spec) for spec in specs]
+    hashes = hash_passwords([spec.pop("raw_password") for spec in specs], workers=workers)
+
+    return bulk_create_users(
+        [User(password=password_hash, **spec) for spec, password_hash in zip(specs, hashes)],
+        batch_size=batch_size,
+    )
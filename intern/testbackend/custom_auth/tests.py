@@ -143,3 +143,40 @@ class AdminMFAFlowTest(TestCase):
             self.assertTrue(sess.is_verified)
             output = out.getvalue()
             self.assertIn('poll result', output)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ProvisioningTests(TestCase):
+    def test_parallel_hashes_match_serial_semantics(self):
+        from django.contrib.auth.hashers import check_password
+        from .provisioning import hash_passwords
+
+        passwords = [f'EMP{i:03d}' for i in range(40)]
+        hashes = hash_passwords(passwords, workers=2)
+
+        self.assertEqual(len(hashes), len(passwords))
+        for raw, encoded in zip(passwords, hashes):
+            self.assertTrue(encoded.startswith('md5$'))
+            self.assertTrue(check_password(raw, encoded))
+
+    def test_provision_users_bulk_creates_with_usable_passwords(self):
+        from .provisioning import provision_users
+
+        users = provision_users([
+            {'username': f'F{i}', 'email': f'f{i}@test.com', 'role': 'FACULTY', 'raw_password': f'F{i}'}
+            for i in range(3)
+        ], workers=1)
+
+        self.assertTrue(all(user.pk for user in users))
+        self.assertTrue(User.objects.get(username='F2').check_password('F2'))
+
+    def test_hashing_calls_heartbeat(self):
+        from .provisioning import hash_passwords
+
+        beats = []
+        hash_passwords(['a', 'b', 'c'], workers=1, heartbeat=lambda: beats.append(1))
+        self.assertEqual(len(beats), 3)
+
+        beats.clear()
+        hash_passwords([f'EMP{i:03d}' for i in range(40)], workers=2, heartbeat=lambda: beats.append(1))
+        self.assertGreater(len(beats), 1)
@@ -0,0 +1,169 @@
+"""
+Batched saving of quiz answers (autosave).
+
+save_attempt_answers() takes every changed answer of an attempt in one
+call. The quiz's questions and options come from AnswerKey
+(faculty/grading.py), the attempt's stored answers and selections are read
+with two queries, and only the differences are written in one transaction:
+
+* new answers             -> one bulk_create of StudentAnswer
+* changed text answers    -> one bulk_update
+* removed / added options -> one DELETE and one bulk_create on the
+                             selected_options through table
+
+The attempt row is locked while writing, and answers are refused once the
+attempt is submitted or its calculated_end_time has passed.
+"""
+
+import uuid
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .grading import AnswerKey
+from .models import StudentAnswer, StudentQuizAttempt
+
+SINGLE_CHOICE_TYPES = ("MCQ", "TRUE_FALSE")
+ANSWER_BATCH_SIZE = 500
+
+
+class AttemptClosed(Exception):
+    pass
+
+
+def closed_reason(attempt, now=None):
+    """Why answers can no longer be saved for the attempt, or None."""
+    if attempt.is_submitted:
+        return "Quiz already submitted."
+    if (now or timezone.now()) > attempt.calculated_end_time:
+        return "Time is up for this attempt."
+    return None
+
+
+def remaining_seconds(attempt, now=None):
+    return max(int((attempt.calculated_end_time - (now or timezone.now())).total_seconds()), 0)
+
+
+def parse_answers(key, answers):
+    """
+    Validate answers against the quiz. Each answer is a dict with
+    `question_id` and `option_ids` and/or `text_answer`; only the fields
+    given are changed.
+
+    Returns (parsed, errors): parsed maps question_id -> {"option_ids": set,
+    "text_answer": str}.
+    """
+    questions = {str(question_id): (i, question_id) for i, question_id in enumerate(key.question_ids)}
+    options = {str(option_id): (q, option_id) for option_id, (q, _) in key.options.items()}
+
+    parsed = {}
+    errors = []
+
+    for index, item in enumerate(answers):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "error": "Each answer must be an object."})
+            continue
+
+        found = questions.get(str(item.get("question_id")))
+        if found is None:
+            errors.append({"index": index, "error": "Question does not belong to this quiz."})
+            continue
+        position, question_id = found
+
+        if question_id in parsed:
+            errors.append({"index": index, "error": "Question is listed more than once."})
+            continue
+
+        answer = {}
+        if "option_ids" in item:
+            if not isinstance(item["option_ids"], list):
+                errors.append({"index": index, "error": "option_ids must be a list."})
+                continue
+
+            selected = {options.get(str(option_id), (None, None)) for option_id in item["option_ids"]}
+            if any(q != position for q, _ in selected):
+                errors.append({"index": index, "error": "Option does not belong to this question."})
+                continue
+            if len(selected) > 1 and key.types[position] in SINGLE_CHOICE_TYPES:
+                errors.append({"index": index, "error": "Only one option can be selected."})
+                continue
+            answer["option_ids"] = {option_id for _, option_id in selected}
+
+        if "text_answer" in item:
+            answer["text_answer"] = str(item["text_answer"] or "")
+
+        parsed[question_id] = answer
+
+    return parsed, errors
+
+
+def save_attempt_answers(attempt, answers):
+    """
+    Store the given answers of an attempt. Nothing is written if any answer
+    is invalid. Raises AttemptClosed when the attempt was submitted or timed
+    out in the meantime.
+
+    Returns (saved, errors): saved is the number of answers that changed.
+    """
+    parsed, errors = parse_answers(AnswerKey.load(attempt.quiz_id), answers)
+    if errors or not parsed:
+        return 0, errors
+
+    through = StudentAnswer.selected_options.through
+
+    with transaction.atomic():
+        attempt = StudentQuizAttempt.objects.select_for_update().get(pk=attempt.pk)
+        reason = closed_reason(attempt)
+        if reason:
+            raise AttemptClosed(reason)
+
+        stored = {
+            question_id: (answer_id, text_answer)
+            for answer_id, question_id, text_answer in StudentAnswer.objects.filter(
+                attempt=attempt
+            ).values_list("id", "question_id", "text_answer")
+        }
+        selected = {}
+        for answer_id, option_id in through.objects.filter(
+            studentanswer__attempt=attempt
+        ).values_list("studentanswer_id", "option_id"):
+            selected.setdefault(answer_id, set()).add(option_id)
+
+        created, texts, removed, added = [], [], [], []
+        saved = 0
+
+        for question_id, answer in parsed.items():
+            is_new = question_id not in stored
+            answer_id, text_answer = stored.get(question_id, (uuid.uuid4(), ""))
+
+            before = selected.get(answer_id, set())
+            after = answer.get("option_ids", before)
+            new_text = answer.get("text_answer", text_answer)
+
+            if is_new:
+                created.append(StudentAnswer(
+                    id=answer_id, attempt=attempt, question_id=question_id, text_answer=new_text
+                ))
+            elif new_text != text_answer:
+                texts.append(StudentAnswer(id=answer_id, text_answer=new_text))
+
+            if before - after:
+                removed.append(Q(studentanswer_id=answer_id, option_id__in=before - after))
+            added.extend(through(studentanswer_id=answer_id, option_id=option_id) for option_id in after - before)
+
+            if is_new or new_text != text_answer or after != before:
+                saved += 1
+
+        if created:
+            StudentAnswer.objects.bulk_create(created, batch_size=ANSWER_BATCH_SIZE)
+        if texts:
+            StudentAnswer.objects.bulk_update(texts, ["text_answer"], batch_size=ANSWER_BATCH_SIZE)
+        if removed:
+            through.objects.filter(reduce(or_, removed)).delete()
+        if added:
+            through.objects.bulk_create(added, batch_size=ANSWER_BATCH_SIZE)
+
+    return saved, errors
@@ -0,0 +1,290 @@
+"""
+Attendance marking and maintenance of StudentAttendanceSummary, the per
+(student, allocation) attendance totals that dashboards and shortage
+reports read.
+
+Single StudentAttendance writes are applied incrementally by the receivers
+in faculty/models.py (apply_attendance_change). Anything that writes marks
+in bulk, and attendance submission, recomputes the affected rows with
+refresh_attendance_summaries(); the management command
+`rebuild_attendance_summaries` recomputes everything.
+
+mark_attendance() records a whole session in one request: the roster is
+loaded with one query, every mark is validated against it, and all rows
+are written with a single upsert.
+"""
+
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from CourseManagement.models import AcademicClassStudent, VirtualSection
+from .models import Attendance, StudentAttendance, StudentAttendanceSummary
+
+ATTENDANCE_STATUSES = {value for value, _ in StudentAttendance.STATUS_CHOICES}
+
+
+def apply_attendance_change(student_id, allocation_id, total_delta, present_delta):
+    if not (student_id and allocation_id) or not (total_delta or present_delta):
+        return
+
+    summary = StudentAttendanceSummary.objects.filter(
+        student_id=student_id, faculty_allocation_id=allocation_id
+    )
+    changes = {
+        "total_sessions": F("total_sessions") + total_delta,
+        "present_sessions": F("present_sessions") + present_delta,
+        "updated_at": timezone.now(),
+    }
+
+    if summary.update(**changes) or total_delta < 0:
+        return
+
+    try:
+        with transaction.atomic():
+            StudentAttendanceSummary.objects.create(
+                student_id=student_id,
+                faculty_allocation_id=allocation_id,
+                total_sessions=total_delta,
+                present_sessions=present_delta,
+            )
+    except IntegrityError:
+        # Another request created the row between our UPDATE and INSERT.
+        summary.update(**changes)
+
+
+def _aggregate(records):
+    return (
+        records
+        .values("student_id", "attendance__faculty_allocation_id")
+        .annotate(
+            total=Count("id"),
+            present=Count("id", filter=Q(status="PRESENT")),
+        )
+        .order_by()
+    )
+
+
+def refresh_attendance_summaries(allocation_ids=None, student_ids=None, batch_size=1000):
+    """
+    Recompute summaries from StudentAttendance with one GROUP BY query.
+    allocation_ids / student_ids (lists or querysets) narrow the scope;
+    with neither, every summary is rebuilt. Returns the number of rows written.
+    """
+    records = StudentAttendance.objects.all()
+    summaries = StudentAttendanceSummary.objects.all()
+
+    if allocation_ids is not None:
+        records = records.filter(attendance__faculty_allocation_id__in=allocation_ids)
+        summaries = summaries.filter(faculty_allocation_id__in=allocation_ids)
+    if student_ids is not None:
+        records = records.filter(student_id__in=student_ids)
+        summaries = summaries.filter(student_id__in=student_ids)
+
+    rows = (
+        StudentAttendanceSummary(
+            student_id=row["student_id"],
+            faculty_allocation_id=row["attendance__faculty_allocation_id"],
+            total_sessions=row["total"],
+            present_sessions=row["present"],
+        )
+        for row in _aggregate(records).iterator()
+    )
+
+    written = 0
+    with transaction.atomic():
+        summaries.delete()
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            StudentAttendanceSummary.objects.bulk_create(batch, batch_size=batch_size)
+            written += len(batch)
+
+    return written
+
+
+def summarize(summaries):
+    """Overall totals for an iterable of StudentAttendanceSummary rows."""
+    total = present = 0
+    for summary in summaries:
+        total += summary.total_sessions
+        present += summary.present_sessions
+
+    return {
+        "overall_percentage": round(present / total * 100, 2) if total else 0,
+        "classes_attended": present,
+        "total_classes": total,
+    }
+
+
+# =====================================================
+# BULK MARKING
+# =====================================================
+
+def roster_members(allocation):
+    """Membership rows (with student_id) of the allocation's class or virtual section, or None."""
+    if allocation.academic_class_id:
+        return AcademicClassStudent.objects.filter(
+            academic_class_id=allocation.academic_class_id
+        )
+    if allocation.virtual_section_id:
+        return VirtualSection.students.through.objects.filter(
+            virtualsection_id=allocation.virtual_section_id
+        )
+    return None
+
+
+def roster_for_allocation(allocation):
+    """{roll_no: student_id} for the allocation's class or virtual section (one query)."""
+    members = roster_members(allocation)
+    if members is None:
+        return {}
+
+    return dict(members.values_list("student__roll_no", "student_id"))
+
+
+def mark_attendance(attendance, marks, default_status=None):
+    """
+    Upsert one StudentAttendance per mark. Each mark is a dict with
+    `roll_no` (or `student_id`) and `status`; roster students not listed get
+    `default_status` when it is given. Nothing is written if any mark is
+    invalid.
+
+    Returns (statuses, errors): statuses maps student_id -> status.
+    """
+    roster = roster_for_allocation(attendance.faculty_allocation)
+    roster_ids = {str(student_id): student_id for student_id in roster.values()}
+
+    statuses = {}
+    errors = []
+
+    for index, mark in enumerate(marks):
+        if not isinstance(mark, dict):
+            errors.append({"index": index, "error": "Each mark must be an object."})
+            continue
+
+        status = str(mark.get("status") or "").upper()
+        if status not in ATTENDANCE_STATUSES:
+            errors.append({"index": index, "error": f"Invalid status '{mark.get('status')}'."})
+            continue
+
+        if mark.get("roll_no") is not None:
+            student_id = roster.get(str(mark["roll_no"]).strip())
+        elif mark.get("student_id") is not None:
+            student_id = roster_ids.get(str(mark["student_id"]))
+        else:
+            errors.append({"index": index, "error": "roll_no or student_id is required."})
+            continue
+
+        if student_id is None:
+            errors.append({"index": index, "error": "Student does not belong to this class."})
+            continue
+
+        if student_id in statuses:
+            errors.append({"index": index, "error": "Student is listed more than once."})
+            continue
+
+        statuses[student_id] = status
+
+    if errors:
+        return statuses, errors
+
+    if default_status:
+        for student_id in roster.values():
+            statuses.setdefault(student_id, default_status)
+
+    if not statuses:
+        return statuses, errors
+
+    with transaction.atomic():
+        StudentAttendance.objects.bulk_create(
+            [
+                StudentAttendance(attendance=attendance, student_id=student_id, status=status)
+                for student_id, status in statuses.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["attendance", "student"],
+            update_fields=["status"],
+            batch_size=500,
+        )
+        # bulk_create skips the per-row summary receivers.
+        refresh_attendance_summaries(
+            allocation_ids=[attendance.faculty_allocation_id],
+            student_ids=list(statuses),
+        )
+
+    return statuses, errors
+
+
+# =====================================================
+# ATTENDANCE REGISTER
+# =====================================================
+
+def attendance_register(allocation, chunk_size=2000):
+    """
+    (headers, rows) of an allocation's attendance register: one row per
+    roster student in roll number order, "P" / "A" per session (blank when
+    unmarked), then present / total / percentage.
+
+    Sessions are loaded once; roster and marks are streamed with
+    .iterator() in the same (roll_no, student_id) order and merged, so
+    memory is bounded by the number of sessions, not students x sessions.
+    """
+    sessions = list(
+        Attendance.objects.filter(faculty_allocation=allocation)
+        .order_by("date", "lecture_session__session_no")
+        .values_list("attendance_id", "date", "lecture_session__session_no")
+    )
+    columns = {attendance_id: position for position, (attendance_id, _, _) in enumerate(sessions)}
+    headers = [
+        "roll_no",
+        "student_name",
+        *[f"S{session_no} {day.isoformat()}" for _, day, session_no in sessions],
+        "present",
+        "total",
+        "percentage",
+    ]
+
+    members = roster_members(allocation)
+    if members is None:
+        return headers, iter(())
+
+    roster = (
+        members.order_by("student__roll_no", "student_id")
+        .values_list("student_id", "student__roll_no", "student__student_name")
+        .iterator(chunk_size=chunk_size)
+    )
+    marks = (
+        StudentAttendance.objects.filter(attendance__faculty_allocation=allocation)
+        .order_by("student__roll_no", "student_id")
+        .values_list("student__roll_no", "student_id", "attendance_id", "status")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    def rows():
+        mark = next(marks, None)
+        for student_id, roll_no, student_name in roster:
+            # Skip marks of students no longer on the roster.
+            while mark is not None and (mark[0], mark[1]) < (roll_no, student_id):
+                mark = next(marks, None)
+
+            cells = [""] * len(sessions)
+            while mark is not None and mark[1] == student_id:
+                cells[columns[mark[2]]] = "P" if mark[3] == "PRESENT" else "A"
+                mark = next(marks, None)
+
+            present = cells.count("P")
+            total = present + cells.count("A")
+            yield [
+                roll_no,
+                student_name,
+                *cells,
+                present,
+                total,
+                round(present / total * 100, 2) if total else 0,
+            ]
+
+    return headers, rows()
@@ -0,0 +1,155 @@
+"""
+Faculty dashboard summary (FacultyDashboardSummaryView).
+
+The summary is built with a fixed number of queries however many
+allocations a faculty has: one annotated allocation query (student counts
+via Count, course/class/section/virtual section via select_related), one
+for assignment deadlines, one for the unpublished quiz count and one for
+the recent attendance list.
+
+The result is cached per faculty user. Allocation, attendance, assignment,
+quiz and roster changes delete the entry (receivers in faculty/models.py);
+FACULTY_DASHBOARD_CACHE_TTL is the upper bound for anything that bypasses
+signals. Assignment deadlines are cached rather than the active count, so
+assignments still drop out of "active" the moment they close.
+"""
+
+from bisect import bisect_right
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from CourseManagement.models import FacultyAllocation
+from .models import Attendance, Assignment, Quiz
+
+CACHE_KEY = "faculty:dashboard:{}"
+
+
+def _ttl():
+    return getattr(settings, "FACULTY_DASHBOARD_CACHE_TTL", 600)
+
+
+def dashboard_cache_key(user_id):
+    return CACHE_KEY.format(user_id)
+
+
+def invalidate_faculty_dashboards(user_ids):
+    keys = [dashboard_cache_key(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        cache.delete_many(keys)
+
+
+def _class_label(allocation):
+    if allocation.academic_class:
+        return str(allocation.academic_class)
+    if allocation.virtual_section:
+        return f"Virtual: {allocation.virtual_section.name}"
+    return "Unknown"
+
+
+def build_dashboard_summary(faculty_profile, user):
+    allocations = (
+        FacultyAllocation.objects
+        .filter(faculty=faculty_profile)
+        .select_related(
+            "course",
+            "academic_class__department",
+            "academic_class__section",
+            "virtual_section",
+        )
+        .annotate(
+            class_student_count=Count("academic_class__students", distinct=True),
+            virtual_student_count=Count("virtual_section__students", distinct=True),
+        )
+        .order_by("created_at")
+    )
+
+    class_data = []
+    total_students_count = 0
+
+    for alloc in allocations:
+        if alloc.academic_class:
+            student_count = alloc.class_student_count
+            class_id = alloc.academic_class.class_id
+            section_id = str(alloc.academic_class.section_id)
+        else:
+            student_count = alloc.virtual_student_count
+            class_id = str(alloc.virtual_section.virtual_id)
+            section_id = class_id
+
+        total_students_count += student_count
+
+        class_data.append({
+            "allocation_id": str(alloc.allocation_id),
+            "class_id": class_id,
+            "section_id": section_id,
+            "class_name": _class_label(alloc),
+            "course_name": alloc.course.course_name,
+            "student_count": student_count,
+            "is_virtual": alloc.virtual_section is not None
+        })
+
+    assignment_deadlines = sorted(
+        Assignment.objects.filter(faculty=user).values_list("end_datetime", flat=True)
+    )
+
+    unpublished_quizzes_count = Quiz.objects.filter(faculty=user, is_published=False).count()
+
+    recent_attendance = (
+        Attendance.objects
+        .filter(faculty_allocation__faculty=faculty_profile)
+        .select_related(
+            "faculty_allocation__academic_class__department",
+            "faculty_allocation__academic_class__section",
+            "faculty_allocation__virtual_section",
+        )
+        .order_by("-date")[:5]
+    )
+    attendance_activities = [
+        {
+            "date": att.date,
+            "class": _class_label(att.faculty_allocation),
+            "status": "Submitted" if att.is_submitted else "Pending"
+        }
+        for att in recent_attendance
+    ]
+
+    return {
+        "summary": {
+            "faculty_name": user.get_full_name(),
+            "employee_id": faculty_profile.employee_id,
+            "total_classes": len(class_data),
+            "total_students": total_students_count,
+            "allocated_classes": class_data,
+            "unpublished_quizzes": unpublished_quizzes_count,
+            "recent_attendance": attendance_activities,
+        },
+        "assignment_deadlines": assignment_deadlines,
+    }
+
+
+def get_dashboard_summary(faculty_profile, user):
+    key = dashboard_cache_key(user.pk)
+    cached = cache.get(key)
+    if cached is None:
+        cached = build_dashboard_summary(faculty_profile, user)
+        cache.set(key, cached, _ttl())
+
+    summary = cached["summary"]
+    deadlines = cached["assignment_deadlines"]
+    active_assignments = len(deadlines) - bisect_right(deadlines, timezone.now())
+
+    return {
+        "faculty_name": summary["faculty_name"],
+        "employee_id": summary["employee_id"],
+        "total_classes": summary["total_classes"],
+        "total_students": summary["total_students"],
+        "allocated_classes": summary["allocated_classes"],
+        "tasks": {
+            "active_assignments": active_assignments,
+            "unpublished_quizzes": summary["unpublished_quizzes"],
+        },
+        "recent_attendance": summary["recent_attendance"],
+    }
@@ -0,0 +1,176 @@
+"""
+Quiz auto-grading.
+
+AnswerKey loads a quiz once (two queries) into arrays indexed by question
+position: marks, question type and a bitmask of the correct options, each
+option of a question owning one bit. A student's selections become the same
+kind of bitmask, so the attempts of a quiz form one (attempts x questions)
+integer matrix that is scored with a few NumPy operations:
+
+* MCQ / TRUE_FALSE: full marks when the selection equals the key.
+* MSQ, depending on the quiz's scoring rule (Quiz.msq_scoring, set by the
+  last re-grade; QUIZ_MSQ_SCORING until then):
+    "exact"         full marks for exactly the correct set, else 0
+    "proportional"  marks * correct picks / correct options, 0 on any wrong pick
+    "penalty"       marks * (correct picks - wrong picks) / correct options,
+                    never below 0
+* SHORT / LONG answers are not auto-graded and score 0.
+
+Selected options that do not belong to the answer's question are ignored.
+
+    key = AnswerKey.load(quiz_id)
+    scores = score_attempts(key, attempt_ids)      # {attempt_id: score}, read only
+    grade_attempts(quiz_id)                         # re-grade every submitted attempt
+"""
+
+import numpy as np
+from django.conf import settings
+from django.db.models import F
+
+from .models import Option, Question, Quiz, StudentAnswer, StudentQuizAttempt
+
+AUTO_GRADED_TYPES = ("MCQ", "MSQ", "TRUE_FALSE")
+MSQ_SCORING_RULES = ("exact", "proportional", "penalty")
+
+MAX_OPTIONS = 64
+GRADING_BATCH_SIZE = 500
+
+
+def msq_scoring_rule(rule=None):
+    rule = rule or getattr(settings, "QUIZ_MSQ_SCORING", "proportional")
+    if rule not in MSQ_SCORING_RULES:
+        raise ValueError(f"Unknown MSQ scoring rule: {rule}")
+    return rule
+
+
+def quiz_msq_scoring(quiz):
+    """The rule the quiz's attempts are graded with."""
+    return msq_scoring_rule(quiz.msq_scoring)
+
+
+class AnswerKey:
+    def __init__(self, quiz_id, questions, options):
+        self.quiz_id = quiz_id
+        self.question_ids = [question_id for question_id, _, _ in questions]
+        self.types = np.array([question_type for _, question_type, _ in questions], dtype=object)
+        self.marks = np.array([marks for _, _, marks in questions], dtype=np.float64)
+        self.auto_graded = np.isin(self.types, AUTO_GRADED_TYPES)
+
+        position = {question_id: i for i, question_id in enumerate(self.question_ids)}
+        counts = [0] * len(questions)
+        correct = [0] * len(questions)
+
+        # option id -> (question position, bit)
+        self.options = {}
+        for option_id, question_id, is_correct in options:
+            q = position[question_id]
+            if counts[q] == MAX_OPTIONS:
+                raise ValueError(f"Questions with more than {MAX_OPTIONS} options cannot be auto-graded.")
+            bit = 1 << counts[q]
+            counts[q] += 1
+            self.options[option_id] = (q, bit)
+            if is_correct:
+                correct[q] |= bit
+
+        self.correct = np.array(correct, dtype=np.uint64)
+
+    @classmethod
+    def load(cls, quiz_id):
+        questions = Question.objects.filter(quiz_id=quiz_id).order_by("order", "id").values_list(
+            "id", "question_type", "marks"
+        )
+        options = Option.objects.filter(question__quiz_id=quiz_id).order_by("id").values_list(
+            "id", "question_id", "is_correct"
+        )
+        return cls(quiz_id, list(questions), list(options))
+
+    def masks(self, attempt_ids, selections):
+        """(attempts x questions) bitmasks from (attempt_id, option_id) pairs."""
+        row = {attempt_id: i for i, attempt_id in enumerate(attempt_ids)}
+        rows, cols, bits = [], [], []
+        for attempt_id, option_id in selections:
+            found = self.options.get(option_id)
+            if found is None or attempt_id not in row:
+                continue
+            rows.append(row[attempt_id])
+            cols.append(found[0])
+            bits.append(found[1])
+
+        masks = np.zeros((len(attempt_ids), len(self.question_ids)), dtype=np.uint64)
+        np.bitwise_or.at(masks, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)),
+                         np.array(bits, dtype=np.uint64))
+        return masks
+
+    def credit(self, masks, msq_scoring=None):
+        """Fraction (0..1) of each question's marks earned, same shape as masks."""
+        rule = msq_scoring_rule(msq_scoring)
+
+        expected = np.bitwise_count(self.correct).astype(np.int64)
+        picked = np.bitwise_count(masks & self.correct).astype(np.int64)
+        wrong = np.bitwise_count(masks & ~self.correct).astype(np.int64)
+
+        # A question without a correct option is never awarded.
+        exact = (masks == self.correct) & (expected > 0)
+        credit = exact.astype(np.float64)
+
+        if rule != "exact":
+            divisor = np.maximum(expected, 1)
+            if rule == "proportional":
+                partial = np.where(wrong == 0, picked / divisor, 0.0)
+            else:
+                partial = np.clip((picked - wrong) / divisor, 0.0, None)
+            credit = np.where(self.types == "MSQ", partial, credit)
+
+        return np.where(self.auto_graded, credit, 0.0)
+
+    def score(self, masks, msq_scoring=None):
+        return np.round(self.credit(masks, msq_scoring) @ self.marks, 2)
+
+
+def load_selections(attempt_ids):
+    """(attempt_id, option_id) for every selected option, in one query."""
+    through = StudentAnswer.selected_options.through
+    return through.objects.filter(
+        studentanswer__attempt_id__in=attempt_ids,
+        option__question_id=F("studentanswer__question_id"),
+    ).values_list("studentanswer__attempt_id", "option_id")
+
+
+def score_attempts(key, attempt_ids, msq_scoring=None):
+    """{attempt_id: score} without writing anything."""
+    attempt_ids = list(attempt_ids)
+    if not attempt_ids:
+        return {}
+    masks = key.masks(attempt_ids, load_selections(attempt_ids))
+    return dict(zip(attempt_ids, key.score(masks, msq_scoring).tolist()))
+
+
+def grade_attempts(quiz_id, attempt_ids=None, msq_scoring=None):
+    """
+    Score the submitted attempts of a quiz (all of them unless attempt_ids
+    is given) and store total_score with bulk_update. msq_scoring defaults
+    to the quiz's rule; the rule used is stored on the quiz so later
+    submissions and the results page score MSQs the same way. Returns the
+    scores.
+    """
+    from .quiz_results import invalidate_quiz_results
+
+    if msq_scoring is None:
+        msq_scoring = Quiz.objects.values_list("msq_scoring", flat=True).get(id=quiz_id)
+    rule = msq_scoring_rule(msq_scoring)
+
+    key = AnswerKey.load(quiz_id)
+
+    attempts = StudentQuizAttempt.objects.filter(quiz_id=quiz_id, is_submitted=True)
+    if attempt_ids is not None:
+        attempts = attempts.filter(id__in=attempt_ids)
+
+    scores = score_attempts(key, attempts.values_list("id", flat=True), rule)
+    StudentQuizAttempt.objects.bulk_update(
+        [StudentQuizAttempt(id=attempt_id, total_score=score) for attempt_id, score in scores.items()],
+        ["total_score"],
+        batch_size=GRADING_BATCH_SIZE,
+    )
+    Quiz.objects.filter(id=quiz_id).update(msq_scoring=rule)
+    invalidate_quiz_results(quiz_id)
+    return scores
@@ -0,0 +1,135 @@
+import statistics
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from custom_auth.models import User
+from Creation.bench import build_bench_hierarchy, rolled_back
+from AcademicSetup.models import Section
+from CourseConfiguration.models import Course
+from CourseManagement.models import AcademicClass, AcademicClassStudent, FacultyAllocation
+from UserDataManagement.models import Faculty, Student
+from faculty.models import LectureSession, Attendance, StudentAttendance
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark POST /faculty/attendance/<id>/mark/ against per-student inserts '
+        'for sections of N students. All writes are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[60, 120, 300], help='Section sizes to benchmark')
+        parser.add_argument('--repeat', type=int, default=5, help='Sessions marked per size (median is reported)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'students':>8}  {'bulk first':>11}  {'bulk remark':>11}  {'queries':>7}  {'per-row':>9}  {'queries':>7}")
+
+        for size in options['sizes']:
+            with rolled_back():
+                self._bench(size, options['repeat'])
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def _bench(self, size, repeat):
+        user, allocation, students = self._build_section(size)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        first, remark, per_row = [], [], []
+        bulk_queries = per_row_queries = 0
+
+        for run in range(repeat):
+            attendance = self._new_sheet(allocation, session_no=2 * run + 1)
+            url = f"/faculty/attendance/{attendance.attendance_id}/mark/"
+            marks = [
+                {"roll_no": s.roll_no, "status": "PRESENT" if i % 5 else "ABSENT"}
+                for i, s in enumerate(students)
+            ]
+
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = client.post(url, {"marks": marks}, format="json")
+                first.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.data
+            bulk_queries = len(ctx.captured_queries)
+
+            for mark in marks:
+                mark["status"] = "PRESENT"
+            started = time.perf_counter()
+            client.post(url, {"marks": marks}, format="json")
+            remark.append(time.perf_counter() - started)
+
+            # Baseline: one insert per student through the ORM, as the
+            # single-student endpoint does (without its per-row lookups).
+            attendance = self._new_sheet(allocation, session_no=2 * run + 2)
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                for i, student in enumerate(students):
+                    StudentAttendance.objects.create(
+                        attendance=attendance, student=student, status="PRESENT" if i % 5 else "ABSENT"
+                    )
+                per_row.append(time.perf_counter() - started)
+            per_row_queries = len(ctx.captured_queries)
+
+        self.stdout.write(
+            f"{size:>8}  {statistics.median(first) * 1000:>9.1f}ms  {statistics.median(remark) * 1000:>9.1f}ms  "
+            f"{bulk_queries:>7}  {statistics.median(per_row) * 1000:>7.1f}ms  {per_row_queries:>7}"
+        )
+
+    def _new_sheet(self, allocation, session_no):
+        session = LectureSession.objects.create(
+            allocation=allocation, session_no=session_no, session_date=date(2025, 7, 1)
+        )
+        return Attendance.objects.create(
+            faculty_allocation=allocation, lecture_session=session, date=session.session_date
+        )
+
+    def _build_section(self, size):
+        hierarchy = build_bench_hierarchy()
+        school, degree, department, regulation, semester = (
+            hierarchy[key] for key in ('school', 'degree', 'department', 'regulation', 'semester')
+        )
+        section = Section.objects.create(
+            name='A', school=school, degree=degree, department=department,
+            regulation=regulation, batch=regulation.batch, semester=semester
+        )
+        academic_class = AcademicClass.objects.create(
+            school=school, degree=degree, department=department, semester=semester,
+            regulation=regulation, batch=regulation.batch, academic_year='AY 2025-26',
+            section=section, strength=size
+        )
+        course = Course.objects.create(
+            course_name='Bench Course', course_code='BENCH101', course_type='CORE',
+            school=school, degree=degree, department=department, regulation=regulation,
+            credit_value=3, course_category='THEORY'
+        )
+
+        user = User.objects.create_user(username='bench_faculty', role='FACULTY', email='bench_faculty@example.com')
+        faculty = Faculty.objects.create(
+            user=user, employee_id='BENCH-F1', faculty_name='Bench Faculty',
+            faculty_email='bench_faculty@example.com', faculty_gender='MALE'
+        )
+
+        students = Student.objects.bulk_create([
+            Student(
+                roll_no=f'BENCH{i:05d}', student_name=f'Student {i}', student_email=f'bench{i}@example.com',
+                student_gender='MALE', student_date_of_birth=date(2005, 1, 1), student_phone_number='9876543210',
+                parent_name='Parent', parent_phone_number='9876543210', batch=regulation.batch,
+                degree=degree, department=department, regulation=regulation, semester=semester
+            )
+            for i in range(size)
+        ])
+        AcademicClassStudent.objects.bulk_create([
+            AcademicClassStudent(academic_class=academic_class, student=student) for student in students
+        ])
+
+        allocation = FacultyAllocation.objects.create(
+            faculty=faculty, course=course, academic_class=academic_class,
+            semester=semester, academic_year='AY 2025-26'
+        )
+        return user, allocation, students
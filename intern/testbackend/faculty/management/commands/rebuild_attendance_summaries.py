@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from faculty.attendance import refresh_attendance_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per (student, allocation) attendance summary table from StudentAttendance.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--allocation', action='append', dest='allocations',
+                            help='Only rebuild this FacultyAllocation id (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        written = refresh_attendance_summaries(
+            allocation_ids=options['allocations'],
+            batch_size=options['batch_size'],
+        )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} attendance summaries in {elapsed:.2f}s."
+        ))
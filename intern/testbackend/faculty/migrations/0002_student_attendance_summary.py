@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-16 23:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CourseManagement', '0002_initial'),
+        ('UserDataManagement', '0002_initial'),
+        ('faculty', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_sessions', models.PositiveIntegerField(default=0)),
+                ('present_sessions', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('faculty_allocation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='CourseManagement.facultyallocation')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='UserDataManagement.student')),
+            ],
+            options={
+                'unique_together': {('student', 'faculty_allocation')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-17 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faculty', '0002_student_attendance_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='msq_scoring',
+            field=models.CharField(blank=True, help_text='MSQ scoring rule of the last re-grade; blank uses QUIZ_MSQ_SCORING', max_length=20),
+        ),
+    ]
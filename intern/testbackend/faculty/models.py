@@ -123,6 +123,44 @@ class StudentAttendance(models.Model):
         return f"{self.student} - {self.status}"
 
 
+class StudentAttendanceSummary(models.Model):
+    """
+    Per (student, allocation) attendance totals, maintained from
+    StudentAttendance by the receivers below and rebuilt with
+    `manage.py rebuild_attendance_summaries`. Read this instead of counting
+    StudentAttendance rows.
+    """
+
+    student = models.ForeignKey(
+        "UserDataManagement.Student",
+        on_delete=models.CASCADE,
+        related_name="attendance_summaries"
+    )
+
+    faculty_allocation = models.ForeignKey(
+        "CourseManagement.FacultyAllocation",
+        on_delete=models.CASCADE,
+        related_name="attendance_summaries"
+    )
+
+    total_sessions = models.PositiveIntegerField(default=0)
+    present_sessions = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("student", "faculty_allocation")
+
+    @property
+    def percentage(self):
+        if not self.total_sessions:
+            return 0
+        return round(self.present_sessions / self.total_sessions * 100, 2)
+
+    def __str__(self):
+        return f"{self.student} - {self.present_sessions}/{self.total_sessions}"
+
+
 # ============================================================
 # ASSIGNMENT
 # ============================================================
@@ -241,6 +279,12 @@ class Quiz(models.Model):
     total_marks = models.IntegerField(default=0)
     is_published = models.BooleanField(default=False)
 
+    msq_scoring = models.CharField(
+        max_length=20,
+        blank=True,
+        help_text="MSQ scoring rule of the last re-grade; blank uses QUIZ_MSQ_SCORING"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -412,3 +456,142 @@ class Resource(models.Model):
 
     def __str__(self):
         return self.title
+
+
+# ============================================================
+# DASHBOARD CACHE INVALIDATION
+# ============================================================
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+from CourseManagement.models import FacultyAllocation, AcademicClassStudent, VirtualSection
+
+
+def _invalidate_dashboards(user_ids):
+    from .dashboard import invalidate_faculty_dashboards
+
+    user_ids = list(user_ids)
+    invalidate_faculty_dashboards(user_ids)
+    transaction.on_commit(lambda: invalidate_faculty_dashboards(user_ids))
+
+
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_dashboard_on_task_change(sender, instance, **kwargs):
+    _invalidate_dashboards([instance.faculty_id])
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_dashboard_on_attendance_change(sender, instance, **kwargs):
+    _invalidate_dashboards(
+        FacultyAllocation.objects.filter(
+            pk=instance.faculty_allocation_id
+        ).values_list("faculty__user_id", flat=True)
+    )
+
+
+@receiver(post_save, sender=FacultyAllocation)
+@receiver(post_delete, sender=FacultyAllocation)
+def invalidate_dashboard_on_allocation_change(sender, instance, **kwargs):
+    from UserDataManagement.models import Faculty
+
+    _invalidate_dashboards(
+        Faculty.objects.filter(pk=instance.faculty_id).values_list("user_id", flat=True)
+    )
+
+
+@receiver(post_save, sender="UserDataManagement.Faculty")
+def invalidate_dashboard_on_profile_change(sender, instance, **kwargs):
+    _invalidate_dashboards([instance.user_id])
+
+
+@receiver(post_save, sender=AcademicClassStudent)
+@receiver(post_delete, sender=AcademicClassStudent)
+def invalidate_dashboard_on_roster_change(sender, instance, **kwargs):
+    _invalidate_dashboards(
+        FacultyAllocation.objects.filter(
+            academic_class_id=instance.academic_class_id
+        ).values_list("faculty__user_id", flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=VirtualSection.students.through)
+def invalidate_dashboard_on_virtual_roster_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        # student.virtual_sections.add(...): pk_set holds the sections
+        # (None on clear; the TTL covers that case).
+        section_filter = {"virtual_section_id__in": pk_set or []}
+    else:
+        section_filter = {"virtual_section_id": instance.pk}
+
+    _invalidate_dashboards(
+        FacultyAllocation.objects.filter(**section_filter).values_list("faculty__user_id", flat=True)
+    )
+
+
+# ============================================================
+# ATTENDANCE SUMMARY MAINTENANCE
+# ============================================================
+
+from django.db.models.signals import post_init
+
+
+def _attendance_state(instance):
+    # Read from __dict__ so deferred fields are not fetched on every load.
+    values = instance.__dict__
+    return values.get("attendance_id"), values.get("student_id"), values.get("status")
+
+
+def _allocation_id_for(attendance_id):
+    return Attendance.objects.filter(pk=attendance_id).values_list(
+        "faculty_allocation_id", flat=True
+    ).first()
+
+
+@receiver(post_init, sender=StudentAttendance)
+def remember_student_attendance_state(sender, instance, **kwargs):
+    instance._summary_state = _attendance_state(instance)
+
+
+@receiver(post_save, sender=StudentAttendance)
+def update_summary_on_save(sender, instance, created, **kwargs):
+    from .attendance import apply_attendance_change, refresh_attendance_summaries
+
+    allocation_id = instance.attendance.faculty_allocation_id
+    present = 1 if instance.status == "PRESENT" else 0
+
+    if created:
+        apply_attendance_change(instance.student_id, allocation_id, 1, present)
+    else:
+        old_attendance_id, old_student_id, old_status = instance._summary_state
+
+        if old_attendance_id is None or old_student_id is None or old_status is None:
+            # Loaded with deferred fields: recount this pair.
+            refresh_attendance_summaries(
+                allocation_ids=[allocation_id], student_ids=[instance.student_id]
+            )
+        elif (old_attendance_id, old_student_id) == (instance.attendance_id, instance.student_id):
+            was_present = 1 if old_status == "PRESENT" else 0
+            apply_attendance_change(instance.student_id, allocation_id, 0, present - was_present)
+        else:
+            was_present = 1 if old_status == "PRESENT" else 0
+            apply_attendance_change(old_student_id, _allocation_id_for(old_attendance_id), -1, -was_present)
+            apply_attendance_change(instance.student_id, allocation_id, 1, present)
+
+    instance._summary_state = _attendance_state(instance)
+
+
+@receiver(post_delete, sender=StudentAttendance)
+def update_summary_on_delete(sender, instance, **kwargs):
+    from .attendance import apply_attendance_change
+
+    present = 1 if instance.status == "PRESENT" else 0
+    apply_attendance_change(
+        instance.student_id, _allocation_id_for(instance.attendance_id), -1, -present
+    )
@@ -0,0 +1,233 @@
+"""
+Question-bank import for quizzes.
+
+A bank is a list of questions, each with its options:
+
+    {"question_text", "question_type", "marks", "order" (optional),
+     "options": [{"option_text", "is_correct"}, ...]}
+
+It comes from an Excel sheet (one question per row, QUESTION_BANK_COLUMNS,
+options in option_1 .. option_6 and their numbers in correct_options, e.g.
+"1,3"), from a JSON list, or from an existing quiz. import_question_bank()
+copies it into any number of (unpublished) quizzes at once:
+
+* every Question of every target quiz is written with one bulk_create and
+  every Option with another;
+* bulk_create does not send post_save, so update_total_marks_on_save does
+  not run per question; Quiz.total_marks of all targets is recomputed with
+  one UPDATE at the end;
+* the cached question payloads (faculty/quiz_payload.py) of the targets are
+  invalidated.
+"""
+
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from Creation.excel import ExcelSheet
+from .models import Option, Question, Quiz
+from .quiz_payload import invalidate_quiz_payload
+
+MAX_BANK_OPTIONS = 6
+
+QUESTION_BANK_COLUMNS = ["question_text", "question_type", "marks"]
+QUESTION_BANK_OPTIONAL_COLUMNS = (
+    ["order"]
+    + [f"option_{i}" for i in range(1, MAX_BANK_OPTIONS + 1)]
+    + ["correct_options"]
+)
+
+QUESTION_TYPES = {value for value, _ in Question.QUESTION_TYPES}
+SINGLE_CHOICE_TYPES = ("MCQ", "TRUE_FALSE")
+TEXT_TYPES = ("SHORT", "LONG")
+
+BANK_BATCH_SIZE = 500
+
+
+def validate_bank_question(item):
+    """Normalise one bank question. Returns (question, error)."""
+    text = str(item.get("question_text") or "").strip()
+    if not text:
+        return None, "question_text is required."
+
+    question_type = str(item.get("question_type") or "").strip().upper()
+    if question_type not in QUESTION_TYPES:
+        return None, f"Invalid question_type '{item.get('question_type')}'."
+
+    try:
+        marks = int(item.get("marks"))
+    except (TypeError, ValueError):
+        return None, "marks must be an integer."
+    if marks <= 0:
+        return None, "marks must be positive."
+
+    order = item.get("order")
+    if order not in (None, ""):
+        try:
+            order = int(order)
+        except (TypeError, ValueError):
+            return None, "order must be an integer."
+    else:
+        order = None
+
+    options = []
+    for option in item.get("options") or []:
+        if not isinstance(option, dict) or not str(option.get("option_text") or "").strip():
+            return None, "Every option needs option_text."
+        options.append({
+            "option_text": str(option["option_text"]).strip(),
+            "is_correct": bool(option.get("is_correct")),
+        })
+
+    correct = sum(option["is_correct"] for option in options)
+    if question_type in TEXT_TYPES:
+        if options:
+            return None, f"{question_type} questions have no options."
+    elif len(options) < 2:
+        return None, "At least two options are required."
+    elif question_type in SINGLE_CHOICE_TYPES and correct != 1:
+        return None, "Exactly one option must be correct."
+    elif correct == 0:
+        return None, "At least one option must be correct."
+
+    return {
+        "question_text": text,
+        "question_type": question_type,
+        "marks": marks,
+        "order": order,
+        "options": options,
+    }, None
+
+
+def parse_json_bank(items):
+    """Returns (questions, errors); errors are {"index", "error"}."""
+    questions, errors = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "error": "Each question must be an object."})
+            continue
+        question, error = validate_bank_question(item)
+        if error:
+            errors.append({"index": index, "error": error})
+        else:
+            questions.append(question)
+    return questions, errors
+
+
+def _correct_numbers(value):
+    if value in (None, ""):
+        return set()
+    numbers = set()
+    for part in str(value).split(","):
+        # Excel hands whole numbers over as floats (3.0); 1.5 is not an option number.
+        number = float(part.strip())
+        if not number.is_integer():
+            raise ValueError(f"Not an option number: {part}")
+        numbers.add(int(number))
+    return numbers
+
+
+def read_excel_bank(file):
+    """Returns (questions, errors); errors are {"row", "error"}."""
+    sheet = ExcelSheet(file, QUESTION_BANK_COLUMNS, optional_columns=QUESTION_BANK_OPTIONAL_COLUMNS)
+    if sheet.missing_columns:
+        sheet.close()
+        return [], [{"row": 1, "error": f"Missing required columns: {', '.join(sheet.missing_columns)}"}]
+
+    questions, errors = [], []
+    for row_no, row in sheet.rows():
+        try:
+            correct = _correct_numbers(row.get("correct_options"))
+        except ValueError:
+            errors.append({"row": row_no, "error": "correct_options must be option numbers, e.g. 1,3."})
+            continue
+
+        options, filled = [], set()
+        for number in range(1, MAX_BANK_OPTIONS + 1):
+            text = row.get(f"option_{number}")
+            if text not in (None, ""):
+                filled.add(number)
+                options.append({"option_text": str(text), "is_correct": number in correct})
+
+        if correct - filled:
+            errors.append({"row": row_no, "error": "correct_options refers to an empty option."})
+            continue
+
+        question, error = validate_bank_question({**row, "options": options})
+        if error:
+            errors.append({"row": row_no, "error": error})
+        else:
+            questions.append(question)
+
+    return questions, errors
+
+
+def bank_from_quiz(quiz_id):
+    """
+    The questions of an existing quiz as a bank (two queries), in quiz
+    order. Orders are dropped so copies go after the target's questions.
+    """
+    options = {}
+    for option in Option.objects.filter(question__quiz_id=quiz_id).order_by("id").values(
+        "question_id", "option_text", "is_correct"
+    ):
+        options.setdefault(option.pop("question_id"), []).append(option)
+
+    questions = []
+    for question in Question.objects.filter(quiz_id=quiz_id).order_by("order", "id").values(
+        "id", "question_text", "question_type", "marks"
+    ):
+        question["options"] = options.get(question.pop("id"), [])
+        question["order"] = None
+        questions.append(question)
+    return questions
+
+
+def import_question_bank(quiz_ids, questions):
+    """
+    Copy the bank into every quiz of quiz_ids. Questions without an order
+    are appended after the quiz's current last question.
+
+    Returns {"questions": created, "options": created}.
+    """
+    quiz_ids = list(quiz_ids)
+    last_order = dict(
+        Question.objects.filter(quiz_id__in=quiz_ids).values("quiz_id")
+        .annotate(last=Max("order")).values_list("quiz_id", "last")
+    )
+
+    new_questions, new_options = [], []
+    for quiz_id in quiz_ids:
+        next_order = (last_order.get(quiz_id) or 0) + 1
+        for item in questions:
+            order = item["order"]
+            if order is None:
+                order, next_order = next_order, next_order + 1
+
+            question = Question(
+                quiz_id=quiz_id, question_text=item["question_text"],
+                question_type=item["question_type"], marks=item["marks"], order=order,
+            )
+            new_questions.append(question)
+            new_options.extend(
+                Option(question=question, option_text=option["option_text"], is_correct=option["is_correct"])
+                for option in item["options"]
+            )
+
+    with transaction.atomic():
+        Question.objects.bulk_create(new_questions, batch_size=BANK_BATCH_SIZE)
+        Option.objects.bulk_create(new_options, batch_size=BANK_BATCH_SIZE)
+
+        # One recomputation instead of update_quiz_total_marks() per question.
+        Quiz.objects.filter(id__in=quiz_ids).update(total_marks=Coalesce(
+            Subquery(
+                Question.objects.filter(quiz=OuterRef("pk")).order_by()
+                .values("quiz").annotate(total=Sum("marks")).values("total")
+            ),
+            0,
+        ))
+
+    for quiz_id in quiz_ids:
+        invalidate_quiz_payload(quiz_id)
+
+    return {"questions": len(new_questions), "options": len(new_options)}
@@ -0,0 +1,60 @@
+"""
+Pre-rendered quiz question payloads.
+
+Every student taking a quiz gets the same questions and options, so the
+payload (without `is_correct`) is rendered once per quiz version to compact
+JSON bytes and kept in Django's cache; StudentQuizViewSet.questions only
+checks the student's attempt and returns the cached bytes.
+
+Each quiz has its own version number (Creation/cache_versions.py),
+included in the payload key and bumped by QuizUpdateAPIView,
+PublishQuizAPIView, AddQuestionAPIView and AddOptionAPIView. Once a quiz is published its questions and options are
+locked (those views refuse changes), so a published payload never goes
+stale and is kept for QUIZ_PAYLOAD_CACHE_TTL seconds.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from Creation.cache_versions import bump_version, current_version
+from .models import Option, Question
+
+VERSION_KEY = "quiz:payload:version:{}"
+PAYLOAD_KEY = "quiz:payload:{}:{}"
+
+
+def _ttl():
+    return getattr(settings, "QUIZ_PAYLOAD_CACHE_TTL", 86400)
+
+
+def invalidate_quiz_payload(quiz_id):
+    bump_version(VERSION_KEY.format(quiz_id))
+
+
+def render_quiz_payload(quiz_id):
+    """Questions in order with their options, as StudentServices' QuestionSerializer lays them out."""
+    options = {}
+    for option in Option.objects.filter(question__quiz_id=quiz_id).order_by("id").values(
+        "id", "option_text", "question_id"
+    ):
+        options.setdefault(option.pop("question_id"), []).append(option)
+
+    questions = list(
+        Question.objects.filter(quiz_id=quiz_id).order_by("order", "id").values(
+            "id", "question_text", "question_type", "marks", "order"
+        )
+    )
+    for question in questions:
+        question["options"] = options.get(question["id"], [])
+
+    return JSONRenderer().render(questions)
+
+
+def get_quiz_payload(quiz_id):
+    key = PAYLOAD_KEY.format(quiz_id, current_version(VERSION_KEY.format(quiz_id)))
+    payload = cache.get(key)
+    if payload is None:
+        payload = render_quiz_payload(quiz_id)
+        cache.set(key, payload, _ttl())
+    return payload
@@ -0,0 +1,193 @@
+"""
+Quiz results and item analysis for faculty.
+
+Four queries load everything: the questions and options (with text), the
+submitted attempts with their students, and every selected option of those
+attempts. Selections become the AnswerKey bitmask matrix (faculty/grading.py)
+and all statistics are array operations over it:
+
+* score table and distribution (histogram over 0..total_marks, mean,
+  median, standard deviation, percentiles) from the stored total_score
+* difficulty index: mean fraction of a question's marks earned
+* discrimination: difficulty in the top 27% of attempts by score minus
+  difficulty in the bottom 27%
+* option pick counts: bit counts of each option's column
+
+The rendered JSON is cached per quiz; grading (finalize, re-grade) drops
+it, and QUIZ_RESULTS_CACHE_TTL bounds anything else.
+"""
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from .grading import AnswerKey, load_selections, quiz_msq_scoring
+from .models import Option, Question, StudentQuizAttempt
+
+RESULTS_KEY = "quiz:results:{}"
+
+HISTOGRAM_BINS = 10
+PERCENTILES = (25, 50, 75, 90)
+DISCRIMINATION_GROUP = 0.27
+
+
+def _ttl():
+    return getattr(settings, "QUIZ_RESULTS_CACHE_TTL", 600)
+
+
+def invalidate_quiz_results(quiz_id):
+    cache.delete(RESULTS_KEY.format(quiz_id))
+
+
+def _round(values, digits=4):
+    return np.round(values, digits).tolist()
+
+
+def score_distribution(scores, total_marks):
+    if not len(scores):
+        return {
+            "mean": None, "median": None, "std": None, "min": None, "max": None,
+            "percentiles": {str(p): None for p in PERCENTILES},
+            "histogram": {"bin_edges": [], "counts": []},
+        }
+
+    upper = max(float(total_marks), float(scores.max()), 1.0)
+    counts, edges = np.histogram(scores, bins=HISTOGRAM_BINS, range=(0.0, upper))
+    return {
+        "mean": round(float(scores.mean()), 2),
+        "median": round(float(np.median(scores)), 2),
+        "std": round(float(scores.std()), 2),
+        "min": float(scores.min()),
+        "max": float(scores.max()),
+        "percentiles": dict(zip(map(str, PERCENTILES), _round(np.percentile(scores, PERCENTILES), 2))),
+        "histogram": {"bin_edges": _round(edges, 2), "counts": counts.tolist()},
+    }
+
+
+def item_statistics(key, masks, credit, scores):
+    """Per-question difficulty, discrimination, answer and option pick counts."""
+    attempts = len(scores)
+
+    if attempts:
+        difficulty = credit.mean(axis=0)
+        answered = (masks != 0).sum(axis=0)
+    else:
+        difficulty = np.full(len(key.question_ids), np.nan)
+        answered = np.zeros(len(key.question_ids), dtype=np.int64)
+
+    if attempts >= 2:
+        group = max(1, int(round(attempts * DISCRIMINATION_GROUP)))
+        order = np.argsort(scores, kind="stable")
+        discrimination = credit[order[-group:]].mean(axis=0) - credit[order[:group]].mean(axis=0)
+    else:
+        discrimination = np.full(len(key.question_ids), np.nan)
+
+    # Option pick counts: one column per option, selected by (question, bit).
+    option_ids = list(key.options)
+    columns = np.array([key.options[option_id][0] for option_id in option_ids], dtype=np.intp)
+    bits = np.array([key.options[option_id][1] for option_id in option_ids], dtype=np.uint64)
+    picks = ((masks[:, columns] & bits) != 0).sum(axis=0) if option_ids else np.zeros(0, dtype=np.int64)
+
+    return {
+        "difficulty": np.where(key.auto_graded, difficulty, np.nan),
+        "discrimination": np.where(key.auto_graded, discrimination, np.nan),
+        "answered": answered,
+        "picks": dict(zip(option_ids, picks.tolist())),
+    }
+
+
+def _number(value, digits=4):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def render_quiz_results(quiz):
+    questions = list(
+        Question.objects.filter(quiz_id=quiz.id).order_by("order", "id").values(
+            "id", "question_text", "question_type", "marks", "order"
+        )
+    )
+    options = list(
+        Option.objects.filter(question__quiz_id=quiz.id).order_by("id").values(
+            "id", "question_id", "option_text", "is_correct"
+        )
+    )
+    key = AnswerKey(
+        quiz.id,
+        [(q["id"], q["question_type"], q["marks"]) for q in questions],
+        [(o["id"], o["question_id"], o["is_correct"]) for o in options],
+    )
+
+    attempts = StudentQuizAttempt.objects.filter(quiz_id=quiz.id, is_submitted=True)
+    rows = list(
+        attempts.order_by("-total_score", "submitted_at").values(
+            "id", "student_id", "student__username", "student__student_profile__roll_no",
+            "student__student_profile__student_name", "total_score", "submitted_at",
+        )
+    )
+    attempt_ids = [row["id"] for row in rows]
+
+    masks = key.masks(attempt_ids, load_selections(attempts.values("id")))
+    # Same MSQ rule as the stored total_score.
+    credit = key.credit(masks, quiz_msq_scoring(quiz))
+    scores = np.array([row["total_score"] for row in rows], dtype=np.float64)
+    stats = item_statistics(key, masks, credit, scores)
+
+    total_marks = quiz.total_marks
+    percentages = scores * 100 / total_marks if total_marks else np.zeros(len(scores))
+
+    by_question = {}
+    for option in options:
+        by_question.setdefault(option["question_id"], []).append({
+            "option_id": option["id"],
+            "option_text": option["option_text"],
+            "is_correct": option["is_correct"],
+            "picks": stats["picks"][option["id"]],
+        })
+
+    return JSONRenderer().render({
+        "quiz": {
+            "id": quiz.id,
+            "title": quiz.title,
+            "total_marks": total_marks,
+            "questions": len(questions),
+        },
+        "attempts": len(rows),
+        "scores": [
+            {
+                "attempt_id": row["id"],
+                "student_id": row["student_id"],
+                "username": row["student__username"],
+                "roll_no": row["student__student_profile__roll_no"],
+                "student_name": row["student__student_profile__student_name"],
+                "total_score": row["total_score"],
+                "percentage": round(float(percentage), 2),
+                "submitted_at": row["submitted_at"],
+            }
+            for row, percentage in zip(rows, percentages)
+        ],
+        "distribution": score_distribution(scores, total_marks),
+        "questions": [
+            {
+                "question_id": question["id"],
+                "order": question["order"],
+                "question_text": question["question_text"],
+                "question_type": question["question_type"],
+                "marks": question["marks"],
+                "answered": int(stats["answered"][i]),
+                "difficulty": _number(stats["difficulty"][i]),
+                "discrimination": _number(stats["discrimination"][i]),
+                "options": by_question.get(question["id"], []),
+            }
+            for i, question in enumerate(questions)
+        ],
+    })
+
+
+def get_quiz_results(quiz):
+    key = RESULTS_KEY.format(quiz.id)
+    payload = cache.get(key)
+    if payload is None:
+        payload = render_quiz_results(quiz)
+        cache.set(key, payload, _ttl())
+    return payload
@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from faculty.models import LecturePlan, LectureSession,Attendance, StudentAttendance
 from CourseManagement.models import FacultyAllocation
+from AcademicSetup.calendar_index import get_calendar_index, resolve_calendar_ids
 
 from rest_framework import serializers
-import openpyxl
 from django.db import transaction
+from Creation.excel import ExcelSheet
 
 
 '''
@@ -58,9 +59,17 @@ from rest_framework import serializers
 from django.db import transaction
 from CourseManagement.models import FacultyAllocation
 from faculty.models import LecturePlan, LectureSession
-import openpyxl
 
 
+# Positional columns of the lecture plan template
+LECTURE_PLAN_COLUMNS = [
+    "session_no",
+    "session_date",
+    "unit_name",
+    "topic_name",
+    "subtopic_name",
+]
+
 
 class LecturePlanBulkUploadSerializer(serializers.Serializer):
     course_id = serializers.UUIDField()
@@ -105,25 +114,27 @@ class LecturePlanBulkUploadSerializer(serializers.Serializer):
         file = validated_data["file"]
         allocation = validated_data["allocation"]
 
-        wb = openpyxl.load_workbook(file)
-        sheet = wb.active
+        sheet = ExcelSheet(
+            file,
+            LECTURE_PLAN_COLUMNS,
+            by_header=False,
+            date_columns=["session_date"],
+        )
+
+        if sheet.missing_columns:
+            sheet.close()
+            raise serializers.ValidationError(
+                "Row 1: Required columns missing."
+            )
 
         lecture_plans_to_create = []
         sessions_to_update = []
 
-        for row_idx, row in enumerate(
-            sheet.iter_rows(min_row=2, values_only=True), start=2
-        ):
-
-            if not any(row):
-                continue
-
-            if len(row) < 5:
-                raise serializers.ValidationError(
-                    f"Row {row_idx}: Required columns missing."
-                )
+        for row_idx, row in sheet.rows():
 
-            session_no, excel_date, unit_name, topic_name, subtopic_name = row[:5]
+            session_no, excel_date, unit_name, topic_name, subtopic_name = (
+                row[column] for column in LECTURE_PLAN_COLUMNS
+            )
 
             # 🔥 Force session_no to int safely
             try:
@@ -149,14 +160,7 @@ class LecturePlanBulkUploadSerializer(serializers.Serializer):
                 )
 
             # Date validation
-            if hasattr(excel_date, "strftime"):
-                excel_date_str = excel_date.strftime("%Y-%m-%d")
-            else:
-                excel_date_str = str(excel_date)
-
-            stored_date_str = session.session_date.strftime("%Y-%m-%d")
-
-            if excel_date_str != stored_date_str:
+            if "session_date" in row.errors or excel_date != session.session_date:
                 raise serializers.ValidationError(
                     f"Row {row_idx}: Date mismatch detected."
                 )
@@ -260,6 +264,22 @@ class AttendanceCreateSerializer(serializers.ModelSerializer):
                 "Not authorized for this allocation."
             )
 
+        # Date must still be open in the academic calendar (holidays or
+        # exams may have been added after sessions were generated). Without
+        # INSTRUCTION / EXAM events the term bounds are unknown, so only the
+        # holiday and exam days themselves are blocked.
+        calendar_id = resolve_calendar_ids([allocation]).get(allocation.allocation_id)
+        if calendar_id:
+            index = get_calendar_index(calendar_id)
+            if index.error is None:
+                blocked = not index.is_teachable(date)
+            else:
+                blocked = index.is_holiday(date) or index.is_exam_day(date)
+            if blocked:
+                raise serializers.ValidationError(
+                    "Selected date is a holiday or outside the instruction period."
+                )
+
         # Find lecture session using date
         try:
             session = LectureSession.objects.get(
@@ -509,7 +529,7 @@ class QuizCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Quiz
         fields = "__all__"
-        read_only_fields = ["faculty", "is_published", "total_marks"]
+        read_only_fields = ["faculty", "is_published", "total_marks", "msq_scoring"]
 
     def validate(self, data):
         request = self.context["request"]
@@ -0,0 +1,90 @@
+"""
+Lecture session generation.
+
+An allocation gets one LectureSession per teaching day between the first
+INSTRUCTION event and the end of the first EXAM event of its semester's
+active calendar. A teaching day is a weekday the allocation has a Timetable
+slot on that is not inside a HOLIDAY / EXAM / OTHER event.
+
+Teaching dates come from the cached per-calendar index
+(AcademicSetup/calendar_index.py). generate_sessions_for_allocations()
+resolves calendars, indexes and timetables for any number of allocations
+in a fixed number of queries and writes every session with one bulk_create.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+
+from AcademicSetup.calendar_index import get_calendar_indexes, resolve_calendar_ids
+from CourseManagement.models import Timetable
+from .models import LectureSession
+
+
+class SessionGenerationError(Exception):
+    pass
+
+
+def generate_sessions_for_allocations(allocations, skip_existing=True):
+    """
+    Generate sessions for many allocations at once.
+
+    Returns (created, errors): created maps allocation_id -> number of
+    sessions written, errors maps allocation_id -> message. Allocations that
+    already have sessions are skipped when skip_existing is set.
+    """
+    allocations = list(allocations)
+    created, errors = {}, {}
+    if not allocations:
+        return created, errors
+
+    allocation_ids = [a.allocation_id for a in allocations]
+
+    if skip_existing:
+        existing = set(
+            LectureSession.objects.filter(allocation_id__in=allocation_ids)
+            .values_list("allocation_id", flat=True).order_by().distinct()
+        )
+        allocations = [a for a in allocations if a.allocation_id not in existing]
+
+    calendar_ids = resolve_calendar_ids(allocations)
+    indexes = get_calendar_indexes(calendar_ids.values())
+
+    weekdays = defaultdict(set)
+    for allocation_id, day in Timetable.objects.filter(
+        faculty_allocation_id__in=allocation_ids
+    ).values_list("faculty_allocation_id", "day_of_week"):
+        weekdays[allocation_id].add(day)
+
+    sessions = []
+
+    for allocation in allocations:
+        calendar_id = calendar_ids.get(allocation.allocation_id)
+        if calendar_id is None:
+            errors[allocation.allocation_id] = "Active Academic Calendar not found for this semester"
+            continue
+
+        index = indexes[calendar_id]
+        if index.error:
+            errors[allocation.allocation_id] = index.error
+            continue
+
+        dates = index.teaching_dates(weekdays[allocation.allocation_id])
+        sessions.extend(
+            LectureSession(allocation=allocation, session_no=number, session_date=day)
+            for number, day in enumerate(dates, start=1)
+        )
+        created[allocation.allocation_id] = len(dates)
+
+    with transaction.atomic():
+        LectureSession.objects.bulk_create(sessions, batch_size=1000)
+
+    return created, errors
+
+
+def generate_sessions(allocation):
+    """Generate sessions for a single allocation; raises SessionGenerationError."""
+    created, errors = generate_sessions_for_allocations([allocation], skip_existing=False)
+    if allocation.allocation_id in errors:
+        raise SessionGenerationError(errors[allocation.allocation_id])
+    return created.get(allocation.allocation_id, 0)
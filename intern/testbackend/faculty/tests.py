@@ -1,3 +1,729 @@
+import json
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from custom_auth.models import User
+from Creation.models import School, Degree, Department, Regulation, Semester
+from AcademicSetup.models import Section
+from CourseConfiguration.models import Course
+from CourseManagement.models import AcademicClass, AcademicClassStudent, FacultyAllocation
+from UserDataManagement.models import Faculty, Student
+from AcademicSetup.models import AcademicCalendar, CalendarEvent
+from CourseManagement.models import Timetable
+from .models import (
+    Quiz, Question, Option, StudentQuizAttempt, StudentAnswer,
+    LectureSession, Attendance, StudentAttendance, StudentAttendanceSummary,
+)
+from .quiz_payload import get_quiz_payload
+
+
+class FacultyTestData:
+    def setUp(self):
+        cache.clear()
+
+        self.school = School.objects.create(school_name="School of Engineering", school_code="SOE")
+        self.degree = Degree.objects.create(
+            degree_name="B.Tech", degree_code="BTECH",
+            degree_duration=4, number_of_semesters=8, school=self.school
+        )
+        self.dept = Department.objects.create(dept_name="Computer Science", dept_code="CSE", degree=self.degree)
+        self.regulation = Regulation.objects.create(degree=self.degree, regulation_code="R25", batch="2025-2029")
+        self.semester = Semester.objects.create(
+            degree=self.degree, department=self.dept, sem_number=1, sem_name="Sem 1", year=1
+        )
+
+        self.user = User.objects.create_user(
+            username='dash_f1', password='password', role='FACULTY', email='dash_f1@test.com',
+            first_name="Dash", last_name="Faculty"
+        )
+        self.faculty = Faculty.objects.create(
+            user=self.user, employee_id="DF001", faculty_name="Dash Faculty",
+            faculty_email="dash_f1@test.com", faculty_gender="MALE"
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _allocate(self, section_name, students=0):
+        section = Section.objects.create(
+            name=section_name, school=self.school, degree=self.degree, department=self.dept,
+            regulation=self.regulation, batch="2025-2029", semester=self.semester
+        )
+        academic_class = AcademicClass.objects.create(
+            school=self.school, degree=self.degree, department=self.dept, semester=self.semester,
+            regulation=self.regulation, batch="2025-2029", academic_year="AY 2025-26",
+            section=section, strength=60
+        )
+        course = Course.objects.create(
+            course_name=f"Course {section_name}", course_code=f"C{section_name}", course_type="CORE",
+            school=self.school, degree=self.degree, department=self.dept, regulation=self.regulation,
+            credit_value=3, course_category="THEORY"
+        )
+        for i in range(students):
+            student = Student.objects.create(
+                roll_no=f"{section_name}{i:03d}", student_name=f"Student {i}",
+                student_email=f"{section_name.lower()}{i}@test.com", student_gender="MALE",
+                student_date_of_birth=date(2005, 1, 1), student_phone_number="9876543210",
+                parent_name="Parent", parent_phone_number="9876543210", batch="2025-2029",
+                degree=self.degree, department=self.dept, regulation=self.regulation, semester=self.semester
+            )
+            AcademicClassStudent.objects.create(academic_class=academic_class, student=student)
+
+        return FacultyAllocation.objects.create(
+            faculty=self.faculty, course=course, academic_class=academic_class,
+            semester=self.semester, academic_year="AY 2025-26"
+        )
+
+
+class FacultyDashboardTests(FacultyTestData, TestCase):
+    def _dashboard_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/faculty/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_is_constant(self):
+        self._allocate("A", students=2)
+        one_allocation, _ = self._dashboard_queries()
+
+        self._allocate("B", students=3)
+        self._allocate("C")
+        queries, data = self._dashboard_queries()
+
+        self.assertEqual(queries, one_allocation)
+        self.assertEqual(data["total_classes"], 3)
+        self.assertEqual(data["total_students"], 5)
+        self.assertEqual(
+            [c["class_name"] for c in data["allocated_classes"]],
+            ["Computer Science - A (AY 2025-26)", "Computer Science - B (AY 2025-26)",
+             "Computer Science - C (AY 2025-26)"]
+        )
+
+    def test_summary_is_cached_until_invalidated(self):
+        allocation = self._allocate("A", students=1)
+        self.client.get("/faculty/dashboard/")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/faculty/dashboard/")
+        self.assertEqual(response.data["tasks"]["unpublished_quizzes"], 0)
+
+        Quiz.objects.create(
+            faculty=self.user, academic_class=allocation.academic_class,
+            section=allocation.academic_class.section, title="Quiz 1",
+            access_start_datetime=timezone.now(), access_end_datetime=timezone.now() + timedelta(days=1),
+            quiz_time=30
+        )
+        self.assertEqual(self.client.get("/faculty/dashboard/").data["tasks"]["unpublished_quizzes"], 1)
+
+        student = Student.objects.first()
+        AcademicClassStudent.objects.filter(student=student).delete()
+        self.assertEqual(self.client.get("/faculty/dashboard/").data["total_students"], 0)
+
+
+class AttendanceSummaryTests(FacultyTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.allocation = self._allocate("A", students=3)
+        self.students = list(Student.objects.order_by("roll_no"))
+
+    def _sheet(self, session_no, statuses):
+        session = LectureSession.objects.create(
+            allocation=self.allocation, session_no=session_no, session_date=date(2025, 7, session_no)
+        )
+        attendance = Attendance.objects.create(
+            faculty_allocation=self.allocation, lecture_session=session, date=session.session_date
+        )
+        for student, mark in zip(self.students, statuses):
+            StudentAttendance.objects.create(attendance=attendance, student=student, status=mark)
+        return attendance
+
+    def _totals(self):
+        return {
+            s.student.roll_no: (s.present_sessions, s.total_sessions)
+            for s in StudentAttendanceSummary.objects.select_related("student")
+        }
+
+    def test_summaries_follow_marks(self):
+        self._sheet(1, ["PRESENT", "ABSENT", "PRESENT"])
+        sheet = self._sheet(2, ["PRESENT", "ABSENT", "ABSENT"])
+        self.assertEqual(self._totals(), {"A000": (2, 2), "A001": (0, 2), "A002": (1, 2)})
+
+        mark = StudentAttendance.objects.get(attendance=sheet, student=self.students[1])
+        mark.status = "PRESENT"
+        mark.save()
+        StudentAttendance.objects.get(attendance=sheet, student=self.students[2]).delete()
+        self.assertEqual(self._totals(), {"A000": (2, 2), "A001": (1, 2), "A002": (1, 1)})
+
+        expected = self._totals()
+        StudentAttendanceSummary.objects.update(total_sessions=0, present_sessions=0)
+        call_command("rebuild_attendance_summaries", stdout=StringIO())
+        self.assertEqual(self._totals(), expected)
+
+    def test_dashboard_and_shortage_report(self):
+        self._sheet(1, ["PRESENT", "ABSENT", "PRESENT"])
+        self._sheet(2, ["PRESENT", "ABSENT", "ABSENT"])
+
+        response = self.client.get("/faculty/attendance/shortage/", {"threshold": 60})
+        self.assertEqual([s["roll_no"] for s in response.data["students"]], ["A001", "A002"])
+
+        for params in ({"threshold": "nan"}, {"threshold": "inf"}, {"threshold": 150}, {"allocation_id": "abc"}):
+            self.assertEqual(self.client.get("/faculty/attendance/shortage/", params).status_code, 400)
+        response = self.client.get(
+            "/faculty/attendance/shortage/", {"allocation_id": str(self.allocation.allocation_id), "threshold": 60}
+        )
+        self.assertEqual(response.data["count"], 2)
+
+        student_user = User.objects.create_user(
+            username="att_s1", password="password", role="STUDENT", email="att_s1@test.com"
+        )
+        Student.objects.filter(pk=self.students[2].pk).update(user=student_user)
+        self.client.force_authenticate(user=student_user)
+
+        attendance = self.client.get("/student-services/dashboard/").data["attendance"]
+        self.assertEqual(attendance["overall_percentage"], 50.0)
+        self.assertEqual(attendance["courses"][0]["course_code"], "CA")
+
+    def test_register_export(self):
+        self._sheet(1, ["PRESENT", "ABSENT", "PRESENT"])
+        self._sheet(2, ["PRESENT", "ABSENT"])
+        url = f"/faculty/attendance/register/{self.allocation.allocation_id}/export/"
+
+        response = self.client.get(url, {"file_type": "csv"})
+        self.assertEqual(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines, [
+            "roll_no,student_name,S1 2025-07-01,S2 2025-07-02,present,total,percentage",
+            "A000,Student 0,P,P,2,2,100.0",
+            "A001,Student 1,A,A,0,2,0.0",
+            "A002,Student 2,P,,1,1,100.0",
+        ])
+
+        workbook = load_workbook(BytesIO(b"".join(self.client.get(url).streaming_content)), read_only=True)
+        self.assertEqual(len(list(workbook.active.iter_rows(values_only=True))), 4)
+
+        other = User.objects.create_user(username="att_f2", password="password", role="FACULTY", email="att_f2@test.com")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class BulkAttendanceMarkTests(FacultyTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.allocation = self._allocate("A", students=3)
+        session = LectureSession.objects.create(
+            allocation=self.allocation, session_no=1, session_date=date(2025, 7, 1)
+        )
+        self.attendance = Attendance.objects.create(
+            faculty_allocation=self.allocation, lecture_session=session, date=session.session_date
+        )
+        self.url = f"/faculty/attendance/{self.attendance.attendance_id}/mark/"
+
+    def _statuses(self):
+        return dict(
+            StudentAttendance.objects.filter(attendance=self.attendance)
+            .values_list("student__roll_no", "status")
+        )
+
+    def test_invalid_marks_write_nothing(self):
+        response = self.client.post(self.url, {"marks": [
+            {"roll_no": "A000", "status": "PRESENT"},
+            {"roll_no": "Z999", "status": "PRESENT"},
+            {"roll_no": "A000", "status": "ABSENT"},
+            {"roll_no": "A001", "status": "LATE"},
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["index"] for e in response.data["errors"]], [1, 2, 3])
+        self.assertEqual(self._statuses(), {})
+
+    def test_marks_and_remarks_whole_roster(self):
+        response = self.client.post(self.url, {
+            "marks": [{"roll_no": "A000", "status": "present"}],
+            "default_status": "ABSENT",
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["marked"], response.data["present"]), (3, 1))
+
+        response = self.client.post(self.url, {"marks": [
+            {"roll_no": "A001", "status": "PRESENT"},
+            {"roll_no": "A002", "status": "PRESENT"},
+        ]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._statuses(), {"A000": "PRESENT", "A001": "PRESENT", "A002": "PRESENT"})
+        self.assertEqual(
+            set(StudentAttendanceSummary.objects.values_list("present_sessions", "total_sessions")), {(1, 1)}
+        )
+
+        Attendance.objects.filter(pk=self.attendance.pk).update(is_submitted=True)
+        response = self.client.post(self.url, {"marks": []}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class AttendanceCreateTests(FacultyTestData, TestCase):
+    def test_incomplete_calendar_blocks_only_holidays(self):
+        allocation = self._allocate("A")
+        # No INSTRUCTION / EXAM events yet: the term bounds are unknown.
+        calendar = AcademicCalendar.objects.create(
+            name="Odd Sem", school=self.school, degree=self.degree, department=self.dept,
+            regulation=self.regulation, batch="2025-2029", semester=self.semester
+        )
+        CalendarEvent.objects.create(
+            calendar=calendar, type="HOLIDAY", name="HOLIDAY", start_date=date(2025, 8, 15), end_date=date(2025, 8, 15)
+        )
+        for session_no, day in enumerate([date(2025, 8, 14), date(2025, 8, 15)], start=1):
+            LectureSession.objects.create(
+                allocation=allocation, session_no=session_no, session_date=day, is_completed=True
+            )
+
+        def create(day):
+            return self.client.post("/faculty/attendance/", {
+                "faculty_allocation": str(allocation.allocation_id), "date": day.isoformat(),
+            }, format="json")
+
+        response = create(date(2025, 8, 15))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("holiday", str(response.data))
+
+        self.assertEqual(create(date(2025, 8, 14)).status_code, 201)
+
+
+class SessionGenerationTests(FacultyTestData, TestCase):
+    def _calendar(self):
+        calendar = AcademicCalendar.objects.create(
+            name="Odd Sem", school=self.school, degree=self.degree, department=self.dept,
+            regulation=self.regulation, batch="2025-2029", semester=self.semester
+        )
+        for kind, start, end in [
+            ("INSTRUCTION", date(2025, 7, 1), date(2025, 10, 31)),
+            ("HOLIDAY", date(2025, 8, 15), date(2025, 8, 15)),
+            ("OTHER", date(2025, 9, 1), date(2025, 9, 10)),
+            ("EXAM", date(2025, 11, 3), date(2025, 11, 14)),
+        ]:
+            CalendarEvent.objects.create(calendar=calendar, type=kind, name=kind, start_date=start, end_date=end)
+        return calendar
+
+    def test_department_batch(self):
+        self._calendar()
+        allocations = [self._allocate(name) for name in "ABC"]
+        for allocation, day in zip(allocations, ["MONDAY", "TUESDAY", "FRIDAY"]):
+            Timetable.objects.create(
+                academic_class=allocation.academic_class, faculty_allocation=allocation, day_of_week=day,
+                start_time="09:00", end_time="10:00", academic_year="AY 2025-26"
+            )
+
+        coordinator = User.objects.create_user(
+            username="sess_ac", password="password", role="ACADEMIC_COORDINATOR", email="sess_ac@test.com"
+        )
+        self.client.force_authenticate(user=coordinator)
+
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                "/faculty/generate-sessions/department/", {"department_id": str(self.dept.dept_id)}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["errors"], {})
+
+        mondays = LectureSession.objects.filter(allocation=allocations[0]).order_by("session_no")
+        self.assertEqual(mondays.first().session_date, date(2025, 7, 7))
+        self.assertEqual(list(mondays.values_list("session_no", flat=True)), list(range(1, mondays.count() + 1)))
+
+        response = self.client.post(
+            "/faculty/generate-sessions/department/", {"department_id": str(self.dept.dept_id)}, format="json"
+        )
+        self.assertEqual(response.data["sessions_created"], 0)
+
+
+class QuizTestData(FacultyTestData):
+    def setUp(self):
+        super().setUp()
+        allocation = self._allocate("Q", students=3)
+        now = timezone.now()
+        self.quiz = Quiz.objects.create(
+            faculty=self.user, academic_class=allocation.academic_class,
+            section=allocation.academic_class.section, title="Unit Test",
+            access_start_datetime=now - timedelta(hours=1), access_end_datetime=now + timedelta(hours=1),
+            quiz_time=30, is_published=True
+        )
+
+        self.students = []
+        for i, student in enumerate(Student.objects.order_by("roll_no")):
+            student.user = User.objects.create_user(
+                username=f"quiz_s{i}", password="password", role="STUDENT", email=f"quiz_s{i}@test.com"
+            )
+            student.save(update_fields=["user"])
+            self.students.append(student.user)
+
+    def _question(self, question_type, marks, options, order=1):
+        """options: [(option_text, is_correct)]. Returns (question, [options])."""
+        question = Question.objects.create(
+            quiz=self.quiz, question_text=f"{question_type} question", question_type=question_type,
+            marks=marks, order=order
+        )
+        return question, [
+            Option.objects.create(question=question, option_text=text, is_correct=is_correct)
+            for text, is_correct in options
+        ]
+
+    def _attempt(self, user, answers, submitted=True):
+        """answers: [(question, [selected options])]."""
+        attempt = StudentQuizAttempt.objects.create(
+            quiz=self.quiz, student=user, is_submitted=submitted,
+            calculated_end_time=timezone.now() + timedelta(minutes=30)
+        )
+        for question, options in answers:
+            answer = StudentAnswer.objects.create(attempt=attempt, question=question)
+            answer.selected_options.set(options)
+        return attempt
+
+
+class QuizGradingTests(QuizTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.mcq, self.mcq_options = self._question("MCQ", 2, [("a", True), ("b", False), ("c", False)], order=1)
+        self.msq, self.msq_options = self._question(
+            "MSQ", 4, [("a", True), ("b", True), ("c", False), ("d", False)], order=2
+        )
+        self.tf, self.tf_options = self._question("TRUE_FALSE", 1, [("True", False), ("False", True)], order=3)
+        self.short, _ = self._question("SHORT", 3, [], order=4)
+
+    def test_finalize_scores_attempt(self):
+        a, b, c, _ = self.msq_options
+        attempt = self._attempt(self.students[0], [
+            (self.mcq, [self.mcq_options[0]]),
+            (self.msq, [a]),
+            (self.tf, [self.tf_options[1]]),
+            # An option of another question is ignored.
+            (self.short, [self.mcq_options[1]]),
+        ], submitted=False)
+
+        client = APIClient()
+        client.force_authenticate(user=self.students[0])
+        response = client.post(f"/student-services/quizzes/{self.quiz.id}/finalize/")
+        self.assertEqual(response.status_code, 200)
+
+        attempt.refresh_from_db()
+        self.assertTrue(attempt.is_submitted)
+        # 2 (MCQ) + 4 * 1/2 (MSQ, proportional) + 1 (TRUE_FALSE)
+        self.assertEqual(attempt.total_score, 5.0)
+
+        response = client.post(f"/student-services/quizzes/{self.quiz.id}/finalize/")
+        self.assertEqual(response.status_code, 400)
+
+    def test_regrade_all_with_scoring_rules(self):
+        a, b, c, _ = self.msq_options
+        attempts = [
+            self._attempt(self.students[0], [(self.mcq, [self.mcq_options[0]]), (self.msq, [a, b])]),
+            self._attempt(self.students[1], [(self.mcq, [self.mcq_options[1]]), (self.msq, [a, b, c])]),
+            self._attempt(self.students[2], [(self.msq, [a, c])]),
+        ]
+
+        def scores(rule):
+            with self.assertNumQueries(7):
+                response = self.client.post(
+                    f"/faculty/{self.quiz.id}/regrade/", {"msq_scoring": rule}, format="json"
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["graded_attempts"], 3)
+            return [StudentQuizAttempt.objects.get(pk=attempt.pk).total_score for attempt in attempts]
+
+        self.assertEqual(scores("exact"), [6.0, 0.0, 0.0])
+        self.assertEqual(scores("proportional"), [6.0, 0.0, 0.0])
+        self.assertEqual(scores("penalty"), [6.0, 2.0, 0.0])
+
+        # Fixing the key: the MCQ answer is actually "b".
+        Option.objects.filter(question=self.mcq).update(is_correct=False)
+        Option.objects.filter(pk=self.mcq_options[1].pk).update(is_correct=True)
+        self.assertEqual(scores("exact"), [4.0, 2.0, 0.0])
+
+        response = self.client.post(f"/faculty/{self.quiz.id}/regrade/", {"msq_scoring": "bogus"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_regrade_rule_is_kept_for_submissions_and_results(self):
+        a = self.msq_options[0]
+        self._attempt(self.students[0], [(self.msq, [a])])
+        late = self._attempt(self.students[1], [(self.msq, [a])], submitted=False)
+
+        self.client.post(f"/faculty/{self.quiz.id}/regrade/", {"msq_scoring": "exact"}, format="json")
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.msq_scoring, "exact")
+
+        # Submitted after the re-grade: scored with the same rule.
+        client = APIClient()
+        client.force_authenticate(user=self.students[1])
+        client.post(f"/student-services/quizzes/{self.quiz.id}/finalize/")
+        late.refresh_from_db()
+        self.assertEqual(late.total_score, 0.0)
+
+        # A re-grade without a rule keeps the quiz's one.
+        self.assertEqual(self.client.post(f"/faculty/{self.quiz.id}/regrade/").data["msq_scoring"], "exact")
+
+        msq = self.client.get(f"/faculty/{self.quiz.id}/results/").json()["questions"][1]
+        self.assertEqual((msq["question_id"], msq["difficulty"]), (str(self.msq.id), 0.0))
+
+
+class QuizAutosaveTests(QuizTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.mcq, self.mcq_options = self._question("MCQ", 2, [("a", True), ("b", False)], order=1)
+        self.msq, self.msq_options = self._question("MSQ", 2, [("a", True), ("b", True), ("c", False)], order=2)
+        self.short, _ = self._question("SHORT", 2, [], order=3)
+        self.attempt = self._attempt(self.students[0], [], submitted=False)
+
+        self.client.force_authenticate(user=self.students[0])
+        self.url = f"/student-services/quizzes/{self.quiz.id}/save_answers/"
+
+    def _save(self, answers):
+        return self.client.post(self.url, {"answers": answers}, format="json")
+
+    def _stored(self):
+        return {
+            answer.question_id: (set(answer.selected_options.values_list("option_text", flat=True)), answer.text_answer)
+            for answer in StudentAnswer.objects.filter(attempt=self.attempt)
+        }
+
+    def test_saves_only_changes(self):
+        a, b, c = self.msq_options
+        response = self._save([
+            {"question_id": str(self.mcq.id), "option_ids": [str(self.mcq_options[1].id)]},
+            {"question_id": str(self.msq.id), "option_ids": [str(a.id), str(c.id)]},
+            {"question_id": str(self.short.id), "text_answer": "first"},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["saved"], 3)
+
+        response = self._save([
+            {"question_id": str(self.mcq.id), "option_ids": [str(self.mcq_options[1].id)]},
+            {"question_id": str(self.msq.id), "option_ids": [str(a.id), str(b.id)]},
+            {"question_id": str(self.short.id), "text_answer": "second"},
+        ])
+        self.assertEqual(response.data["saved"], 2)
+        self.assertEqual(self._stored(), {
+            self.mcq.id: ({"b"}, ""),
+            self.msq.id: ({"a", "b"}, ""),
+            self.short.id: (set(), "second"),
+        })
+
+        # Unchanged answers are read but not written.
+        with self.assertNumQueries(9):
+            response = self._save([{"question_id": str(self.msq.id), "option_ids": [str(b.id), str(a.id)]}])
+        self.assertEqual(response.data["saved"], 0)
+
+    def test_rejects_invalid_answers_and_late_saves(self):
+        response = self._save([
+            {"question_id": str(self.short.id), "text_answer": "kept out"},
+            {"question_id": str(self.mcq.id), "option_ids": [str(o.id) for o in self.mcq_options]},
+            {"question_id": str(self.msq.id), "option_ids": [str(self.mcq_options[0].id)]},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["index"] for e in response.data["errors"]], [1, 2])
+        self.assertFalse(StudentAnswer.objects.filter(attempt=self.attempt).exists())
+
+        StudentQuizAttempt.objects.filter(pk=self.attempt.pk).update(
+            calculated_end_time=timezone.now() - timedelta(seconds=1)
+        )
+        response = self._save([{"question_id": str(self.short.id), "text_answer": "late"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["detail"], "Time is up for this attempt.")
+
+
+class QuizPayloadTests(QuizTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        Quiz.objects.filter(pk=self.quiz.pk).update(is_published=False)
+        self.student_client = APIClient()
+        self.student_client.force_authenticate(user=self.students[0])
+
+    def _add_question(self, order):
+        response = self.client.post("/faculty/add-question/", {
+            "quiz": str(self.quiz.id), "question_text": f"Question {order}",
+            "question_type": "MCQ", "marks": 1, "order": order,
+        }, format="json")
+        return response
+
+    def _add_option(self, question_id, text, is_correct=False):
+        return self.client.post("/faculty/add-option/", {
+            "question": str(question_id), "option_text": text, "is_correct": is_correct,
+        }, format="json")
+
+    def test_payload_is_cached_and_locked_after_publish(self):
+        first = self._add_question(2).data["id"]
+        self._add_option(first, "right", is_correct=True)
+        self._add_option(first, "wrong")
+        second = self._add_question(1).data["id"]
+        self._add_option(second, "only")
+
+        self.assertEqual(self.client.put(f"/faculty/{self.quiz.id}/publish/").status_code, 200)
+        self.assertEqual(
+            self.student_client.post(f"/student-services/quizzes/{self.quiz.id}/start_attempt/").status_code, 200
+        )
+
+        url = f"/student-services/quizzes/{self.quiz.id}/questions/"
+        payload = self.student_client.get(url).json()
+        self.assertEqual([q["question_text"] for q in payload], ["Question 1", "Question 2"])
+        self.assertEqual(sorted(o["option_text"] for o in payload[1]["options"]), ["right", "wrong"])
+        self.assertNotIn("is_correct", payload[1]["options"][0])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.student_client.get(url).json(), payload)
+
+        self.assertEqual(self._add_question(3).status_code, 400)
+        self.assertEqual(self._add_option(first, "late").status_code, 400)
+
+        # Unpublished again, or the student left the class: no questions.
+        Quiz.objects.filter(pk=self.quiz.pk).update(is_published=False)
+        self.assertEqual(self.student_client.get(url).status_code, 400)
+        Quiz.objects.filter(pk=self.quiz.pk).update(is_published=True)
+        AcademicClassStudent.objects.filter(academic_class=self.quiz.academic_class).delete()
+        self.assertEqual(self.student_client.get(url).status_code, 400)
+
+    def test_edits_invalidate_payload(self):
+        question = self._add_question(1).data["id"]
+        self.assertEqual(json.loads(get_quiz_payload(self.quiz.id))[0]["options"], [])
+
+        self._add_option(question, "new")
+        self.assertEqual(
+            [o["option_text"] for o in json.loads(get_quiz_payload(self.quiz.id))[0]["options"]], ["new"]
+        )
+
+
+class QuizResultsTests(QuizTestData, TestCase):
+    def test_results_and_item_analysis(self):
+        mcq, (right, wrong) = self._question("MCQ", 2, [("a", True), ("b", False)], order=1)
+        tf, (true, false) = self._question("TRUE_FALSE", 1, [("True", False), ("False", True)], order=2)
+        self._attempt(self.students[0], [(mcq, [right]), (tf, [false])])
+        self._attempt(self.students[1], [(mcq, [right]), (tf, [true])])
+        self._attempt(self.students[2], [(mcq, [wrong])])
+        self.client.post(f"/faculty/{self.quiz.id}/regrade/")
+
+        url = f"/faculty/{self.quiz.id}/results/"
+        with self.assertNumQueries(5):
+            data = self.client.get(url).json()
+
+        self.assertEqual(data["attempts"], 3)
+        self.assertEqual([row["total_score"] for row in data["scores"]], [3.0, 2.0, 0.0])
+        self.assertEqual(data["scores"][0]["roll_no"], "Q000")
+        self.assertEqual(data["distribution"]["mean"], 1.67)
+        self.assertEqual(data["distribution"]["median"], 2.0)
+        self.assertEqual(sum(data["distribution"]["histogram"]["counts"]), 3)
+
+        first, second = data["questions"]
+        self.assertEqual((first["answered"], first["difficulty"], first["discrimination"]), (3, 0.6667, 1.0))
+        self.assertEqual((second["answered"], second["difficulty"], second["discrimination"]), (2, 0.3333, 1.0))
+        self.assertEqual({o["option_text"]: o["picks"] for o in first["options"]}, {"a": 2, "b": 1})
+
+        # Cached until the quiz is graded again.
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        Option.objects.filter(pk=wrong.pk).update(is_correct=True)
+        Option.objects.filter(pk=right.pk).update(is_correct=False)
+        self.client.post(f"/faculty/{self.quiz.id}/regrade/")
+        data = self.client.get(url).json()
+        self.assertEqual([row["total_score"] for row in data["scores"]], [2.0, 1.0, 0.0])
+
+
+class QuestionBankImportTests(QuizTestData, TestCase):
+    url = "/faculty/question-bank/import/"
+
+    def setUp(self):
+        super().setUp()
+        Quiz.objects.filter(pk=self.quiz.pk).update(is_published=False)
+        self.other = Quiz.objects.create(
+            faculty=self.user, academic_class=self.quiz.academic_class, section=self.quiz.section,
+            title="Unit Test (B)", access_start_datetime=self.quiz.access_start_datetime,
+            access_end_datetime=self.quiz.access_end_datetime, quiz_time=30
+        )
+        self.bank = [
+            {"question_text": "2 + 2?", "question_type": "MCQ", "marks": 2,
+             "options": [{"option_text": "4", "is_correct": True}, {"option_text": "5"}]},
+            {"question_text": "Primes?", "question_type": "msq", "marks": 3,
+             "options": [{"option_text": "2", "is_correct": True}, {"option_text": "3", "is_correct": True},
+                         {"option_text": "4"}]},
+            {"question_text": "Define.", "question_type": "SHORT", "marks": 5},
+        ]
+
+    def _quiz_ids(self):
+        return [str(self.quiz.id), str(self.other.id)]
+
+    def test_json_bank_into_several_quizzes(self):
+        self._question("MCQ", 1, [("x", True), ("y", False)], order=4)
+
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, {"quiz_ids": self._quiz_ids(), "questions": self.bank}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data["questions_created"], response.data["options_created"]), (6, 10))
+
+        self.quiz.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.quiz.total_marks, self.other.total_marks), (11, 10))
+        self.assertEqual(
+            list(self.quiz.questions.order_by("order").values_list("order", flat=True)), [4, 5, 6, 7]
+        )
+        self.assertEqual(json.loads(get_quiz_payload(self.other.id))[1]["question_type"], "MSQ")
+
+        # Copy a quiz's questions into another one.
+        third = Quiz.objects.create(
+            faculty=self.user, academic_class=self.quiz.academic_class, section=self.quiz.section,
+            title="Copy", access_start_datetime=self.quiz.access_start_datetime,
+            access_end_datetime=self.quiz.access_end_datetime, quiz_time=30
+        )
+        response = self.client.post(
+            self.url, {"quiz_ids": [str(third.id)], "source_quiz_id": str(self.other.id)}, format="json"
+        )
+        self.assertEqual(response.data["questions_created"], 3)
+        third.refresh_from_db()
+        self.assertEqual(third.total_marks, 10)
+
+    def test_excel_template_round_trip(self):
+        template = b"".join(self.client.get("/faculty/question-bank/template/").streaming_content)
+        upload = BytesIO(template)
+        upload.name = "bank.xlsx"
+
+        response = self.client.post(
+            self.url, {"quiz_ids": ",".join(self._quiz_ids()), "file": upload}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["questions_created"], 8)
+        msq = Question.objects.get(quiz=self.quiz, question_type="MSQ")
+        self.assertEqual(
+            set(msq.options.filter(is_correct=True).values_list("option_text", flat=True)), {"2", "5"}
+        )
+
+    def test_excel_correct_options_must_be_whole_numbers(self):
+        from openpyxl import Workbook
+        from .question_bank import QUESTION_BANK_COLUMNS, read_excel_bank
+
+        wb = Workbook()
+        ws = wb.active
+        ws.append(QUESTION_BANK_COLUMNS + ["option_1", "option_2", "option_3", "correct_options"])
+        ws.append(["Pick two", "MSQ", 2, "a", "b", "c", "1,3.0"])
+        ws.append(["Pick one", "MCQ", 1, "a", "b", "c", "1.5"])
+        upload = BytesIO()
+        wb.save(upload)
+        upload.seek(0)
+
+        questions, errors = read_excel_bank(upload)
+        self.assertEqual([o["is_correct"] for o in questions[0]["options"]], [True, False, True])
+        self.assertEqual(errors, [{"row": 3, "error": "correct_options must be option numbers, e.g. 1,3."}])
+
+    def test_rejects_invalid_bank_and_published_quiz(self):
+        bank = self.bank + [{"question_text": "Pick", "question_type": "MCQ", "marks": 1,
+                             "options": [{"option_text": "a", "is_correct": True},
+                                         {"option_text": "b", "is_correct": True}]}]
+        response = self.client.post(self.url, {"quiz_ids": self._quiz_ids(), "questions": bank}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"], [{"index": 3, "error": "Exactly one option must be correct."}])
+        self.assertFalse(Question.objects.exists())
 
-# Create your tests here.
+        Quiz.objects.filter(pk=self.other.pk).update(is_published=True)
+        response = self.client.post(self.url, {"quiz_ids": self._quiz_ids(), "questions": self.bank}, format="json")
+        self.assertEqual(response.status_code, 400)
@@ -10,7 +10,11 @@ from .views import(
     SubmitAttendanceAPIView,
     OverrideAttendanceAPIView,
     GrantOverrideAPIView,
+    BulkMarkAttendanceAPIView,
+    AttendanceShortageAPIView,
+    AttendanceRegisterExportAPIView,
     GenerateLectureSessionsAPIView,
+    GenerateDepartmentSessionsAPIView,
     LecturePlanReportAPIView,
     LecturePlanProgressAPIView,
     AssignmentAPIView,
@@ -19,8 +23,12 @@ from .views import(
     QuizUpdateAPIView,
     PublishQuizAPIView,
     QuizDetailAPIView,
+    QuizResultsAPIView,
+    QuizRegradeAPIView,
     AddQuestionAPIView,
     AddOptionAPIView,
+    QuestionBankTemplateAPIView,
+    QuestionBankImportAPIView,
     ResourceCreateAPIView,
     ResourceUpdateAPIView,
     ResourceDeleteAPIView,
@@ -51,10 +59,14 @@ urlpatterns = [
     path("lecture-plans/progress/", LecturePlanProgressAPIView.as_view()),
     path("lecture-plans/report/", LecturePlanReportAPIView.as_view()),
     path("generate-sessions/", GenerateLectureSessionsAPIView.as_view()),
+    path("generate-sessions/department/", GenerateDepartmentSessionsAPIView.as_view()),
     #Attendance
     path("attendance/submit/", SubmitAttendanceAPIView.as_view()),
     path("attendance/override/", OverrideAttendanceAPIView.as_view()),
     path("attendance/grant-override/", GrantOverrideAPIView.as_view()),
+    path("attendance/shortage/", AttendanceShortageAPIView.as_view()),
+    path("attendance/register/<uuid:allocation_id>/export/", AttendanceRegisterExportAPIView.as_view()),
+    path("attendance/<uuid:attendance_id>/mark/", BulkMarkAttendanceAPIView.as_view()),
     path("assignments/", AssignmentAPIView.as_view()),
     path("assignments/<uuid:pk>/", AssignmentAPIView.as_view()),
     path("assignments/<uuid:assignment_id>/submissions/",FacultySubmissionAPIView.as_view()),
@@ -63,9 +75,12 @@ urlpatterns = [
     path("<uuid:quiz_id>/update/", QuizUpdateAPIView.as_view()),
     path("<uuid:quiz_id>/publish/", PublishQuizAPIView.as_view()),
     path("<uuid:quiz_id>/detail/", QuizDetailAPIView.as_view()),
-    path("<uuid:quiz_id>/results/", QuizDetailAPIView.as_view()), # Using Detail for now or create new
+    path("<uuid:quiz_id>/results/", QuizResultsAPIView.as_view()),
+    path("<uuid:quiz_id>/regrade/", QuizRegradeAPIView.as_view()),
     path("add-question/", AddQuestionAPIView.as_view()),
     path("add-option/", AddOptionAPIView.as_view()),
+    path("question-bank/template/", QuestionBankTemplateAPIView.as_view()),
+    path("question-bank/import/", QuestionBankImportAPIView.as_view()),
     #Resources
     path("create/res/", ResourceCreateAPIView.as_view()),
     path("<uuid:resource_id>/res/update/", ResourceUpdateAPIView.as_view()),
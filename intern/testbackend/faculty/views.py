@@ -13,8 +13,9 @@ from .serializers import (
 
     LecturePlanBulkUploadSerializer
 )
-from Creation.permissions import IsFaculty, IsActiveFaculty
+from Creation.permissions import IsFaculty, IsActiveFaculty, IsAcademicCoordinator
 from CourseManagement.models import FacultyAllocation
+from .dashboard import get_dashboard_summary
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
@@ -24,88 +25,9 @@ from django.http import HttpResponse
 import openpyxl
 
 from datetime import timedelta
-from AcademicSetup.models import AcademicCalendar, CalendarEvent
-from CourseManagement.models import Timetable
-
-
-def generate_sessions(allocation):
-
-    academic_class = allocation.academic_class
-    course = allocation.course
-    section = allocation.section
-
-    # 🔹 Get active calendar for this semester
-    try:
-        calendar = AcademicCalendar.objects.get(
-            semester=academic_class.semester,
-            is_active=True
-        )
-    except AcademicCalendar.DoesNotExist:
-        raise Exception("Active Academic Calendar not found for this semester")
-
-    # 🔹 Semester start = first INSTRUCTION event
-    instruction_event = CalendarEvent.objects.filter(
-        calendar=calendar,
-        type="INSTRUCTION"
-    ).order_by("start_date").first()
-
-    if not instruction_event:
-        raise Exception("INSTRUCTION event not found in calendar")
-
-    start_date = instruction_event.start_date
-
-    # 🔹 Semester end = first EXAM event
-    exam_event = CalendarEvent.objects.filter(
-        calendar=calendar,
-        type="EXAM"
-    ).order_by("start_date").first()
-
-    if not exam_event:
-        raise Exception("EXAM event not found in calendar")
-
-    end_date = exam_event.end_date
-
-    # 🔹 Blocked dates (HOLIDAY, EXAM, OTHER)
-    blocked_events = CalendarEvent.objects.filter(
-        calendar=calendar,
-        type__in=["HOLIDAY", "EXAM", "OTHER"]
-    )
-
-    blocked_dates = set()
-
-    for event in blocked_events:
-        current = event.start_date
-        while current <= event.end_date:
-            blocked_dates.add(current)
-            current += timedelta(days=1)
-
-    # 🔹 Get timetable working days
-    timetable_days = Timetable.objects.filter(
-    faculty_allocation=allocation
-).values_list("day_of_week", flat=True)
-
-
-    # 🔹 Generate sessions
-    current = start_date
-    session_no = 1
-
-    while current <= end_date:
-
-        if (
-            current.strftime("%A").upper() in timetable_days
-            and current not in blocked_dates
-        ):
-            LectureSession.objects.create(
-                allocation=allocation,
-                session_no=session_no,
-                session_date=current
-            )
-            session_no += 1
-
-        current += timedelta(days=1)
-        print("Timetable Days:", timetable_days)
-        print("Start:", start_date)
-        print("End:", end_date)
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from .sessions import SessionGenerationError, generate_sessions, generate_sessions_for_allocations
 
 
 from rest_framework.exceptions import PermissionDenied
@@ -179,7 +101,10 @@ class LecturePlanTemplateView(APIView):
 
         # 🔥 Auto generate sessions if not exist
         if not LectureSession.objects.filter(allocation=allocation).exists():
-            generate_sessions(allocation)
+            try:
+                generate_sessions(allocation)
+            except SessionGenerationError as e:
+                return Response({"error": str(e)}, status=400)
 
         sessions = LectureSession.objects.filter(
             allocation=allocation
@@ -306,13 +231,15 @@ class GenerateLectureSessionsAPIView(APIView):
         faculty = get_faculty_profile(request.user)
 
         try:
+            # section_id is the class's section, or the virtual section id
+            # (as returned by the faculty dashboard).
             allocation = FacultyAllocation.objects.get(
+                Q(academic_class__section_id=section_id) | Q(virtual_section_id=section_id),
                 faculty=faculty,
                 course_id=course_id,
-                section_id=section_id,
                 status="ACTIVE"
             )
-        except FacultyAllocation.DoesNotExist:
+        except (FacultyAllocation.DoesNotExist, ValidationError):
             return Response(
                 {"error": "Invalid subject or section"},
                 status=400
@@ -329,7 +256,10 @@ class GenerateLectureSessionsAPIView(APIView):
                 {"message": "Sessions already generated."}
             )
 
-        generate_sessions(allocation)
+        try:
+            generate_sessions(allocation)
+        except SessionGenerationError as e:
+            return Response({"error": str(e)}, status=400)
 
         return Response(
             {"message": "Lecture sessions generated successfully."},
@@ -337,6 +267,45 @@ class GenerateLectureSessionsAPIView(APIView):
         )
 
 
+class GenerateDepartmentSessionsAPIView(APIView):
+    """
+    Generate lecture sessions for every active allocation of a department
+    in one batch (allocations that already have sessions are skipped).
+
+    POST /faculty/generate-sessions/department/
+    {"department_id": "<uuid>", "semester_id": "<uuid>", "academic_year": "AY 2025-26"}
+    semester_id and academic_year are optional filters.
+    """
+    permission_classes = [IsAuthenticated, IsAcademicCoordinator]
+
+    def post(self, request):
+        department_id = request.data.get("department_id")
+        if not department_id:
+            return Response({"error": "department_id is required"}, status=400)
+
+        allocations = FacultyAllocation.objects.filter(
+            Q(academic_class__department_id=department_id) | Q(virtual_section__department_id=department_id),
+            status="ACTIVE"
+        ).select_related("academic_class", "virtual_section")
+
+        if request.data.get("semester_id"):
+            allocations = allocations.filter(semester_id=request.data["semester_id"])
+        if request.data.get("academic_year"):
+            allocations = allocations.filter(academic_year=request.data["academic_year"])
+
+        try:
+            created, errors = generate_sessions_for_allocations(allocations)
+        except ValidationError:
+            return Response({"error": "Invalid department_id or semester_id"}, status=400)
+
+        return Response({
+            "message": f"Generated sessions for {len(created)} allocations.",
+            "sessions_created": sum(created.values()),
+            "allocations": {str(k): v for k, v in created.items()},
+            "errors": {str(k): v for k, v in errors.items()}
+        }, status=201 if created else 200)
+
+
 #Lecture plan progress
 class LecturePlanReportAPIView(APIView):
     permission_classes = [IsAuthenticated, IsFaculty, IsActiveFaculty]
@@ -414,10 +383,15 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
-from .models import Attendance, StudentAttendance
+from .models import Attendance, StudentAttendance, StudentAttendanceSummary
 from .serializers import AttendanceCreateSerializer, StudentAttendanceSerializer
+from .attendance import ATTENDANCE_STATUSES, attendance_register, mark_attendance, refresh_attendance_summaries
+from Creation.export import EXPORT_CHUNK_SIZE, EXPORT_FILE_TYPES, export_response
+from django.db.models import F
 from Creation.permissions import IsFaculty, IsActiveFaculty, IsAcademicCoordinator
 from CourseManagement.models import FacultyAllocation
+import math
+import uuid
 
 
 class AttendanceViewSet(viewsets.ModelViewSet):
@@ -514,6 +488,13 @@ class SubmitAttendanceAPIView(APIView):
         attendance.is_submitted = True
         attendance.save()
 
+        # Reconcile the summaries of everyone on this sheet, including marks
+        # written in bulk (which bypass the per-row signals).
+        refresh_attendance_summaries(
+            allocation_ids=[attendance.faculty_allocation_id],
+            student_ids=attendance.student_attendances.values("student_id"),
+        )
+
         return Response({"message": "Attendance submitted successfully."})
 
 
@@ -582,6 +563,150 @@ class GrantOverrideAPIView(APIView):
         })
 
 
+class BulkMarkAttendanceAPIView(APIView):
+    """
+    Mark a whole session in one request.
+
+    POST /faculty/attendance/<attendance_id>/mark/
+    {
+        "marks": [{"roll_no": "21CSE001", "status": "PRESENT"}, ...],
+        "default_status": "ABSENT"      # optional, for roster students not listed
+    }
+    """
+    permission_classes = [IsAuthenticated, IsFaculty, IsActiveFaculty]
+
+    def post(self, request, attendance_id):
+        faculty = get_faculty_profile(request.user)
+
+        try:
+            attendance = Attendance.objects.select_related("faculty_allocation").get(
+                attendance_id=attendance_id,
+                faculty_allocation__faculty=faculty
+            )
+        except Attendance.DoesNotExist:
+            return Response({"error": "Attendance not found"}, status=404)
+
+        if attendance.is_submitted:
+            if not (attendance.override_until and timezone.now() <= attendance.override_until):
+                return Response({"error": "Attendance is locked."}, status=400)
+
+        marks = request.data.get("marks", [])
+        if not isinstance(marks, list):
+            return Response({"error": "marks must be a list"}, status=400)
+
+        default_status = request.data.get("default_status")
+        if default_status:
+            default_status = str(default_status).upper()
+            if default_status not in ATTENDANCE_STATUSES:
+                return Response({"error": f"Invalid default_status '{default_status}'."}, status=400)
+
+        statuses, errors = mark_attendance(attendance, marks, default_status=default_status)
+        if errors:
+            return Response({"error": "Invalid attendance marks", "errors": errors}, status=400)
+
+        present = sum(1 for value in statuses.values() if value == "PRESENT")
+
+        return Response({
+            "message": "Attendance marked successfully.",
+            "marked": len(statuses),
+            "present": present,
+            "absent": len(statuses) - present
+        })
+
+
+class AttendanceRegisterExportAPIView(APIView):
+    """
+    Streams an allocation's attendance register (students x sessions).
+    Available to the allocation's faculty and to campus admins.
+
+    GET /faculty/attendance/register/<allocation_id>/export/?file_type=xlsx|csv
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, allocation_id):
+        file_type = request.query_params.get("file_type", "xlsx")
+        if file_type not in EXPORT_FILE_TYPES:
+            return Response(
+                {"error": f"file_type must be one of: {', '.join(EXPORT_FILE_TYPES)}"},
+                status=400
+            )
+
+        allocation = FacultyAllocation.objects.select_related("course", "faculty").filter(
+            allocation_id=allocation_id
+        ).first()
+        if allocation is None:
+            return Response({"error": "Allocation not found"}, status=404)
+
+        if request.user.role not in ["COLLEGE_ADMIN", "ACADEMIC_COORDINATOR"] \
+                and allocation.faculty.user_id != request.user.id:
+            return Response({"error": "Not your allocation"}, status=403)
+
+        headers, rows = attendance_register(allocation, chunk_size=EXPORT_CHUNK_SIZE)
+        return export_response(
+            f"attendance_{allocation.course.course_code}", "Attendance Register", headers, rows,
+            file_type=file_type
+        )
+
+
+class AttendanceShortageAPIView(APIView):
+    """
+    Students below the attendance threshold (default 75%) in the faculty's
+    allocations. Reads StudentAttendanceSummary, one row per student/course.
+
+    GET /faculty/attendance/shortage/?allocation_id=<uuid>&threshold=75
+    """
+    permission_classes = [IsAuthenticated, IsFaculty, IsActiveFaculty]
+
+    def get(self, request):
+        faculty = get_faculty_profile(request.user)
+
+        try:
+            threshold = float(request.query_params.get("threshold", 75))
+        except ValueError:
+            return Response({"error": "threshold must be a number"}, status=400)
+        if not math.isfinite(threshold) or not 0 <= threshold <= 100:
+            return Response({"error": "threshold must be between 0 and 100"}, status=400)
+
+        summaries = StudentAttendanceSummary.objects.filter(
+            faculty_allocation__faculty=faculty,
+            total_sessions__gt=0
+        )
+
+        allocation_id = request.query_params.get("allocation_id")
+        if allocation_id:
+            try:
+                allocation_id = uuid.UUID(allocation_id)
+            except ValueError:
+                return Response({"error": "allocation_id must be a valid UUID"}, status=400)
+            summaries = summaries.filter(faculty_allocation_id=allocation_id)
+
+        summaries = (
+            summaries
+            .alias(scaled_present=F("present_sessions") * 100)
+            .filter(scaled_present__lt=F("total_sessions") * threshold)
+            .select_related("student", "faculty_allocation__course")
+            .order_by("faculty_allocation__course__course_code", "student__roll_no")
+        )
+
+        return Response({
+            "threshold": threshold,
+            "count": len(summaries),
+            "students": [
+                {
+                    "allocation_id": str(s.faculty_allocation_id),
+                    "course_code": s.faculty_allocation.course.course_code,
+                    "student_id": str(s.student_id),
+                    "roll_no": s.student.roll_no,
+                    "student_name": s.student.student_name,
+                    "classes_attended": s.present_sessions,
+                    "total_classes": s.total_sessions,
+                    "percentage": s.percentage,
+                }
+                for s in summaries
+            ]
+        })
+
+
 
 '''
 -------------------------------------------------------------------------------------------------------------------------------
@@ -739,7 +864,23 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
+import uuid
+
+from rest_framework.parsers import JSONParser
+
 from .models import Quiz, Question, Option
+from .grading import grade_attempts, msq_scoring_rule
+from .quiz_payload import invalidate_quiz_payload
+from .quiz_results import get_quiz_results
+from .question_bank import (
+    MAX_BANK_OPTIONS,
+    QUESTION_BANK_COLUMNS,
+    QUESTION_BANK_OPTIONAL_COLUMNS,
+    bank_from_quiz,
+    import_question_bank,
+    parse_json_bank,
+    read_excel_bank,
+)
 from .serializers import (
     QuizCreateSerializer,
     QuizUpdateSerializer,
@@ -793,6 +934,7 @@ class QuizUpdateAPIView(APIView):
 
         if serializer.is_valid():
             serializer.save()
+            invalidate_quiz_payload(quiz.id)
             return Response(serializer.data)
 
         return Response(serializer.errors, status=400)
@@ -827,6 +969,7 @@ class PublishQuizAPIView(APIView):
 
         quiz.is_published = True
         quiz.save(update_fields=["is_published"])
+        invalidate_quiz_payload(quiz.id)
 
         return Response({"message": "Quiz published successfully."})
 
@@ -848,6 +991,55 @@ class QuizDetailAPIView(APIView):
         return Response(serializer.data)
 
 
+# =========================================
+# QUIZ RESULTS / ITEM ANALYSIS
+# =========================================
+
+class QuizResultsAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsFaculty]
+
+    def get(self, request, quiz_id):
+        try:
+            quiz = Quiz.objects.get(id=quiz_id, faculty=request.user)
+        except Quiz.DoesNotExist:
+            return Response({"error": "Quiz not found"}, status=404)
+
+        return HttpResponse(get_quiz_results(quiz), content_type="application/json")
+
+
+# =========================================
+# RE-GRADE QUIZ
+# =========================================
+
+class QuizRegradeAPIView(APIView):
+    """
+    Re-score every submitted attempt, e.g. after an answer key was fixed.
+    Optional body: {"msq_scoring": "exact" | "proportional" | "penalty"};
+    the rule is kept for later submissions and the results page.
+    """
+    permission_classes = [IsAuthenticated, IsFaculty]
+
+    def post(self, request, quiz_id):
+        try:
+            quiz = Quiz.objects.get(id=quiz_id, faculty=request.user)
+        except Quiz.DoesNotExist:
+            return Response({"error": "Quiz not found"}, status=404)
+
+        try:
+            rule = msq_scoring_rule(request.data.get("msq_scoring") or quiz.msq_scoring)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        scores = grade_attempts(quiz.id, msq_scoring=rule)
+
+        return Response({
+            "message": "Quiz re-graded successfully.",
+            "graded_attempts": len(scores),
+            "msq_scoring": rule,
+            "total_marks": quiz.total_marks,
+        })
+
+
 # =========================================
 # ADD QUESTION
 # =========================================
@@ -859,7 +1051,12 @@ class AddQuestionAPIView(APIView):
         serializer = QuestionSerializer(data=request.data)
 
         if serializer.is_valid():
+            quiz = serializer.validated_data["quiz"]
+            if quiz.is_published:
+                return Response({"error": "Questions of a published quiz are locked."}, status=400)
+
             serializer.save()
+            invalidate_quiz_payload(quiz.id)
             return Response(serializer.data, status=201)
 
         return Response(serializer.errors, status=400)
@@ -876,12 +1073,107 @@ class AddOptionAPIView(APIView):
         serializer = OptionSerializer(data=request.data)
 
         if serializer.is_valid():
+            quiz = serializer.validated_data["question"].quiz
+            if quiz.is_published:
+                return Response({"error": "Questions of a published quiz are locked."}, status=400)
+
             serializer.save()
+            invalidate_quiz_payload(quiz.id)
             return Response(serializer.data, status=201)
 
         return Response(serializer.errors, status=400)
 
 
+# =========================================
+# QUESTION BANK IMPORT
+# =========================================
+
+class QuestionBankTemplateAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsFaculty]
+
+    def get(self, request):
+        headers = QUESTION_BANK_COLUMNS + QUESTION_BANK_OPTIONAL_COLUMNS
+        examples = [
+            ["What is 2 + 2?", "MCQ", 1, 1, "3", "4", "5", None, None, None, "2"],
+            ["Which are prime?", "MSQ", 2, 2, "2", "4", "5", "9", None, None, "1,3"],
+            ["The earth is flat.", "TRUE_FALSE", 1, 3, "True", "False", None, None, None, None, "2"],
+            ["Define recursion.", "SHORT", 3, 4] + [None] * (MAX_BANK_OPTIONS + 1),
+        ]
+        return export_response(
+            "question_bank_template", "Question Bank", headers, examples,
+            column_widths=[40, 14, 8, 8] + [16] * MAX_BANK_OPTIONS + [16],
+        )
+
+
+class QuestionBankImportAPIView(APIView):
+    """
+    Copy a question bank into one or more of the faculty's unpublished
+    quizzes (`quiz_ids`). The bank is an Excel `file` laid out like
+    question-bank/template/, a JSON `questions` list, or the questions of
+    `source_quiz_id`.
+    """
+    permission_classes = [IsAuthenticated, IsFaculty]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        if hasattr(request.data, "getlist"):
+            quiz_ids = [
+                value.strip()
+                for item in request.data.getlist("quiz_ids")
+                for value in str(item).split(",") if value.strip()
+            ]
+        else:
+            quiz_ids = request.data.get("quiz_ids")
+
+        if not quiz_ids or not isinstance(quiz_ids, list):
+            return Response({"error": "quiz_ids must be a non-empty list"}, status=400)
+
+        try:
+            quiz_ids = {uuid.UUID(str(quiz_id)) for quiz_id in quiz_ids}
+        except ValueError:
+            return Response({"error": "Invalid quiz id"}, status=400)
+
+        quizzes = dict(
+            Quiz.objects.filter(id__in=quiz_ids, faculty=request.user).values_list("id", "is_published")
+        )
+        if len(quizzes) != len(quiz_ids):
+            return Response({"error": "Quiz not found"}, status=404)
+        if any(quizzes.values()):
+            return Response({"error": "Questions of a published quiz are locked."}, status=400)
+
+        if request.FILES.get("file"):
+            questions, errors = read_excel_bank(request.FILES["file"])
+        elif "questions" in request.data:
+            if not isinstance(request.data["questions"], list):
+                return Response({"error": "questions must be a list"}, status=400)
+            questions, errors = parse_json_bank(request.data["questions"])
+        elif request.data.get("source_quiz_id"):
+            source_id = request.data["source_quiz_id"]
+            try:
+                source_id = uuid.UUID(str(source_id))
+            except ValueError:
+                return Response({"error": "Invalid source_quiz_id"}, status=400)
+            if not Quiz.objects.filter(id=source_id, faculty=request.user).exists():
+                return Response({"error": "Source quiz not found"}, status=404)
+            questions, errors = bank_from_quiz(source_id), []
+        else:
+            return Response({"error": "Provide file, questions or source_quiz_id"}, status=400)
+
+        if errors:
+            return Response({"error": "Invalid question bank", "errors": errors}, status=400)
+        if not questions:
+            return Response({"error": "The question bank is empty"}, status=400)
+
+        created = import_question_bank(sorted(quiz_ids), questions)
+
+        return Response({
+            "message": "Question bank imported successfully.",
+            "quizzes": len(quiz_ids),
+            "questions_created": created["questions"],
+            "options_created": created["options"],
+        }, status=201)
+
+
 
 '''
 --------------------------------------------------------------------------------------------------------------------------------
@@ -1030,74 +1322,7 @@ class FacultyDashboardSummaryView(APIView):
         if not faculty_profile:
             return Response({"error": "Faculty profile not found"}, status=403)
 
-        # 1. Allocated Classes
-        allocations = FacultyAllocation.objects.filter(faculty=faculty_profile)
-        
-        class_data = []
-        total_students_count = 0
-        
-        for alloc in allocations:
-        # Count students in this class / virtual section
-            if alloc.academic_class:
-                student_count = alloc.academic_class.students.count()
-                class_name = str(alloc.academic_class)
-                class_id = alloc.academic_class.class_id
-            else:
-                student_count = alloc.virtual_section.students.count()
-                class_name = f"Virtual: {alloc.virtual_section.name}"
-                class_id = str(alloc.virtual_section.virtual_id)
-
-            total_students_count += student_count
-            
-            class_data.append({
-                "allocation_id": str(alloc.allocation_id),
-                "class_id": class_id,
-                "section_id": alloc.section.id if alloc.section else (str(alloc.virtual_section.virtual_id) if alloc.virtual_section else None),
-                "class_name": class_name,
-                "course_name": alloc.course.course_name,
-                "student_count": student_count,
-                "is_virtual": alloc.virtual_section is not None
-            })
-
-        # 2. Assignment Summary
-        assignments = Assignment.objects.filter(faculty=request.user)
-        pending_assignments_count = assignments.filter(end_datetime__gt=timezone.now()).count()
-
-        # 3. Quiz Summary
-        quizzes = Quiz.objects.filter(faculty=request.user)
-        unpublished_quizzes_count = quizzes.filter(is_published=False).count()
-
-        # 4. Recent Activities (Attendance markers)
-        # Fetching last 5 attendance records
-        recent_attendance = Attendance.objects.filter(faculty_allocation__faculty=faculty_profile).select_related('faculty_allocation__academic_class', 'faculty_allocation__virtual_section').order_by('-date')[:5]
-        attendance_activities = []
-        for att in recent_attendance:
-            alloc = att.faculty_allocation
-            if alloc.academic_class:
-                class_label = str(alloc.academic_class)
-            elif alloc.virtual_section:
-                class_label = f"Virtual: {alloc.virtual_section.name}"
-            else:
-                class_label = "Unknown"
-
-            attendance_activities.append({
-                "date": att.date,
-                "class": class_label,
-                "status": "Submitted" if att.is_submitted else "Pending"
-            })
-
-        return Response({
-            "faculty_name": request.user.get_full_name(),
-            "employee_id": faculty_profile.employee_id,
-            "total_classes": allocations.count(),
-            "total_students": total_students_count,
-            "allocated_classes": class_data,
-            "tasks": {
-                "active_assignments": pending_assignments_count,
-                "unpublished_quizzes": unpublished_quizzes_count,
-            },
-            "recent_attendance": attendance_activities
-        })
+        return Response(get_dashboard_summary(faculty_profile, request.user))
 
 
 class StudentsForAllocationAPIView(APIView):